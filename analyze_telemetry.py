@@ -0,0 +1,224 @@
+"""
+Telemetry Analyzer
+Streams telemetry JSONL logs through a generator pipeline and reports
+accuracy, session length, frame-time and GC pause distributions. Memory use does not
+depend on the size of the logs.
+
+Usage:
+    python analyze_telemetry.py telemetry/
+    python analyze_telemetry.py telemetry/telemetry-00001.jsonl --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from telemetry import FILE_PATTERN
+
+
+class Histogram:
+    """
+    Fixed-width bucket histogram for streaming percentiles
+    """
+
+    def __init__(self, bucket_width):
+        """
+        Args:
+            bucket_width (float): Width of each bucket in the values' unit
+        """
+        self.bucket_width = bucket_width
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.maximum = None
+
+    def add(self, value):
+        """Add one value"""
+        bucket = int(value // self.bucket_width)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def percentile(self, pct):
+        """Return the upper edge of the bucket holding the given percentile (capped at the maximum)"""
+        if not self.count:
+            return 0.0
+        target = pct / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min((bucket + 1) * self.bucket_width, self.maximum)
+        return self.maximum
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Return count, mean, max and percentiles as a dict"""
+        result = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.maximum or 0.0
+        }
+        for pct in percentiles:
+            result[f"p{pct}"] = self.percentile(pct)
+        return result
+
+
+def iter_files(paths):
+    """Expand directories into their telemetry files, in write order"""
+    for path in paths:
+        if os.path.isdir(path):
+            names = [name for name in os.listdir(path) if FILE_PATTERN.match(name)]
+            for name in sorted(names, key=lambda n: int(FILE_PATTERN.match(n).group(1))):
+                yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def iter_lines(files):
+    """Yield every line of every file, one at a time"""
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from f
+
+
+def iter_events(lines, errors):
+    """
+    Parse JSON lines into event dicts, skipping broken lines
+
+    Args:
+        lines: Iterable of text lines
+        errors (list): Single-item counter of lines that could not be parsed
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            errors[0] += 1
+
+
+def analyze(events):
+    """
+    Fold a stream of events into summary statistics
+
+    Only sessions that have not ended yet are kept in memory.
+
+    Args:
+        events: Iterable of event dicts
+
+    Returns:
+        dict: Report with accuracy, session length and frame-time statistics
+    """
+    open_sessions = {}
+    frame_ms = Histogram(0.25)
+    frame_ms_by_state = {}
+    session_seconds = Histogram(1.0)
+    session_accuracy = Histogram(0.01)
+    gc_ms_by_gen = {}
+    gc_in_frame = 0
+    results = {}
+    shots = hits = damage = events_seen = 0
+
+    for event in events:
+        events_seen += 1
+        kind = event.get('e')
+        session = event.get('s')
+
+        if kind == 'frame':
+            ms = event.get('ms', 0.0)
+            frame_ms.add(ms)
+            state = event.get('state', 'unknown')
+            frame_ms_by_state.setdefault(state, Histogram(0.25)).add(ms)
+            continue
+        if kind == 'gc':
+            gc_ms_by_gen.setdefault(event.get('gen', 0), Histogram(0.05)).add(event.get('ms', 0.0))
+            if not event.get('idle', True):
+                gc_in_frame += 1
+            continue
+        if kind not in ('session_start', 'shot', 'hit', 'damage', 'session_end'):
+            continue
+
+        stats = open_sessions.setdefault(session, {'shots': 0, 'hits': 0})
+        if kind == 'shot':
+            stats['shots'] += 1
+            shots += 1
+        elif kind == 'hit':
+            stats['hits'] += 1
+            hits += 1
+        elif kind == 'damage':
+            damage += 1
+        elif kind == 'session_end':
+            results[event.get('result', 'unknown')] = results.get(event.get('result', 'unknown'), 0) + 1
+            session_seconds.add(event.get('duration_ms', 0) / 1000.0)
+            if stats['shots']:
+                session_accuracy.add(stats['hits'] / stats['shots'])
+            del open_sessions[session]
+
+    return {
+        'events': events_seen,
+        'sessions': sum(results.values()),
+        'unfinished_sessions': len([s for s in open_sessions if s is not None]),
+        'results': results,
+        'shots': shots,
+        'hits': hits,
+        'damage': damage,
+        'accuracy': hits / shots if shots else 0.0,
+        'session_accuracy': session_accuracy.summary(),
+        'session_seconds': session_seconds.summary(),
+        'frame_ms': frame_ms.summary(),
+        'frame_ms_by_state': {state: h.summary() for state, h in frame_ms_by_state.items()},
+        'gc_ms_by_gen': {gen: h.summary() for gen, h in gc_ms_by_gen.items()},
+        'gc_in_frame': gc_in_frame
+    }
+
+
+def format_report(report):
+    """Return the report as printable text"""
+    def line(label, stats, unit):
+        return (f"{label:<22} n={stats['count']:<8} mean={stats['mean']:.2f}{unit} "
+                f"p50={stats['p50']:.2f}{unit} p90={stats['p90']:.2f}{unit} "
+                f"p99={stats['p99']:.2f}{unit} max={stats['max']:.2f}{unit}")
+
+    lines = [
+        f"Events: {report['events']}  Sessions: {report['sessions']} "
+        f"(+{report['unfinished_sessions']} unfinished)",
+        "Results: " + ", ".join(f"{k}={v}" for k, v in sorted(report['results'].items())),
+        f"Shots: {report['shots']}  Hits: {report['hits']}  Damage taken: {report['damage']}  "
+        f"Accuracy: {report['accuracy'] * 100:.1f}%",
+        line("Session accuracy", report['session_accuracy'], ""),
+        line("Session length", report['session_seconds'], "s"),
+        line("Frame time", report['frame_ms'], "ms")
+    ]
+    for state, stats in sorted(report['frame_ms_by_state'].items()):
+        lines.append(line(f"  frame ({state})", stats, "ms"))
+    if report['gc_ms_by_gen']:
+        lines.append(f"GC collections inside frames: {report['gc_in_frame']}")
+        for gen, stats in sorted(report['gc_ms_by_gen'].items()):
+            lines.append(line(f"  gc pause (gen {gen})", stats, "ms"))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Analyze telemetry logs from the command line"""
+    parser = argparse.ArgumentParser(description="Summarize Space Invaders telemetry logs")
+    parser.add_argument('paths', nargs='+', help="telemetry directories or JSONL files")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    errors = [0]
+    report = analyze(iter_events(iter_lines(iter_files(args.paths)), errors))
+    report['bad_lines'] = errors[0]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+        if errors[0]:
+            print(f"Skipped {errors[0]} unreadable lines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
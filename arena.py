@@ -0,0 +1,425 @@
+"""
+Arena Module
+A world wider than the screen: a camera follows the ship and the aliens and
+bunkers are filed in a spatial index. Only aliens on screen are moved every
+tick and drawn; the others are not touched at all until they come into
+view or near a bullet. Alien movement is periodic, so an alien is then
+placed straight where its updates would have taken it. The work per tick
+depends on what is on screen, not on how many entities the world holds.
+
+Run this module directly to measure frame times as the world grows:
+    python arena.py --bench 1000,10000,50000
+"""
+
+import os
+import sys
+import pygame
+from config import *
+from sprites import Aliens, Bunker
+
+# How far an alien strays from where it was created
+ALIEN_REACH = ALIEN_MOVE_DISTANCE + 2 * FRAMES_PER_TICK
+
+
+class SpatialGrid:
+    """
+    Uniform grid index of sprites
+
+    Each sprite is filed in every cell its area overlaps. Queries return
+    the live sprites of the cells a rect overlaps, in a stable order, and
+    drop killed sprites from the index as they come across them.
+    """
+
+    def __init__(self, cell_size=ARENA_CELL_SIZE):
+        """
+        Initialize an empty index
+
+        Args:
+            cell_size (int): Cell width and height in pixels
+        """
+        self.cell_size = cell_size
+        # Cell -> sprites in it (a dict keeps insertion order, so queries replay the same)
+        self._cells = {}
+        # Sprite -> cells it is filed in
+        self._filed = {}
+
+    def __len__(self):
+        return len(self._filed)
+
+    def _cells_of(self, rect):
+        """Cells a rect overlaps"""
+        size = self.cell_size
+        columns = range(rect.left // size, (rect.right - 1) // size + 1)
+        return [(column, row) for row in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for column in columns]
+
+    def insert(self, sprite, area=None):
+        """
+        File a sprite
+
+        Args:
+            sprite: Sprite to index
+            area (pygame.Rect): Area it can be found in (its rect if None)
+        """
+        cells = self._cells_of(area or sprite.rect)
+        self._filed[sprite] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, {})[sprite] = None
+
+    def remove(self, sprite):
+        """Take a sprite out of the index"""
+        for cell in self._filed.pop(sprite, ()):
+            members = self._cells[cell]
+            del members[sprite]
+            if not members:
+                del self._cells[cell]
+
+    def query(self, rect):
+        """
+        Find the sprites filed in the cells a rect overlaps
+
+        Args:
+            rect (pygame.Rect): Area to search
+
+        Returns:
+            list: Live sprites that may overlap the rect
+        """
+        found = {}
+        cells = self._cells
+        for cell in self._cells_of(rect):
+            members = cells.get(cell)
+            if members:
+                found.update(members)
+        dead = [sprite for sprite in found if not sprite.alive()]
+        for sprite in dead:
+            self.remove(sprite)
+            del found[sprite]
+        return list(found)
+
+    def clear(self):
+        """Empty the index"""
+        self._cells.clear()
+        self._filed.clear()
+
+
+class Camera:
+    """
+    Screen-sized view into the world that scrolls to keep a target at least
+    ``margin`` pixels away from the screen edges
+    """
+
+    def __init__(self, world_size, view_size=(SCREEN_WIDTH, SCREEN_HEIGHT), margin=ARENA_CAMERA_MARGIN):
+        """
+        Initialize the camera at the world's top left
+
+        Args:
+            world_size (tuple): World (width, height)
+            view_size (tuple): Size of the view (the logical screen)
+            margin (int): Closest the target comes to a screen edge
+        """
+        self.world_size = world_size
+        self.view = pygame.Rect((0, 0), view_size)
+        self.margin = min(margin, view_size[0] // 2, view_size[1] // 2)
+
+    @property
+    def topleft(self):
+        """World position shown at the top left of the screen"""
+        return self.view.topleft
+
+    def center_on(self, rect):
+        """Jump to a target"""
+        self.view.center = rect.center
+        self._clamp()
+
+    def follow(self, rect):
+        """Scroll just enough to keep a target inside the margins"""
+        view = self.view
+        margin = self.margin
+        if rect.centerx < view.left + margin:
+            view.left = rect.centerx - margin
+        elif rect.centerx > view.right - margin:
+            view.right = rect.centerx + margin
+        if rect.centery < view.top + margin:
+            view.top = rect.centery - margin
+        elif rect.centery > view.bottom - margin:
+            view.bottom = rect.centery + margin
+        self._clamp()
+
+    def _clamp(self):
+        """Keep the view inside the world"""
+        self.view.clamp_ip(pygame.Rect((0, 0), self.world_size))
+
+
+class Arena:
+    """
+    The world of an arena game: its size, camera and spatial indexes
+
+    Aliens are filed by the whole stretch they sweep across, so they never
+    need refiling as they move, and remember where and when they were
+    created (``arena_home``) so they can be brought up to date on demand.
+    """
+
+    def __init__(self, width=ARENA_WIDTH, height=SCREEN_HEIGHT):
+        """
+        Initialize an empty arena
+
+        Args:
+            width (int): World width in pixels (at least the screen width)
+            height (int): World height in pixels (at least the screen height)
+        """
+        self.size = (max(width, SCREEN_WIDTH), max(height, SCREEN_HEIGHT))
+        self.camera = Camera(self.size)
+        self.aliens = SpatialGrid()
+        self.bunkers = SpatialGrid()
+        # Alien updates since the arena was populated
+        self.ticks = 0
+        # On-screen aliens and bunkers, brought up to date every tick
+        self.visible = []
+        self.visible_bunkers = []
+
+    def populate(self, game_manager):
+        """
+        Fill the world with the arena formation and a row of bunkers
+
+        Args:
+            game_manager: GameManager whose alien and bunker groups receive the sprites
+        """
+        self.clear()
+        width = self.size[0]
+        columns = max(1, (width - 200) // ARENA_ALIEN_SPACING + 1)
+        for row in range(ARENA_ALIEN_ROWS):
+            for column in range(columns):
+                alien = Aliens(100 + column * ARENA_ALIEN_SPACING, 100 + row * 70, game_manager.rng)
+                game_manager.alien_group.add(alien)
+                self.add_alien(alien)
+        if BUNKERS_ENABLED:
+            spacing = SCREEN_WIDTH / BUNKER_COUNT
+            for i in range(int(width / spacing)):
+                # Bunkers share the intact shape until they are hit
+                bunker = Bunker(int(spacing * (i + 0.5)), BUNKER_Y, shared=True)
+                game_manager.bunker_group.add(bunker)
+                self.bunkers.insert(bunker)
+
+    def add_alien(self, alien):
+        """Index an alien that was just created"""
+        alien.arena_home = (alien.rect.x, self.ticks)
+        self.aliens.insert(alien, alien.rect.inflate(2 * ALIEN_REACH, 0))
+
+    def clear(self):
+        """Forget every entity"""
+        self.aliens.clear()
+        self.bunkers.clear()
+        self.visible = []
+        self.visible_bunkers = []
+        self.ticks = 0
+
+    def aliens_in(self, rect):
+        """
+        Aliens overlapping an area, brought up to date
+
+        Args:
+            rect (pygame.Rect): World area
+
+        Returns:
+            list: Live aliens whose rect overlaps the area
+        """
+        found = []
+        ticks = self.ticks
+        for alien in self.aliens.query(rect):
+            home_x, born = alien.arena_home
+            alien.fast_forward(home_x, ticks - born)
+            if rect.colliderect(alien.rect):
+                found.append(alien)
+        return found
+
+    def look_at(self, ship):
+        """Center the camera on the ship and bring the view up to date"""
+        self.camera.center_on(ship.rect)
+        self._refresh_view()
+
+    def advance(self, ship):
+        """
+        Move the on-screen aliens by one update and scroll the camera after the ship
+
+        Args:
+            ship (Spaceship): Ship the camera follows, or None
+        """
+        self.ticks += 1
+        if ship is not None and ship.alive():
+            self.camera.follow(ship.rect)
+        self._refresh_view()
+
+    def _refresh_view(self):
+        """Find and update what is on screen"""
+        view = self.camera.view
+        self.visible = self.aliens_in(view)
+        self.visible_bunkers = [bunker for bunker in self.bunkers.query(view) if view.colliderect(bunker.rect)]
+
+    def collision_targets(self, bullet_group, alien_bullet_group):
+        """
+        Aliens and bunkers that bullets can reach this tick, brought up to date
+
+        Args:
+            bullet_group: Player bullets (moving up)
+            alien_bullet_group: Alien bullets (moving down)
+
+        Returns:
+            tuple: (aliens, bunkers) near the bullets' paths
+        """
+        paths = [bullet.rect.union(bullet.rect.move(0, -bullet.speed)) for bullet in bullet_group]
+        aliens = {}
+        for path in paths:
+            aliens.update(dict.fromkeys(self.aliens_in(path)))
+        paths.extend(bullet.rect.union(bullet.rect.move(0, bullet.speed)) for bullet in alien_bullet_group)
+        bunkers = {}
+        for path in paths:
+            bunkers.update(dict.fromkeys(self.bunkers.query(path)))
+        return list(aliens), list(bunkers)
+
+    def visible_aliens(self):
+        """On-screen aliens still alive"""
+        return [alien for alien in self.visible if alien.alive()]
+
+    def nearest_alien(self, x):
+        """
+        Find the alien closest to a horizontal position, searching outwards
+        one column of cells at a time
+
+        Args:
+            x (int): World x position
+
+        Returns:
+            Aliens | None: The nearest live alien, or None if none are left
+        """
+        size = self.aliens.cell_size
+        column = x // size
+        columns = (self.size[0] + 2 * ALIEN_REACH) // size + 2
+        for distance in range(columns):
+            for side in ((column - distance, column + distance) if distance else (column,)):
+                aliens = self.aliens_in(pygame.Rect(side * size, 0, size, self.size[1]))
+                if aliens:
+                    return min(aliens, key=lambda alien: abs(alien.rect.centerx - x))
+        return None
+
+
+def run_particle_check():
+    """
+    Check that explosions anywhere in the arena keep their particles and that
+    particles outside the world are still dropped
+
+    Returns:
+        bool: True if the particle pool follows the world bounds
+    """
+    import tempfile
+    from game_clock import SimulatedClock
+    from game_manager import GameManager
+    from particles import ParticleSystem
+
+    with tempfile.TemporaryDirectory() as directory:
+        game_manager = GameManager(clock=SimulatedClock(),
+                                   history_path=os.path.join(directory, 'history.json'))
+        game_manager.arena = Arena()
+        if game_manager.particles is None:
+            game_manager.particles = ParticleSystem(seed=0)
+        game_manager.start_new_game('check')
+        game_manager.wave_preparer.close()
+
+    particles = game_manager.particles
+    ok = True
+    for x, expected in ((game_manager.arena.size[0] // 2, True), (-200, False)):
+        particles.clear()
+        game_manager.spawn_explosion(x, SCREEN_HEIGHT // 2, 2)
+        particles.update()
+        if (len(particles) > 0) != expected:
+            ok = False
+            print(f"FAIL explosion at x={x}: {len(particles)} particles left after one update")
+    if ok:
+        print("Arena explosions keep their particles")
+    return ok
+
+
+def run_benchmark(counts, ticks=600):
+    """
+    Play the arena under the autopilot at several world sizes and time each tick
+
+    Args:
+        counts (tuple): Numbers of aliens to fill the world with
+        ticks (int): Ticks played at each size
+
+    Returns:
+        list: (aliens, update p50, update p99, draw p50, draw p99) in milliseconds
+    """
+    import tempfile
+    import time
+    from game_clock import SimulatedClock
+    from game_manager import GameManager
+    from autopilot import AutoPilot
+    from renderer import SurfaceRenderer
+    from input_manager import percentile
+
+    renderer = SurfaceRenderer()
+    rows = []
+    print(f"{'aliens':>8} {'bunkers':>8} {'setup ms':>9} {'update p50':>11} {'update p99':>11} "
+          f"{'draw p50':>9} {'draw p99':>9}")
+    for count in counts:
+        columns = -(-count // ARENA_ALIEN_ROWS)
+        with tempfile.TemporaryDirectory() as directory:
+            clock = SimulatedClock(frame_ms=1000.0 * FRAMES_PER_TICK / FPS)
+            game_manager = GameManager(clock=clock, history_path=os.path.join(directory, 'history.json'))
+            game_manager.arena = Arena(width=200 + (columns - 1) * ARENA_ALIEN_SPACING)
+            game_manager.rng.seed(count)
+            game_manager.load_background()
+            start = time.perf_counter()
+            game_manager.start_new_game('bench')
+            setup_ms = (time.perf_counter() - start) * 1000.0
+            # Skip the countdown
+            clock.advance(COUNTDOWN_TIME * 1000)
+            pilot = AutoPilot()
+            update_ms = []
+            draw_ms = []
+            for _ in range(ticks):
+                if game_manager.game_state != GAME_STATE_PLAYING:
+                    break
+                clock.tick()
+                start = time.perf_counter()
+                game_manager.controls = pilot.control(game_manager)
+                game_manager.update_game_logic()
+                middle = time.perf_counter()
+                viewport = game_manager.camera_viewport(renderer.viewport)
+                renderer.draw_world(game_manager.bg, game_manager.get_visible_groups(), viewport)
+                game_manager.draw_particles(renderer.surface, viewport)
+                game_manager.draw_health_bar(renderer.surface, viewport)
+                end = time.perf_counter()
+                update_ms.append((middle - start) * 1000.0)
+                draw_ms.append((end - middle) * 1000.0)
+            game_manager.wave_preparer.close()
+        update_ms.sort()
+        draw_ms.sort()
+        row = (len(game_manager.alien_group), len(game_manager.bunker_group), setup_ms,
+               percentile(update_ms, 50), percentile(update_ms, 99), percentile(draw_ms, 50), percentile(draw_ms, 99))
+        rows.append(row)
+        print(f"{row[0]:>8} {row[1]:>8} {row[2]:>9.0f} {row[3]:>11.3f} {row[4]:>11.3f} {row[5]:>9.3f} {row[6]:>9.3f}")
+    return rows
+
+
+def main(argv=None):
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Arena frame times as the world grows")
+    parser.add_argument('--bench', default='1000,10000,50000', help="comma-separated alien counts")
+    parser.add_argument('--ticks', type=int, default=600, help="ticks played at each count")
+    parser.add_argument('--check', action='store_true', help="check arena explosions instead")
+    args = parser.parse_args(argv)
+
+    # Run without a window or sound card
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    if args.check:
+        return 0 if run_particle_check() else 1
+    run_benchmark(tuple(int(count) for count in args.bench.split(',')), args.ticks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Assets Module
+Loads game images once and shares them between all sprites that use them,
+and keeps sets of them pre-scaled for each window resolution.
+"""
+
+import os
+import pygame
+from config import IMAGES, ASSETS_PATH, EXPLOSION_SIZES
+
+# Cache of loaded images keyed by file path
+_image_cache = {}
+
+# Cache of scaled images keyed by (file path, size)
+_scaled_cache = {}
+
+# Cache of collision masks keyed by file path
+_mask_cache = {}
+
+# Pre-scaled image sets keyed by window resolution; each maps id(shared image) to its scaled copy
+_resolution_sets = {}
+
+
+def load_image(path):
+    """
+    Load an image from disk, reusing the cached surface on later calls
+
+    Args:
+        path (str): Path to the image file
+
+    Returns:
+        pygame.Surface: The shared image surface (do not draw onto it)
+    """
+    image = _image_cache.get(path)
+    if image is None:
+        image = pygame.image.load(path)
+        _image_cache[path] = image
+    return image
+
+
+def load_scaled_image(path, size):
+    """
+    Load an image scaled to the given size, reusing the cached result
+
+    Args:
+        path (str): Path to the image file
+        size (tuple): Target (width, height) in pixels
+
+    Returns:
+        pygame.Surface: The shared scaled surface (do not draw onto it)
+    """
+    key = (path, tuple(size))
+    image = _scaled_cache.get(key)
+    if image is None:
+        image = pygame.transform.scale(load_image(path), size)
+        _scaled_cache[key] = image
+    return image
+
+
+def load_mask(path):
+    """
+    Get the collision mask of an image, building it once
+
+    Args:
+        path (str): Path to the image file
+
+    Returns:
+        pygame.mask.Mask: The shared mask (do not modify it)
+    """
+    mask = _mask_cache.get(path)
+    if mask is None:
+        mask = pygame.mask.from_surface(load_image(path))
+        _mask_cache[path] = mask
+    return mask
+
+
+def preload_images():
+    """Load every image the game draws (sprites, explosion frames, background) into the caches"""
+    for path in IMAGES.values():
+        try:
+            load_image(path)
+        except (pygame.error, OSError):
+            # The background is optional; sprites fail where they are created
+            pass
+    for number in range(1, 6):
+        load_image(f"{ASSETS_PATH}alien{number}.png")
+    for size in EXPLOSION_SIZES.values():
+        for number in range(1, 6):
+            load_scaled_image(f"{ASSETS_PATH}exp{number}.png", size)
+
+
+def smoothscale(image, size):
+    """
+    Scale an image with filtering, whatever its pixel format
+
+    Args:
+        image (pygame.Surface): Source image
+        size (tuple): Target (width, height) in pixels
+
+    Returns:
+        pygame.Surface: New scaled surface
+    """
+    if image.get_bitsize() < 24:
+        # smoothscale only takes 24 and 32 bit surfaces
+        converted = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+        converted.blit(image, (0, 0))
+        image = converted
+    return pygame.transform.smoothscale(image, size)
+
+
+def scaled_image_set(viewport, directory=None, cover=()):
+    """
+    Get every cached image scaled for a window resolution, building the set once
+
+    Images are scaled by the viewport scale; the ``cover`` images
+    (backgrounds) are scaled to cover the whole window and cropped to it.
+    With a directory, each scaled image is also written there as a TGA file
+    and read back on later runs instead of being scaled again.
+
+    Args:
+        viewport (Viewport): Target window
+        directory (str): Where scaled sets are kept between runs, or None
+        cover (iterable): Paths of images to scale to the whole window
+
+    Returns:
+        dict: id(shared image) -> scaled surface
+    """
+    images = _resolution_sets.get(viewport.resolution)
+    if images is not None:
+        return images
+
+    width, height = viewport.resolution
+    if directory:
+        directory = os.path.join(directory, f"{width}x{height}")
+        os.makedirs(directory, exist_ok=True)
+    cover = {os.path.normpath(path) for path in cover}
+
+    images = {}
+    sources = [((path, None), image) for path, image in _image_cache.items()]
+    sources.extend(_scaled_cache.items())
+    for (path, size), image in sources:
+        source_width, source_height = image.get_size()
+        name = os.path.splitext(os.path.basename(path))[0]
+        area = None
+        if os.path.normpath(path) in cover:
+            # Only the middle part that ends up inside the window is scaled
+            factor = max(width / source_width, height / source_height)
+            area = pygame.Rect(0, 0, min(source_width, round(width / factor)),
+                               min(source_height, round(height / factor)))
+            area.center = (source_width // 2, source_height // 2)
+            size = viewport.resolution
+            name += "_cover"
+        else:
+            size = viewport.image_size((source_width, source_height))
+            name += f"_{source_width}x{source_height}"
+        images[id(image)] = _load_scaled(image, size, area,
+                                         os.path.join(directory, name + ".tga") if directory else None)
+    _resolution_sets[viewport.resolution] = images
+    return images
+
+
+def _load_scaled(image, size, area, file_path):
+    """
+    Scale one image, or read the copy saved by an earlier run
+
+    Args:
+        image (pygame.Surface): Source image
+        size (tuple): Scaled size
+        area (pygame.Rect): Part of the image to scale, or None for all of it
+        file_path (str): Image file to read or write, or None
+    """
+    alpha = bool(image.get_flags() & pygame.SRCALPHA)
+    scaled = None
+    if file_path and os.path.exists(file_path):
+        try:
+            scaled = pygame.image.load(file_path)
+        except pygame.error:
+            pass
+        if scaled is not None and scaled.get_size() != tuple(size):
+            scaled = None
+    if scaled is None:
+        scaled = smoothscale(image.subsurface(area) if area else image, size)
+        if file_path:
+            try:
+                pygame.image.save(scaled, file_path)
+            except (pygame.error, OSError):
+                pass
+    # Match the window's pixel format so blits need no conversion
+    if pygame.display.get_surface():
+        scaled = scaled.convert_alpha() if alpha else scaled.convert()
+    return scaled
+
+
+def clear_cache():
+    """Forget all cached images, masks and pre-scaled sets"""
+    _image_cache.clear()
+    _scaled_cache.clear()
+    _mask_cache.clear()
+    _resolution_sets.clear()
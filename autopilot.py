@@ -0,0 +1,153 @@
+"""
+Autopilot
+Computer-controlled player used for attract mode, soak runs and balance testing.
+"""
+
+import time
+from config import GAME_STATE_PLAYING, AUTOPILOT_SEARCH_DEPTH, AUTOPILOT_SEARCH_BUDGET_MS
+from input_manager import InputSnapshot
+
+# How far above the ship an alien bullet counts as a threat (pixels)
+DANGER_ZONE = 160
+
+# Horizontal slack when lining up a shot (pixels)
+AIM_TOLERANCE = 12
+
+# Candidate actions of the search pilot as (left, right, fire)
+SEARCH_ACTIONS = ((False, False, False), (True, False, False), (False, True, False),
+                  (False, False, True), (True, False, True), (False, True, True))
+
+# Outcome weights of the search pilot
+DAMAGE_PENALTY = 100
+DEFEAT_PENALTY = 1000
+
+
+class AutoPilot:
+    """
+    Simple heuristic pilot: dodge bullets in the ship's lane, otherwise line
+    up under the nearest alien and shoot
+    """
+
+    def control(self, game_manager):
+        """
+        Decide this frame's input
+
+        Args:
+            game_manager: GameManager to read the game state from
+
+        Returns:
+            InputSnapshot: Input the simulation should apply this frame
+        """
+        ship = game_manager.spaceship
+        if ship is None or not ship.alive():
+            return InputSnapshot()
+
+        x = ship.rect.centerx
+        half_width = ship.rect.width // 2 + 8
+
+        # Dodge the closest bullet that is about to hit the ship
+        threats = [bullet for bullet in game_manager.alien_bullet_group
+                   if abs(bullet.rect.centerx - x) < half_width
+                   and ship.rect.top - DANGER_ZONE < bullet.rect.bottom < ship.rect.bottom]
+        if threats:
+            threat = max(threats, key=lambda bullet: bullet.rect.bottom)
+            go_left = threat.rect.centerx >= x
+            if go_left and ship.rect.left <= 0:
+                go_left = False
+            elif not go_left and ship.rect.right >= game_manager.world_size[0]:
+                go_left = True
+            return InputSnapshot(left=go_left, right=not go_left)
+
+        # Line up under the lowest, then nearest, alien
+        aliens = game_manager.get_alien_targets()
+        if not aliens:
+            return InputSnapshot()
+        target = min(aliens, key=lambda alien: (-alien.rect.bottom, abs(alien.rect.centerx - x)))
+        dx = target.rect.centerx - x
+        return InputSnapshot(left=dx < -AIM_TOLERANCE, right=dx > AIM_TOLERANCE,
+                             fire=abs(dx) <= AIM_TOLERANCE * 2)
+
+
+class SearchPilot:
+    """
+    Lookahead pilot: plays each candidate action forward on a fork of the
+    game and picks the one that loses the least health and scores the most,
+    preferring the heuristic pilot's choice when outcomes tie
+
+    Forks copy the game's RNG, so alien shots inside the search horizon are
+    foreseen exactly; this makes it a strong opponent for balance testing.
+    """
+
+    def __init__(self, depth=AUTOPILOT_SEARCH_DEPTH, budget_ms=AUTOPILOT_SEARCH_BUDGET_MS):
+        """
+        Initialize the pilot
+
+        Args:
+            depth (int): Ticks each action is simulated ahead
+            budget_ms (float): Time per decision; remaining actions are skipped once it is spent
+        """
+        self.depth = depth
+        self.budget_ms = budget_ms
+        self.heuristic = AutoPilot()
+        self.decisions = 0
+        self.forks = 0
+        self.search_ns = 0
+
+    def control(self, game_manager):
+        """
+        Decide this frame's input
+
+        Args:
+            game_manager: GameManager to search from
+
+        Returns:
+            InputSnapshot: Input the simulation should apply this frame
+        """
+        suggested = self.heuristic.control(game_manager)
+        ship = game_manager.spaceship
+        if ship is None or not ship.alive() or game_manager.game_state != GAME_STATE_PLAYING:
+            return suggested
+
+        start = time.perf_counter_ns()
+        deadline = start + self.budget_ms * 1e6
+        preferred = (suggested.left, suggested.right, suggested.fire)
+        # The heuristic's action goes first so it is always evaluated
+        actions = (preferred,) + tuple(action for action in SEARCH_ACTIONS if action != preferred)
+        best_action, best_value = preferred, None
+        for action in actions:
+            value = self._evaluate(game_manager, action)
+            if best_value is None or value > best_value:
+                best_action, best_value = action, value
+            if time.perf_counter_ns() > deadline:
+                break
+        self.decisions += 1
+        self.search_ns += time.perf_counter_ns() - start
+
+        left, right, fire = best_action
+        return InputSnapshot(left=left, right=right, fire=fire)
+
+    def _evaluate(self, game_manager, action):
+        """Hold an action on a fork for the search depth and score the outcome"""
+        fork = game_manager.fork()
+        self.forks += 1
+        health = fork.get_player_health()
+        score = fork.score
+        left, right, fire = action
+        for _ in range(self.depth):
+            if fork.step(InputSnapshot(left=left, right=right, fire=fire)) != 0:
+                break
+        value = fork.score - score - DAMAGE_PENALTY * (health - fork.get_player_health())
+        if fork.game_over == -1:
+            value -= DEFEAT_PENALTY
+        return value
+
+    def format_report(self):
+        """
+        Summarize the search cost
+
+        Returns:
+            str: Decisions, forks and time per decision
+        """
+        per_decision = self.search_ns / 1e6 / max(1, self.decisions)
+        return (f"Search pilot: {self.decisions} decisions, {self.forks} forks, "
+                f"{per_decision:.2f} ms per decision")
@@ -0,0 +1,244 @@
+"""
+Capture Module
+Gameplay video capture: each captured frame is copied into a preallocated
+ring of frame buffers in shared memory on the game thread, and a separate
+encoder process writes them out as a raw RGB24 stream, a PNG sequence or an
+animated GIF.
+
+Encoding runs in its own process so it never competes with the game loop
+for the GIL. When the encoder falls behind and no buffer is free, frames are
+dropped rather than stalling the game loop.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+import pygame
+from config import *
+
+# Output formats understood by FrameCapture
+CAPTURE_FORMATS = ('raw', 'png', 'gif')
+
+# Bytes per pixel of the frame buffers (RGBX)
+_PIXEL_BYTES = 4
+
+
+class FrameCapture:
+    """
+    Copies frames into a shared-memory ring and encodes them in another process
+
+    Free buffer indices come back from the encoder on one queue and filled
+    ones go out on another, so the game thread never waits: ``capture``
+    either takes a free buffer or counts the frame as dropped.
+    """
+
+    def __init__(self, size, fmt=CAPTURE_FORMAT, directory=CAPTURE_DIR,
+                 ring_frames=CAPTURE_RING_FRAMES, every=CAPTURE_EVERY):
+        """
+        Allocate the frame ring and start the encoder process
+
+        Args:
+            size (tuple): (width, height) of the captured frames
+            fmt (str): 'raw' (RGB24 stream), 'png' (numbered files) or 'gif'
+            directory (str): Directory the recording is written to
+            ring_frames (int): Number of preallocated frame buffers
+            every (int): Capture every Nth frame offered
+
+        Raises:
+            ValueError: If the format is unknown
+            ImportError: If the format needs Pillow and it is not installed
+        """
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format: {fmt}")
+        if fmt == 'gif':
+            import PIL  # Fail now rather than in the encoder process
+
+        self.size = tuple(size)
+        self.format = fmt
+        self.every = max(1, every)
+        self.offered = 0
+        self.captured = 0
+        self.dropped = 0
+        self.encoded = 0
+        self.capture_ns = 0
+        self.encode_ns = 0
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if fmt == 'raw':
+            self.path = _reserve_path(directory, f"capture-{stamp}", f"-{size[0]}x{size[1]}-rgb24.raw")
+        elif fmt == 'png':
+            self.path = _reserve_path(directory, f"capture-{stamp}", "", directory_output=True)
+        else:
+            self.path = _reserve_path(directory, f"capture-{stamp}", ".gif")
+
+        # Each buffer is a Surface drawing straight into its slice of the ring
+        frame_bytes = self.size[0] * self.size[1] * _PIXEL_BYTES
+        self._memory = shared_memory.SharedMemory(create=True, size=frame_bytes * ring_frames)
+        self._buffers = [pygame.image.frombuffer(self._memory.buf[i * frame_bytes:(i + 1) * frame_bytes],
+                                                 self.size, 'RGBX')
+                         for i in range(ring_frames)]
+
+        context = multiprocessing.get_context('spawn')
+        self._free = context.Queue()
+        self._filled = context.Queue()
+        for index in range(ring_frames):
+            self._free.put(index)
+        self._process = context.Process(
+            target=_encoder, name='capture-encoder', daemon=True,
+            args=(self._memory.name, self.size, ring_frames, fmt, self.path, self.every,
+                  self._filled, self._free))
+        self._process.start()
+
+    def capture(self, read_frame):
+        """
+        Copy the current frame into a free buffer, or drop it
+
+        Args:
+            read_frame (callable): Copies the frame into the Surface it is given
+        """
+        self.offered += 1
+        if (self.offered - 1) % self.every:
+            return
+        start = time.perf_counter_ns()
+        try:
+            index = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+        else:
+            read_frame(self._buffers[index])
+            self._filled.put((index, self.captured))
+            self.captured += 1
+        self.capture_ns += time.perf_counter_ns() - start
+
+    def close(self):
+        """Wait for the encoder to drain the ring, then release the shared memory"""
+        self._filled.put(None)
+        # Free indices keep coming back until the encoder's final stats; stop
+        # waiting if the encoder died without sending them
+        while True:
+            try:
+                item = self._free.get(timeout=0.5)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    print("Warning: Capture encoder exited early; the recording may be incomplete")
+                    break
+                continue
+            if isinstance(item, tuple):
+                self.encoded, self.encode_ns = item
+                break
+        self._process.join()
+        self._buffers = []
+        self._memory.close()
+        self._memory.unlink()
+
+    def format_report(self):
+        """
+        Summarize the recording
+
+        Returns:
+            str: Frame counts, drops and time spent per frame by each side
+        """
+        capture_ms = self.capture_ns / 1e6 / max(1, self.captured + self.dropped)
+        encode_ms = self.encode_ns / 1e6 / max(1, self.encoded)
+        lines = [
+            f"Capture written to {self.path}",
+            f"  frames: {self.captured} captured, {self.encoded} encoded, {self.dropped} dropped",
+            f"  game thread: {capture_ms:.3f} ms/frame   encoder: {encode_ms:.2f} ms/frame",
+        ]
+        if self.format == 'raw':
+            lines.append(f"  play with: ffplay -f rawvideo -pixel_format rgb24 "
+                         f"-video_size {self.size[0]}x{self.size[1]} "
+                         f"-framerate {FPS / self.every:g} {self.path}")
+        return "\n".join(lines)
+
+
+def _encoder(memory_name, size, ring_frames, fmt, path, every, filled, free):
+    """
+    Encoder process: write filled buffers out and hand them back to the ring
+
+    Sends (encoded frames, encode time in ns) on the free queue when done,
+    even if setting up failed.
+    """
+    frame_bytes = size[0] * size[1] * _PIXEL_BYTES
+    memory = None
+    out = None
+    gif_frames = []
+    encoded = 0
+    encode_ns = 0
+    try:
+        memory = shared_memory.SharedMemory(name=memory_name)
+        out = open(path, 'wb') if fmt == 'raw' else None
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            index, number = item
+            start = time.perf_counter_ns()
+            frame = pygame.image.frombuffer(memory.buf[index * frame_bytes:(index + 1) * frame_bytes],
+                                            size, 'RGBX')
+            try:
+                _encode(frame, number, fmt, path, out, gif_frames)
+                encoded += 1
+            except Exception as e:
+                # Non-fatal
+                print(f"Warning: Could not encode frame {number}: {e}")
+            del frame
+            free.put(index)
+            encode_ns += time.perf_counter_ns() - start
+        if gif_frames:
+            gif_frames[0].save(path, save_all=True, append_images=gif_frames[1:],
+                               duration=round(1000 * every / FPS), loop=0)
+    finally:
+        if out:
+            out.close()
+        if memory is not None:
+            memory.close()
+        free.put((encoded, encode_ns))
+
+
+def _reserve_path(directory, name, suffix, directory_output=False):
+    """
+    Create the recording's file (or directory) under a name no earlier recording uses
+
+    Recordings started within the same second get a counter after the name.
+
+    Args:
+        directory (str): Directory the recording goes in
+        name (str): Base name
+        suffix (str): Text after the name (and counter), such as the extension
+        directory_output (bool): Create a directory rather than an empty file
+
+    Returns:
+        str: Path of the created file or directory
+    """
+    number = 0
+    while True:
+        path = os.path.join(directory, f"{name}-{number}{suffix}" if number else f"{name}{suffix}")
+        try:
+            if directory_output:
+                os.mkdir(path)
+            else:
+                open(path, 'xb').close()
+            return path
+        except FileExistsError:
+            number += 1
+
+
+def _encode(frame, number, fmt, path, out, gif_frames):
+    """Encode one frame in the recording's format"""
+    if fmt == 'raw':
+        out.write(pygame.image.tobytes(frame, 'RGB'))
+    elif fmt == 'png':
+        pygame.image.save(frame, os.path.join(path, f"frame-{number:06d}.png"))
+    else:
+        from PIL import Image
+        width, height = frame.get_size()
+        image = Image.frombytes('RGB', (width, height), pygame.image.tobytes(frame, 'RGB'))
+        if CAPTURE_GIF_SCALE != 1.0:
+            image = image.resize((max(1, round(width * CAPTURE_GIF_SCALE)),
+                                  max(1, round(height * CAPTURE_GIF_SCALE))))
+        # Palette conversion keeps the held frames at one byte per pixel
+        gif_frames.append(image.quantize())
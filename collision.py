@@ -0,0 +1,315 @@
+"""
+Collision Module
+Swept (continuous) collision tests for fast projectiles: a moving rect is
+tested along its whole path for the tick, so bullets cannot tunnel through
+thin targets no matter how far they travel per tick.
+
+Run this module directly to check the no-tunneling guarantee at extreme
+bullet speeds:
+    python collision.py
+"""
+
+import sys
+
+
+def segment_box_entry(x0, y0, dx, dy, left, top, right, bottom):
+    """
+    Time of entry of the segment (x0, y0) + t * (dx, dy), t in [0, 1], into
+    an axis-aligned box (slab test)
+
+    Args:
+        x0, y0 (float): Segment start
+        dx, dy (float): Segment displacement
+        left, top, right, bottom (float): Box edges (right/bottom exclusive)
+
+    Returns:
+        float | None: Entry time in [0, 1], or None if the segment misses
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+
+    if dx == 0:
+        if x0 <= left or x0 >= right:
+            return None
+    else:
+        t1 = (left - x0) / dx
+        t2 = (right - x0) / dx
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter = t1
+        if t2 < t_exit:
+            t_exit = t2
+        if t_enter >= t_exit:
+            return None
+
+    if dy == 0:
+        if y0 <= top or y0 >= bottom:
+            return None
+    else:
+        t1 = (top - y0) / dy
+        t2 = (bottom - y0) / dy
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_enter:
+            t_enter = t1
+        if t2 < t_exit:
+            t_exit = t2
+        if t_enter >= t_exit:
+            return None
+
+    return t_enter
+
+
+def sweep_rect(rect, dx, dy, targets):
+    """
+    Find the first sprite a rect hits while moving by (dx, dy)
+
+    The moving rect is reduced to its centre and every target rect is grown
+    by half the moving rect's size, so the test is a single segment check.
+
+    Args:
+        rect (pygame.Rect): Moving rect at the start of the tick
+        dx, dy (float): Displacement for the tick
+        targets: Iterable of sprites with a ``rect``
+
+    Returns:
+        tuple | None: (t, sprite) for the earliest hit, or None
+    """
+    half_w = rect.width / 2.0
+    half_h = rect.height / 2.0
+    x0 = rect.x + half_w
+    y0 = rect.y + half_h
+    path = rect.union(rect.move(dx, dy))
+
+    best_t = None
+    best = None
+    for target in targets:
+        r = target.rect
+        if not path.colliderect(r):
+            continue
+        t = segment_box_entry(x0, y0, dx, dy, r.left - half_w, r.top - half_h,
+                              r.right + half_w, r.bottom + half_h)
+        if t is not None and (best_t is None or t < best_t):
+            best_t = t
+            best = target
+    return None if best is None else (best_t, best)
+
+
+def sweep_mask(sprite, dx, dy, target, t_start=0.0):
+    """
+    Refine a swept rect hit with pixel masks by stepping along the path
+
+    Args:
+        sprite: Moving sprite with ``rect`` and ``mask`` at the start of the tick
+        dx, dy (float): Displacement for the tick
+        target: Target sprite with ``rect`` and ``mask``
+        t_start (float): Path time where the rects first touch
+
+    Returns:
+        float | None: First path time at which the masks overlap, or None
+    """
+    contact = mask_contact(sprite, dx, dy, target, t_start)
+    return contact[0] if contact else None
+
+
+def mask_contact(sprite, dx, dy, target, t_start=0.0):
+    """
+    Like sweep_mask, but also return where the masks first touch
+
+    Args:
+        sprite: Moving sprite with ``rect`` and ``mask`` at the start of the tick
+        dx, dy (float): Displacement for the tick
+        target: Target sprite with ``rect`` and ``mask``
+        t_start (float): Path time where the rects first touch
+
+    Returns:
+        tuple | None: (t, (x, y)) with the contact point in screen
+                      coordinates, or None if the masks never overlap
+    """
+    distance = max(abs(dx), abs(dy))
+    step = max(1.0, min(sprite.rect.width, sprite.rect.height) / 2.0)
+    steps = max(1, int(distance / step) + 1)
+    x0, y0 = sprite.rect.x, sprite.rect.y
+    mask = sprite.mask
+    target_mask = target.mask
+    tx, ty = target.rect.x, target.rect.y
+
+    for i in range(steps + 1):
+        t = t_start + (1.0 - t_start) * i / steps
+        offset = (int(x0 + dx * t) - tx, int(y0 + dy * t) - ty)
+        point = target_mask.overlap(mask, offset)
+        if point:
+            return t, (point[0] + tx, point[1] + ty)
+    return None
+
+
+def sweep_masks(sprite, dx, dy, targets):
+    """
+    Find the first target whose live mask a moving sprite touches
+
+    Args:
+        sprite: Moving sprite with ``rect`` and ``mask`` at the start of the tick
+        dx, dy (float): Displacement for the tick
+        targets: Iterable of sprites with ``rect`` and ``mask``
+
+    Returns:
+        tuple | None: (t, target, (x, y)) for the earliest contact, or None
+    """
+    rect = sprite.rect
+    path = rect.union(rect.move(dx, dy))
+    best = None
+    for target in targets:
+        if not path.colliderect(target.rect):
+            continue
+        hit = sweep_rect(rect, dx, dy, (target,))
+        contact = mask_contact(sprite, dx, dy, target, hit[0]) if hit else None
+        if contact and (best is None or contact[0] < best[0]):
+            best = (contact[0], target, contact[1])
+    return best
+
+
+def sweep_batch(movers, targets):
+    """
+    Resolve many moving rects against the same targets in one pass
+
+    Target edges are extracted once for the whole batch. Each target can be
+    claimed by one mover only; when several movers reach it in the same tick
+    the earliest one wins and the others continue past it.
+
+    Args:
+        movers: Iterable of (rect, dx, dy, payload) tuples
+        targets: Iterable of sprites with a ``rect``
+
+    Returns:
+        list: (payload, t, target) for every mover that hit something
+    """
+    boxes = [(t.rect.left, t.rect.top, t.rect.right, t.rect.bottom, t) for t in targets]
+    candidates = []
+    for rect, dx, dy, payload in movers:
+        half_w = rect.width / 2.0
+        half_h = rect.height / 2.0
+        x0 = rect.x + half_w
+        y0 = rect.y + half_h
+        min_x = min(rect.left, rect.left + dx)
+        max_x = max(rect.right, rect.right + dx)
+        min_y = min(rect.top, rect.top + dy)
+        max_y = max(rect.bottom, rect.bottom + dy)
+        hits = []
+        for left, top, right, bottom, target in boxes:
+            if right <= min_x or left >= max_x or bottom <= min_y or top >= max_y:
+                continue
+            t = segment_box_entry(x0, y0, dx, dy, left - half_w, top - half_h,
+                                  right + half_w, bottom + half_h)
+            if t is not None:
+                hits.append((t, id(target), target))
+        if hits:
+            hits.sort(key=lambda hit: hit[0])
+            candidates.append((hits, payload))
+
+    # Hand out targets earliest-first so two movers never claim the same one
+    claimed = set()
+    results = []
+    for hits, payload in sorted(candidates, key=lambda c: c[0][0][0]):
+        for t, key, target in hits:
+            if key not in claimed:
+                claimed.add(key)
+                results.append((payload, t, target))
+                break
+    return results
+
+
+def run_tunneling_scenario(speeds=(5, 50, 500, 5000, 50000)):
+    """
+    Fire single bullets at a thin target at increasing speeds and check that
+    every one is caught, both with sweep_rect and sweep_batch
+
+    Args:
+        speeds (tuple): Bullet speeds in pixels per tick
+
+    Returns:
+        bool: True if no bullet tunneled
+    """
+    import pygame
+
+    class Target(pygame.sprite.Sprite):
+        def __init__(self, rect):
+            pygame.sprite.Sprite.__init__(self)
+            self.rect = pygame.Rect(rect)
+
+    # A 2px-thick target, far thinner than one tick of travel at high speed
+    target = Target((100, 300, 40, 2))
+    ok = True
+    naive_misses = 0
+    for speed in speeds:
+        for x in range(95, 146, 5):
+            bullet = pygame.Rect(0, 0, 4, 10)
+            bullet.centerx = x
+            bullet.top = target.rect.bottom + speed // 2
+            expected = 100 - bullet.width < bullet.x < 140
+            naive = bullet.move(0, -speed).colliderect(target.rect)
+
+            single = sweep_rect(bullet, 0, -speed, [target]) is not None
+            batch = bool(sweep_batch([(bullet, 0, -speed, None)], [target]))
+            if single != expected or batch != expected:
+                ok = False
+                print(f"FAIL speed={speed} x={x}: expected {expected}, sweep {single}, batch {batch}")
+            elif expected and not naive:
+                naive_misses += 1
+
+    ok = run_sprite_scenario(speeds) and ok
+    if ok:
+        print(f"No tunneling at speeds {', '.join(map(str, speeds))} "
+              f"(a plain overlap test would have missed {naive_misses} of these hits)")
+    else:
+        print("Tunneling detected")
+    return ok
+
+
+def run_sprite_scenario(speeds):
+    """
+    Run the game's own bullet sprites at extreme speeds and check that the
+    alien and the spaceship are always hit
+
+    Args:
+        speeds (tuple): Bullet speeds in pixels per tick
+
+    Returns:
+        bool: True if every shot landed
+    """
+    import pygame
+    from config import SCREEN_WIDTH, SCREEN_HEIGHT
+    from sprites import Spaceship, Aliens, Bullets, Alien_Bullets
+
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        pygame.display.init()
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    ok = True
+    for speed in speeds:
+        aliens = pygame.sprite.Group(Aliens(300, 100))
+        explosions = pygame.sprite.Group()
+        bullet = Bullets(300, SCREEN_HEIGHT - 50)
+        bullet.speed = speed
+        bullets = pygame.sprite.Group(bullet)
+        while bullet.alive():
+            bullets.update(aliens, explosions)
+        if len(aliens) != 0:
+            ok = False
+            print(f"FAIL player bullet at speed {speed} missed the alien")
+
+        ship = Spaceship(300, SCREEN_HEIGHT - 100, 3)
+        ships = pygame.sprite.Group(ship)
+        alien_bullet = Alien_Bullets(300, 50)
+        alien_bullet.speed = speed
+        alien_bullets = pygame.sprite.Group(alien_bullet)
+        while alien_bullet.alive():
+            alien_bullets.update(ships, explosions)
+        if ship.health_remaining != 2:
+            ok = False
+            print(f"FAIL alien bullet at speed {speed} missed the spaceship")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_tunneling_scenario() else 1)
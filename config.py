@@ -9,6 +9,104 @@ import pygame
 SCREEN_WIDTH = 600
 SCREEN_HEIGHT = 800
 FPS = 60
+LOGIC_TICK_RATE = 60  # Simulation updates per second (a divisor of FPS); lower saves CPU
+FRAMES_PER_TICK = max(1, round(FPS / LOGIC_TICK_RATE))  # Speeds below are per frame and scale with this
+
+# Rendering Settings
+RENDER_BACKEND = 'surface'  # 'surface' (software blits) or 'texture' (SDL2 Renderer)
+RENDER_SCALE = 1.0  # Window scale for the texture backend, may be fractional
+RENDER_SOFTWARE = False  # Use SDL's software renderer for the texture backend (no GPU)
+DISPLAY_RESOLUTION = None  # Window (width, height), e.g. (1920, 1080); None = the logical screen size
+SCALED_ASSET_DIR = None  # Directory that keeps images pre-scaled per resolution between runs (None = memory only)
+
+# Quality Governor Settings
+QUALITY_GOVERNOR = True  # Lower quality automatically when frames overrun the budget
+QUALITY_WINDOW_FRAMES = 60  # Frames of history used for each decision
+QUALITY_HOLD_FRAMES = 120  # Frames to wait after a level change before the next one
+QUALITY_DEGRADE_RATIO = 1.1  # Step down when frame p90 exceeds budget * ratio
+QUALITY_RESTORE_RATIO = 0.6  # Step up when frame p90 is below budget * ratio
+QUALITY_MAX_EXPLOSIONS = 8  # Concurrent explosion cap once capping is active
+QUALITY_FULL_CHANNELS = 8  # Mixer channels at full quality
+QUALITY_REDUCED_CHANNELS = 2  # Mixer channels once polyphony is reduced
+QUALITY_LOW_RESOLUTION_SCALE = 0.5  # Back buffer scale at the lowest level
+QUALITY_LOG = True  # Print quality level changes
+
+# Input Settings
+INPUT_LATENCY_SAMPLES = 1000  # Latency samples kept per action
+INPUT_LATENCY_TIMEOUT_MS = 1000  # Drop presses that show no effect within this time
+INPUT_LATENCY_REPORT = False  # Print latency percentiles when the game exits
+
+# Telemetry Settings
+TELEMETRY_ENABLED = False  # Record session events to rotating JSONL files
+TELEMETRY_DIR = "telemetry"
+TELEMETRY_MAX_BYTES = 8 * 1024 * 1024  # Rotate files at this size
+TELEMETRY_MAX_FILES = 64  # Delete the oldest files beyond this count (0 = keep all)
+TELEMETRY_BUFFER_EVENTS = 512  # Events buffered in memory before a background write
+TELEMETRY_QUEUE_BATCHES = 64  # Pending batches before new ones are dropped
+TELEMETRY_FRAME_SAMPLE_EVERY = 10  # Record one frame-time sample every N frames
+
+# Savestate / Rewind Settings
+SAVESTATE_FILE = "savestate.bin"
+SAVESTATE_SAVE_KEY = pygame.K_F5  # Quick save during gameplay
+SAVESTATE_LOAD_KEY = pygame.K_F6  # Quick load during gameplay
+REWIND_ENABLED = True  # Keep a rewind buffer during gameplay
+REWIND_KEY = pygame.K_BACKSPACE  # Hold to rewind
+REWIND_MAX_BYTES = 4 * 1024 * 1024  # Memory cap for the rewind buffer
+REWIND_KEYFRAME_INTERVAL = 30  # Snapshots per keyframe group
+
+# Leaderboard Settings
+LEADERBOARD_URL = None  # e.g. "http://127.0.0.1:8765/scores" (python leaderboard_server.py); None = local history only
+LEADERBOARD_QUEUE_FILE = "score_queue.jsonl"  # Results waiting to be sent
+LEADERBOARD_BATCH_SIZE = 50  # Results per request
+LEADERBOARD_TIMEOUT = 5.0  # Socket timeout in seconds
+LEADERBOARD_RETRY_BASE = 1.0  # First retry delay in seconds, doubled per failure
+LEADERBOARD_RETRY_MAX = 60.0  # Longest retry delay in seconds
+
+# Capture Settings
+CAPTURE_ENABLED = False  # Start recording gameplay on launch
+CAPTURE_KEY = pygame.K_F10  # Start/stop recording
+CAPTURE_FORMAT = 'png'  # 'raw' (RGB24 stream), 'png' (numbered files) or 'gif' (needs Pillow)
+CAPTURE_DIR = "captures"
+CAPTURE_RING_FRAMES = 32  # Preallocated frame buffers; frames are dropped when all are busy
+CAPTURE_EVERY = 1  # Capture every Nth frame
+CAPTURE_GIF_SCALE = 0.5  # GIF frames are downscaled and kept in memory until recording stops
+
+# Spectator Settings
+SPECTATOR_ENABLED = False  # Broadcast the live game to viewers (python spectator.py)
+SPECTATOR_ADDRESS = "127.0.0.1:8766"  # "host:port" or "unix:/path/to.sock"
+SPECTATOR_MAX_BUFFER = 256 * 1024  # Unsent bytes per viewer before it is downsampled to keyframes
+SPECTATOR_DROP_SECONDS = 5.0  # Viewers behind for longer than this are disconnected
+
+# Garbage Collection Settings
+GC_SCHEDULER_ENABLED = True  # Collect garbage between frames and on menus instead of mid-frame
+GC_IDLE_MIN_MS = 2.0  # Leftover frame time needed to run a young collection
+GC_FORCE_COUNT = 20000  # Allocations after which a young collection runs even without idle time
+
+# Tracing Settings
+TRACE_ENABLED = False  # Record frame spans for Chrome/Perfetto traces
+TRACE_DIR = "traces"
+TRACE_BUFFER_SPANS = 200000  # Spans kept in the ring buffer
+TRACE_SLOW_FRAME_MS = 1000.0 / FPS  # Frames at least this slow are always kept
+TRACE_SAMPLE_EVERY = 60  # Also keep every Nth frame (0 = slow frames only)
+TRACE_DUMP_KEY = pygame.K_F9  # Hotkey that writes the trace to TRACE_DIR
+TRACED_GAME_MANAGER_METHODS = ('update_game_logic', '_update_sprite_groups', 'update_alien_shooting',
+                               'get_visible_groups', 'draw_particles', 'draw_health_bar',
+                               '_record_result_if_needed')
+TRACED_RENDERER_METHODS = ('draw_background', 'draw_world')
+
+# Autopilot Settings
+AUTOPILOT_SEARCH_DEPTH = 12  # Ticks the search pilot simulates ahead for each candidate action
+AUTOPILOT_SEARCH_BUDGET_MS = 8.0  # Time per decision after which the search pilot stops early
+
+# Soak Test Settings
+SOAK_MAX_SESSION_SECONDS = 300  # Simulated seconds before a session is abandoned
+SOAK_GROWTH_WINDOW = 10  # Samples that must grow in a row to flag a leak
+SOAK_GROWTH_MIN_RATIO = 0.01  # Fitted growth over the window, relative to the mean, needed to flag it
+SOAK_GROWTH_MIN_SLOPE = 1.0  # Fitted growth per sample (bytes or objects) needed to flag it
+
+# Render Check Settings
+RENDER_CHECK_MAX_FRAMES = 3600  # Frames of play per scripted session at most
+RENDER_CHECK_TOLERANCE = 0  # Largest per-channel difference counted as a match
 
 # Game Settings
 ROWS = 5
@@ -29,6 +127,30 @@ MAX_ALIEN_BULLETS = 5
 # Alien Settings
 ALIEN_MOVE_DISTANCE = 75
 ALIEN_MOVE_SPEED = 1
+ALIEN_POINTS = 10  # Score for each alien destroyed
+
+# Endless Wave Settings
+ENDLESS_WAVES = False  # Clearing the formation brings a harder wave instead of victory
+WAVE_MAX_ROWS = 8
+WAVE_MAX_COLS = 7
+WAVE_COOLDOWN_FACTOR = 0.85  # Alien fire cooldown multiplier per wave
+WAVE_MIN_ALIEN_COOLDOWN = 250  # milliseconds
+WAVE_MAX_ALIEN_BULLETS = 12
+
+# Arena Settings
+ARENA_ENABLED = False  # Play in a world wider than the screen, with a camera following the ship
+ARENA_WIDTH = 24000  # World width in pixels (the world is SCREEN_HEIGHT tall)
+ARENA_ALIEN_ROWS = 6  # Rows of the formation spanning the arena
+ARENA_ALIEN_SPACING = 80  # Horizontal distance between arena aliens
+ARENA_CELL_SIZE = 200  # Cell size of the arena's spatial index in pixels
+ARENA_CAMERA_MARGIN = 200  # Closest the ship comes to a screen edge before the camera scrolls
+
+# Bunker Settings
+BUNKERS_ENABLED = True
+BUNKER_COUNT = 4
+BUNKER_Y = SCREEN_HEIGHT - 200  # Centre line of the bunkers
+BUNKER_SIZE = (66, 48)
+BUNKER_CRATER_RADIUS = 5  # Radius of the hole a bullet blasts into a bunker
 
 # Explosion Settings
 EXPLOSION_SPEED = 3
@@ -38,6 +160,13 @@ EXPLOSION_SIZES = {
     3: (160, 160)  # Large explosion
 }
 
+# Particle Settings
+EXPLOSION_STYLE = 'particles'  # 'particles' (NumPy particle engine) or 'sprites' (frame animation)
+PARTICLE_CAPACITY = 8192  # Maximum live particles
+PARTICLE_FADE_LEVELS = 8  # Pre-rendered brightness steps used while fading
+PARTICLE_DRAG = 0.94  # Velocity kept per frame
+PARTICLE_GRAVITY = 0.15  # Downward pull on debris per frame
+
 # Colors
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
@@ -0,0 +1,117 @@
+"""
+Events Module
+Per-frame game event bus: sprites emit typed events into preallocated
+per-kind buffers during the update, and subscribers (score, audio,
+telemetry, explosions) process each kind in one batched pass afterwards.
+"""
+
+# Event kinds, in dispatch order
+EVENT_SHOT = 0            # player fired; x, y = muzzle position
+EVENT_ALIEN_KILLED = 1    # bullet destroyed an alien; x, y = impact, value = points
+EVENT_PLAYER_HIT = 2      # alien bullet hit the ship; x, y = impact, value = damage
+EVENT_EXPLOSION = 3       # explosion requested; x, y = center, value = size (1-3)
+EVENT_KINDS = (EVENT_SHOT, EVENT_ALIEN_KILLED, EVENT_PLAYER_HIT, EVENT_EXPLOSION)
+
+# Events of one kind a buffer holds before it has to grow
+EVENT_BUFFER_CAPACITY = 64
+
+
+class EventBatch:
+    """
+    Events of one kind emitted during the current frame
+
+    Fields live in parallel preallocated lists; only the first ``count``
+    entries are valid. Iterating yields (x, y, value) tuples in emission order.
+    """
+
+    __slots__ = ('kind', 'count', 'xs', 'ys', 'values', 'handlers')
+
+    def __init__(self, kind, capacity=EVENT_BUFFER_CAPACITY):
+        """
+        Initialize the buffer
+
+        Args:
+            kind (int): Event kind held by this buffer
+            capacity (int): Preallocated number of events
+        """
+        self.kind = kind
+        self.count = 0
+        self.xs = [0] * capacity
+        self.ys = [0] * capacity
+        self.values = [0] * capacity
+        self.handlers = []
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return zip(self.xs[:self.count], self.ys[:self.count], self.values[:self.count])
+
+    def _grow(self):
+        """Double the capacity (only in frames with unusually many events)"""
+        extra = [0] * len(self.xs)
+        self.xs.extend(extra)
+        self.ys.extend(extra)
+        self.values.extend(extra)
+
+
+class EventBus:
+    """
+    Collects events during a simulation tick and dispatches them in batches
+
+    Handlers are called once per kind per ``dispatch`` with the kind's
+    EventBatch, in the order they subscribed.
+    """
+
+    def __init__(self, capacity=EVENT_BUFFER_CAPACITY):
+        """
+        Preallocate one buffer per event kind
+
+        Args:
+            capacity (int): Events of each kind held before a buffer grows
+        """
+        self._batches = tuple(EventBatch(kind, capacity) for kind in EVENT_KINDS)
+        self.emitted = 0
+
+    def subscribe(self, kind, handler):
+        """
+        Register a handler for one event kind
+
+        Args:
+            kind (int): One of the EVENT_* constants
+            handler (callable): Called with the EventBatch of each frame that has events of this kind
+        """
+        self._batches[kind].handlers.append(handler)
+
+    def emit(self, kind, x=0, y=0, value=0):
+        """
+        Record an event for this frame's dispatch
+
+        Args:
+            kind (int): One of the EVENT_* constants
+            x (int): X position
+            y (int): Y position
+            value (int): Kind-specific value (points, damage, size)
+        """
+        batch = self._batches[kind]
+        i = batch.count
+        if i == len(batch.xs):
+            batch._grow()
+        batch.xs[i] = x
+        batch.ys[i] = y
+        batch.values[i] = value
+        batch.count = i + 1
+
+    def dispatch(self):
+        """Hand each kind's events to its handlers, then empty the buffers"""
+        for batch in self._batches:
+            if batch.count:
+                self.emitted += batch.count
+                for handler in batch.handlers:
+                    handler(batch)
+                batch.count = 0
+
+    def clear(self):
+        """Drop any undispatched events"""
+        for batch in self._batches:
+            batch.count = 0
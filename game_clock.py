@@ -0,0 +1,38 @@
+"""
+Game Clock
+Deterministic millisecond clock for headless runs, replays and simulations.
+"""
+
+from config import FPS
+
+
+class SimulatedClock:
+    """
+    Game clock that only moves when advanced
+
+    Instances are callable like pygame.time.get_ticks, so they can be passed
+    as the ``clock`` of a GameManager.
+    """
+
+    def __init__(self, start_ms=0, frame_ms=1000.0 / FPS):
+        """
+        Initialize the clock
+
+        Args:
+            start_ms (float): Initial time in milliseconds
+            frame_ms (float): Time added by each call to tick()
+        """
+        self.time_ms = float(start_ms)
+        self.frame_ms = frame_ms
+
+    def __call__(self):
+        """Return the current time in whole milliseconds"""
+        return int(self.time_ms)
+
+    def tick(self):
+        """Advance the clock by one frame"""
+        self.time_ms += self.frame_ms
+
+    def advance(self, ms):
+        """Advance the clock by the given number of milliseconds"""
+        self.time_ms += ms
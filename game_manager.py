@@ -7,24 +7,130 @@ import pygame
 import random
 import json
 import os
+import uuid
 from config import *
-from sprites import Spaceship, Aliens, Bullets, Alien_Bullets, Explosion
+from sprites import Spaceship, Aliens, Bullets, Alien_Bullets, Explosion, Bunker, fork_sprite, fork_group
+from game_clock import SimulatedClock
+from assets import load_image
+from timers import TimerWheel, TIMER_COUNTDOWN, TIMER_ALIEN_VOLLEY, TIMER_SHIP_RELOAD
+from events import EventBus, EVENT_SHOT, EVENT_ALIEN_KILLED, EVENT_PLAYER_HIT, EVENT_EXPLOSION
+from waves import WavePreparer, build_wave, wave_difficulty
+from arena import Arena
+from viewport import Viewport
+
+# Sound played (once per frame) for each kind of event
+EVENT_SOUNDS = {EVENT_SHOT: 'laser', EVENT_ALIEN_KILLED: 'explosion', EVENT_PLAYER_HIT: 'explosion2'}
+
+# Events of each kind a fork's bus holds before growing (a lookahead tick emits a handful)
+FORK_EVENT_CAPACITY = 8
+
+
+class GameRandom(random.Random):
+    """
+    Random generator whose forks are cheap
+
+    A fork takes over the state only when it first draws a number (most
+    lookaheads never do), and the state is read at most once between draws
+    however often the generator is forked.
+    """
+    
+    def seed(self, *args, **kwargs):
+        self._pending = None  # State a fork takes over on its first draw
+        self._state = None  # getstate() since the last draw
+        super().seed(*args, **kwargs)
+    
+    def random(self):
+        if self._pending is not None:
+            self._take_pending()
+        self._state = None
+        return super().random()
+    
+    def getrandbits(self, k):
+        if self._pending is not None:
+            self._take_pending()
+        self._state = None
+        return super().getrandbits(k)
+    
+    def getstate(self):
+        if self._pending is not None:
+            return self._pending
+        if self._state is None:
+            self._state = super().getstate()
+        return self._state
+    
+    def setstate(self, state):
+        self._pending = None
+        self._state = None
+        super().setstate(state)
+    
+    def fork(self):
+        """
+        Copy the generator
+        
+        Returns:
+            GameRandom: Generator that draws the same numbers from here on
+        """
+        # Created without seeding, since it takes over this state
+        clone = GameRandom.__new__(GameRandom)
+        clone._pending = self.getstate()
+        clone._state = None
+        # gauss() reads this before drawing
+        clone.gauss_next = clone._pending[2]
+        return clone
+    
+    def _take_pending(self):
+        """Load the state a fork was created with"""
+        state, self._pending = self._pending, None
+        super().setstate(state)
+
 
 class GameManager:
     """
     Manages the overall game state, scoring, and game logic
     """
     
-    def __init__(self):
-        """Initialize the game manager"""
+    def __init__(self, clock=None, history_path=None):
+        """
+        Initialize the game manager
+        
+        Args:
+            clock: Callable returning the game time in milliseconds
+                   (pygame.time.get_ticks if None)
+            history_path (str): History file to use instead of HISTORY_FILE
+        """
+        # Game clock
+        self.get_ticks = clock or pygame.time.get_ticks
+        
+        # Random generator for all gameplay decisions (saved with the game state)
+        self.rng = GameRandom()
+        
+        # Telemetry sink (set by the game when telemetry is enabled)
+        self.telemetry = None
+        
+        # Leaderboard ScoreQueue (set by the game when a leaderboard is configured)
+        self.leaderboard = None
+        
         # Game state
-        self.game_state = GAME_STATE_MENU
+        self._game_state = GAME_STATE_MENU
         self.game_over = 0  # 0=playing, 1=victory, -1=defeat
         
-        # Game timing
+        # Game timing: cooldowns and the countdown run on one timer wheel
         self.countdown = COUNTDOWN_TIME
-        self.last_count = pygame.time.get_ticks()
-        self.last_alien_shot = pygame.time.get_ticks()
+        self.alien_volley_ready = False
+        self.timers = TimerWheel(self.get_ticks)
+        self._register_timers()
+        
+        # Waves: in endless mode the next formation is built in the background
+        # while the current one is played
+        self.endless = ENDLESS_WAVES
+        self.wave = 1
+        self.next_wave_seed = 0
+        self.alien_cooldown = ALIEN_COOLDOWN
+        self.max_alien_bullets = MAX_ALIEN_BULLETS
+        self.wave_preparer = WavePreparer()
+        
+        # World wider than the screen, with a camera following the ship (None = one screen)
+        self.arena = Arena() if ARENA_ENABLED else None
         
         # Score tracking
         self.score = 0
@@ -36,23 +142,62 @@ class GameManager:
         self.alien_group = pygame.sprite.Group()
         self.alien_bullet_group = pygame.sprite.Group()
         self.explosion_group = pygame.sprite.Group()
+        self.bunker_group = pygame.sprite.Group()
         
         # Game objects
         self.spaceship = None
         self.bg = None
         
+        # Input snapshot for the current frame (set by the input stage)
+        self.controls = None
+        
         # Sound effects
         self.sounds = {}
         self._load_sounds()
         
+        # Quality knobs driven by the quality governor
+        self.max_explosions = None  # None = unlimited
+        self.explosion_size_shift = 0  # Explosions are drawn this many sizes smaller
+        
+        # Particle engine used instead of explosion sprites, if configured
+        self.particles = self._create_particles() if EXPLOSION_STYLE == 'particles' else None
+        
+        # Events emitted by sprites, handled in one pass after each update
+        self.events = EventBus()
+        self._subscribe_events()
+        
         # History tracking
         self._game_started_at_ms = None
         self._last_result_recorded = False
-        self._history_path = os.path.join(os.path.dirname(__file__), HISTORY_FILE)
+        # Set when the game was rewound or quick-loaded; its result is marked as assisted
+        self.assisted = False
+        self._history_path = history_path or os.path.join(os.path.dirname(__file__), HISTORY_FILE)
         
         # Ensure history file exists
         self._ensure_history_file()
 
+    @property
+    def game_state(self):
+        """Current game state (one of the GAME_STATE_* constants)"""
+        return self._game_state
+    
+    @game_state.setter
+    def game_state(self, state):
+        """Change the game state, recording the transition"""
+        if state != self._game_state:
+            self._emit('state', old=self._game_state, new=state)
+        self._game_state = state
+    
+    @property
+    def world_size(self):
+        """Size of the world the sprites move in (the screen, unless in an arena)"""
+        return self.arena.size if self.arena is not None else (SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    def _emit(self, kind, **fields):
+        """Record a telemetry event if telemetry is enabled"""
+        if self.telemetry:
+            self.telemetry.record(kind, **fields)
+
     def _ensure_history_file(self):
         """Create the history file if it doesn't exist."""
         try:
@@ -90,6 +235,15 @@ class GameManager:
         """
         return self._read_history()[-MAX_HISTORY:]
         
+    def _create_particles(self):
+        """Create the particle engine, or None if NumPy is unavailable"""
+        try:
+            from particles import ParticleSystem
+            return ParticleSystem()
+        except ImportError:
+            print("Warning: NumPy not available, using sprite explosions")
+            return None
+        
     def _load_sounds(self):
         """Load all sound effects"""
         try:
@@ -106,7 +260,7 @@ class GameManager:
     def load_background(self):
         """Load the background image"""
         try:
-            self.bg = pygame.image.load(IMAGES['background'])
+            self.bg = load_image(IMAGES['background'])
         except:
             print("Warning: Could not load background image")
             # Create a simple background if image fails to load
@@ -124,12 +278,22 @@ class GameManager:
         """Create the initial alien formation"""
         for row in range(ROWS):
             for item in range(COLS):
-                alien = Aliens(100 + item * 100, 100 + row * 70)
+                alien = Aliens(100 + item * 100, 100 + row * 70, self.rng)
                 self.alien_group.add(alien)
     
+    def create_bunkers(self):
+        """Create the row of bunkers between the aliens and the player"""
+        if not BUNKERS_ENABLED:
+            return
+        spacing = SCREEN_WIDTH / BUNKER_COUNT
+        for i in range(BUNKER_COUNT):
+            self.bunker_group.add(Bunker(int(spacing * (i + 0.5)), BUNKER_Y))
+    
     def create_spaceship(self):
         """Create the player spaceship"""
-        self.spaceship = Spaceship(int(SCREEN_WIDTH / 2), SCREEN_HEIGHT - 100, PLAYER_HEALTH)
+        self.spaceship = Spaceship(int(self.world_size[0] / 2), SCREEN_HEIGHT - 100, PLAYER_HEALTH)
+        self.spaceship.reloading = True
+        self.timers.schedule(PLAYER_COOLDOWN, TIMER_SHIP_RELOAD)
         self.spaceship_group.add(self.spaceship)
     
     def start_new_game(self, player_name):
@@ -143,8 +307,11 @@ class GameManager:
         self.score = 0
         self.game_over = 0
         self.countdown = COUNTDOWN_TIME
-        self.last_count = pygame.time.get_ticks()
-        self.last_alien_shot = pygame.time.get_ticks()
+        self._set_wave(1)
+        self.timers.clear()
+        self.timers.schedule(1000, TIMER_COUNTDOWN)
+        self.alien_volley_ready = False
+        self.timers.schedule(self.alien_cooldown, TIMER_ALIEN_VOLLEY)
         
         # Clear all sprite groups
         self.spaceship_group.empty()
@@ -152,39 +319,98 @@ class GameManager:
         self.alien_group.empty()
         self.alien_bullet_group.empty()
         self.explosion_group.empty()
+        self.bunker_group.empty()
+        self.events.clear()
+        if self.particles is not None:
+            self.particles.clear()
+            # The arena can be switched on after construction
+            self.particles.bounds = self.world_size
         
         # Create new game objects
-        self.create_aliens()
+        if self.arena is not None:
+            self.arena.populate(self)
+        else:
+            self.create_aliens()
+            self.create_bunkers()
         self.create_spaceship()
-        
-        self.game_state = GAME_STATE_PLAYING
+        if self.arena is not None:
+            self.arena.look_at(self.spaceship)
+        elif self.endless:
+            self.next_wave_seed = self.rng.getrandbits(32)
+            self._prepare_next_wave()
         
         # Start session tracking
-        self._game_started_at_ms = pygame.time.get_ticks()
+        self._game_started_at_ms = self.get_ticks()
         self._last_result_recorded = False
+        self.assisted = False
+        if self.telemetry:
+            self.telemetry.session = uuid.uuid4().hex
+        self._emit('session_start', name=self.player_name)
+        
+        self.game_state = GAME_STATE_PLAYING
+    
+    def _set_wave(self, wave):
+        """Set the wave number and the alien fire settings that go with it"""
+        self.wave = wave
+        self.alien_cooldown, self.max_alien_bullets = wave_difficulty(wave)
+    
+    def _prepare_next_wave(self):
+        """Have the next wave built in the background (forks build it when needed)"""
+        if self.wave_preparer:
+            self.wave_preparer.prepare(self.wave + 1, self.next_wave_seed)
+    
+    def start_next_wave(self):
+        """Swap in the next, harder formation (endless mode)"""
+        wave = self.wave + 1
+        if self.wave_preparer:
+            plan = self.wave_preparer.take(wave, self.next_wave_seed)
+        else:
+            plan = build_wave(wave, self.next_wave_seed)
+        self.alien_group.add(plan.aliens)
+        self._set_wave(wave)
+        self._emit('wave', wave=wave, aliens=len(plan.aliens), shape=plan.shape)
+        
+        self.next_wave_seed = self.rng.getrandbits(32)
+        self._prepare_next_wave()
+    
+    def _register_timers(self):
+        """Attach the game's handlers to the timer wheel"""
+        self.timers.on(TIMER_COUNTDOWN, self._on_countdown)
+        self.timers.on(TIMER_ALIEN_VOLLEY, self._on_alien_volley)
+        self.timers.on(TIMER_SHIP_RELOAD, self._on_ship_reload)
     
-    def update_countdown(self):
-        """Update the countdown timer"""
+    def _on_countdown(self, payload):
+        """One second of the countdown has passed"""
         if self.countdown > 0:
-            count_timer = pygame.time.get_ticks()
-            if count_timer - self.last_count > 1000:
-                self.countdown -= 1
-                self.last_count = count_timer
+            self.countdown -= 1
+            if self.countdown > 0:
+                self.timers.schedule(1000, TIMER_COUNTDOWN)
+    
+    def _on_alien_volley(self, payload):
+        """The aliens' cooldown is over"""
+        self.alien_volley_ready = True
+    
+    def _on_ship_reload(self, payload):
+        """The player's cooldown is over"""
+        if self.spaceship:
+            self.spaceship.reloading = False
     
     def update_alien_shooting(self):
         """Handle alien shooting logic"""
-        time_now = pygame.time.get_ticks()
-        
         # Create alien bullets with cooldown and limits
-        if (time_now - self.last_alien_shot > ALIEN_COOLDOWN and 
-            len(self.alien_bullet_group) < MAX_ALIEN_BULLETS and 
-            len(self.alien_group) > 0):
+        if (self.alien_volley_ready and
+            len(self.alien_bullet_group) < self.max_alien_bullets and 
+            self.alien_group.spritedict):
             
-            # Choose random alien to shoot
-            attacking_alien = random.choice(self.alien_group.sprites())
+            # Choose random alien to shoot (one on screen, in the arena)
+            shooters = self.alien_group.sprites() if self.arena is None else self.arena.visible_aliens()
+            if not shooters:
+                return
+            attacking_alien = self.rng.choice(shooters)
             alien_bullet = Alien_Bullets(attacking_alien.rect.centerx, attacking_alien.rect.bottom)
             self.alien_bullet_group.add(alien_bullet)
-            self.last_alien_shot = time_now
+            self.alien_volley_ready = False
+            self.timers.schedule(self.alien_cooldown, TIMER_ALIEN_VOLLEY)
     
     def update_game_logic(self):
         """
@@ -193,20 +419,28 @@ class GameManager:
         Returns:
             int: Game state (-1=defeat, 0=playing, 1=victory)
         """
+        # Fire expired cooldowns and countdown steps
+        self.timers.advance()
+        
         if self.countdown == 0:
             # Handle alien shooting
             self.update_alien_shooting()
             
-            # Check for victory (all aliens destroyed)
-            if len(self.alien_group) == 0:
-                self.game_over = 1
-                self.game_state = GAME_STATE_VICTORY
-                self._record_result_if_needed(result_label='victory')
+            # All aliens destroyed: next wave in endless mode, otherwise victory
+            # (len() and bool() of a group copy its sprite list; the arena's is huge)
+            if not self.alien_group.spritedict:
+                if self.endless and self.arena is None:
+                    self.start_next_wave()
+                else:
+                    self.game_over = 1
+                    self.game_state = GAME_STATE_VICTORY
+                    self._record_result_if_needed(result_label='victory')
             
             # Update game if still playing
             if self.game_over == 0:
                 # Update spaceship and check for defeat
-                self.game_over = self.spaceship.update(self.bullet_group, self.explosion_group, self.spaceship_group, self)
+                self.game_over = self.spaceship.update(self.bullet_group, self.explosion_group, self.spaceship_group, self,
+                                                       self.controls)
                 
                 if self.game_over == -1:
                     self.game_state = GAME_STATE_GAME_OVER
@@ -215,14 +449,13 @@ class GameManager:
                 # Update all sprite groups
                 self._update_sprite_groups()
                 
-                # Update score based on destroyed aliens
-                self._update_score()
-        
-        # Update countdown
-        self.update_countdown()
+                # Apply score, damage, sounds and explosions from this tick's events
+                self.events.dispatch()
         
         # Update explosions
         self.explosion_group.update()
+        if self.particles is not None:
+            self.particles.update()
         
         return self.game_over
 
@@ -232,14 +465,20 @@ class GameManager:
             return
         self._last_result_recorded = True
         try:
-            started = self._game_started_at_ms or pygame.time.get_ticks()
-            duration_ms = max(0, pygame.time.get_ticks() - started)
+            started = self._game_started_at_ms if self._game_started_at_ms is not None else self.get_ticks()
+            duration_ms = max(0, self.get_ticks() - started)
             entry = {
                 'name': self.player_name,
                 'score': int(self.score),
                 'result': result_label,
-                'duration_ms': int(duration_ms)
+                'duration_ms': int(duration_ms),
+                'assisted': self.assisted
             }
+            self._emit('session_end', **entry)
+            if self.telemetry:
+                self.telemetry.flush()
+            if self.leaderboard:
+                self.leaderboard.submit(entry)
             history = self._read_history()
             history.append(entry)
             self._write_history(history)
@@ -249,52 +488,259 @@ class GameManager:
     
     def _update_sprite_groups(self):
         """Update all sprite groups"""
-        self.bullet_group.update(self.alien_group, self.explosion_group, self)
+        if self.arena is not None:
+            self._update_arena()
+            return
+        self.bullet_group.update(self.alien_group, self.explosion_group, self, self.bunker_group)
         self.alien_group.update()
-        self.alien_bullet_group.update(self.spaceship_group, self.explosion_group, self)
+        self.alien_bullet_group.update(self.spaceship_group, self.explosion_group, self, self.bunker_group)
     
-    def _update_score(self):
-        """Update score based on game events"""
-        # Score increases when aliens are destroyed
-        # This is handled in the bullet collision detection
-        pass
+    def _update_arena(self):
+        """
+        Update the sprites of an arena game: bullets only test the aliens and
+        bunkers the spatial index finds near their paths, and only on-screen
+        aliens move
+        """
+        aliens, bunkers = self.arena.collision_targets(self.bullet_group, self.alien_bullet_group)
+        self.bullet_group.update(aliens, self.explosion_group, self, bunkers)
+        self.arena.advance(self.spaceship)
+        self.alien_bullet_group.update(self.spaceship_group, self.explosion_group, self, bunkers)
     
     def add_score(self, points):
         """Add points to the current score"""
         self.score += points
     
+    def get_sprite_groups(self):
+        """Return the sprite groups in drawing order"""
+        return (self.bunker_group, self.spaceship_group, self.bullet_group, self.alien_group,
+                self.alien_bullet_group, self.explosion_group)
+    
+    def get_visible_groups(self):
+        """Return the sprite groups to draw, in drawing order, culled to the camera view in the arena"""
+        if self.arena is None:
+            return self.get_sprite_groups()
+        return (self.arena.visible_bunkers, self.spaceship_group, self.bullet_group, self.arena.visible_aliens(),
+                self.alien_bullet_group, self.explosion_group)
+    
+    def get_alien_targets(self):
+        """
+        Aliens worth aiming at: all of them, or in the arena the ones on
+        screen (the nearest one if none are)
+        """
+        if self.arena is None:
+            return self.alien_group.sprites()
+        aliens = self.arena.visible_aliens()
+        if not aliens and self.spaceship is not None:
+            nearest = self.arena.nearest_alien(self.spaceship.rect.centerx)
+            aliens = [nearest] if nearest is not None else []
+        return aliens
+    
+    def camera_viewport(self, viewport):
+        """
+        Map world positions through the arena camera
+        
+        Args:
+            viewport (Viewport): Mapping of the logical screen to the window
+        
+        Returns:
+            Viewport: Mapping of world positions to the window (viewport itself outside the arena)
+        """
+        if self.arena is None:
+            return viewport
+        return viewport.shifted(self.arena.camera.topleft)
+    
     def draw_sprites(self, screen):
-        """Draw all sprites on the screen"""
-        self.spaceship_group.draw(screen)
-        self.bullet_group.draw(screen)
-        self.alien_group.draw(screen)
-        self.alien_bullet_group.draw(screen)
-        self.explosion_group.draw(screen)
-    
-    def handle_bullet_collision(self):
-        """Handle bullet collision with aliens and update score"""
-        # This is called when a bullet hits an alien
-        self.add_score(10)  # 10 points per alien
-        if 'explosion' in self.sounds:
-            self.sounds['explosion'].play()
-    
-    def handle_laser_sound(self):
-        """Play laser sound when player shoots"""
-        if 'laser' in self.sounds:
-            self.sounds['laser'].play()
-    
-    def handle_explosion_sound(self):
-        """Play explosion sound when spaceship is hit"""
-        if 'explosion2' in self.sounds:
-            self.sounds['explosion2'].play()
+        """Draw all sprites on the screen (what the camera sees, in the arena)"""
+        if self.arena is None:
+            for group in self.get_sprite_groups():
+                group.draw(screen)
+            self.draw_particles(screen)
+            self.draw_health_bar(screen)
+            return
+        viewport = self.camera_viewport(Viewport(screen.get_size(), screen.get_size()))
+        point = viewport.point
+        screen.blits([(sprite.image, point(*sprite.rect.topleft))
+                      for group in self.get_visible_groups() for sprite in group], False)
+        self.draw_particles(screen, viewport)
+        self.draw_health_bar(screen, viewport)
+    
+    def draw_particles(self, screen, viewport=None):
+        """Draw explosion particles, if the particle engine is in use"""
+        if self.particles is not None:
+            self.particles.draw(screen, viewport)
+    
+    def draw_health_bar(self, screen, viewport=None):
+        """Draw the spaceship health bar while the ship is in play"""
+        if self.spaceship and self.spaceship.alive() and self.countdown == 0:
+            self.spaceship.draw_health_bar(screen, viewport)
+    
+    def spawn_explosion(self, x, y, size):
+        """
+        Create an explosion, honouring the current quality limits
+        
+        Args:
+            x (int): X position for explosion
+            y (int): Y position for explosion
+            size (int): Size of explosion (1=small, 2=medium, 3=large)
+        """
+        size = max(1, size - self.explosion_size_shift)
+        if self.particles is not None:
+            self.particles.emit_explosion(x, y, size, self.max_explosions)
+            return None
+        if self.max_explosions is not None:
+            # Retire the oldest explosions so the newest hit is always shown
+            while len(self.explosion_group) >= self.max_explosions > 0:
+                self.explosion_group.sprites()[0].kill()
+        explosion = Explosion(x, y, size)
+        self.explosion_group.add(explosion)
+        return explosion
+    
+    def _subscribe_events(self, effects=True):
+        """
+        Attach the game's own consumers to the event bus
+        
+        Args:
+            effects (bool): Also attach explosions, telemetry and audio
+                            (forks only need the rules)
+        """
+        events = self.events
+        events.subscribe(EVENT_ALIEN_KILLED, self._score_kills)
+        events.subscribe(EVENT_PLAYER_HIT, self._apply_damage)
+        if not effects:
+            return
+        events.subscribe(EVENT_EXPLOSION, self._spawn_explosions)
+        # Telemetry runs after score and damage so it sees their results
+        events.subscribe(EVENT_SHOT, self._record_shots)
+        events.subscribe(EVENT_ALIEN_KILLED, self._record_kills)
+        events.subscribe(EVENT_PLAYER_HIT, self._record_damage)
+        for kind in EVENT_SOUNDS:
+            events.subscribe(kind, self._play_event_sound)
+    
+    def _score_kills(self, batch):
+        """Add the points of the frame's kills to the score"""
+        self.add_score(sum(batch.values[:batch.count]))
+    
+    def _apply_damage(self, batch):
+        """Take the frame's hits off the spaceship's health"""
+        damage = sum(batch.values[:batch.count])
+        for spaceship in self.spaceship_group:
+            spaceship.health_remaining -= damage
+    
+    def _spawn_explosions(self, batch):
+        """Create the frame's explosions in the order they were requested"""
+        for x, y, size in batch:
+            self.spawn_explosion(x, y, size)
+    
+    def _record_shots(self, batch):
+        """Record one telemetry event per shot"""
+        if self.telemetry:
+            for _ in range(batch.count):
+                self._emit('shot')
+    
+    def _record_kills(self, batch):
+        """Record one telemetry event per kill, with the score after it"""
+        if self.telemetry:
+            points = batch.values[:batch.count]
+            score = self.score - sum(points)
+            for value in points:
+                score += value
+                self._emit('hit', score=score)
+    
+    def _record_damage(self, batch):
+        """Record one telemetry event per hit taken, with the health after it"""
+        if self.telemetry:
+            health = self.get_player_health() + sum(batch.values[:batch.count])
+            for damage in batch.values[:batch.count]:
+                health -= damage
+                self._emit('damage', health=health)
+    
+    def _play_event_sound(self, batch):
+        """Play the event's sound once, however many happened this frame"""
+        sound = self.sounds.get(EVENT_SOUNDS[batch.kind])
+        if sound:
+            sound.play()
+    
+    def fork(self):
+        """
+        Copy the simulation for lookahead search
+        
+        Like ``fork_sprite``, the copy starts from this game's attributes, so
+        fields added to ``__init__`` carry over by themselves; the ones below
+        that change in place (sprites, timers, the RNG, the event bus) get
+        their own copies, and everything else is shared. Images, masks and
+        sounds are shared, and bunker pixels are copied only when a fork
+        erodes them. The fork runs on its own simulated clock starting at the
+        current game time, and has no sound, telemetry, explosions or history
+        (and builds any new wave itself), so it is driven with ``step``.
+        
+        Returns:
+            GameManager: Independent copy of the simulation
+        
+        Raises:
+            ValueError: In an arena game
+        """
+        if self.arena is not None:
+            # Copying the whole world for every lookahead would defeat the arena's culling
+            raise ValueError("Arena games cannot be forked")
+        clone = GameManager.__new__(GameManager)
+        state = self.__dict__.copy()
+        # Methods wrapped on this instance (frame tracing) would run on the original
+        for name in state.keys() & _GAME_MANAGER_ATTRIBUTES:
+            del state[name]
+        clone.__dict__ = state
+        
+        # Keep a simulated clock's fractional milliseconds so timers stay in step
+        now = self.get_ticks.time_ms if isinstance(self.get_ticks, SimulatedClock) else self.get_ticks()
+        clone.get_ticks = SimulatedClock(now, 1000.0 * FRAMES_PER_TICK / FPS)
+        clone.rng = self.rng.fork()
+        clone.timers = self.timers.copy(clone.get_ticks)
+        clone._register_timers()
+        clone.events = EventBus(FORK_EVENT_CAPACITY)
+        clone._subscribe_events(effects=False)
+        
+        clone.spaceship = fork_sprite(self.spaceship) if self.spaceship else None
+        clone.spaceship_group = pygame.sprite.Group()
+        if self.spaceship and self.spaceship.alive():
+            clone.spaceship_group.add(clone.spaceship)
+        clone.bullet_group = fork_group(self.bullet_group)
+        clone.alien_group = fork_group(self.alien_group)
+        clone.alien_bullet_group = fork_group(self.alien_bullet_group)
+        clone.explosion_group = pygame.sprite.Group()
+        clone.bunker_group = fork_group(self.bunker_group, Bunker.fork)
+        
+        # No side effects: sound, telemetry, leaderboard, particles, background wave building
+        clone.telemetry = None
+        clone.leaderboard = None
+        clone.wave_preparer = None
+        clone.particles = None
+        clone.sounds = {}
+        clone.controls = None
+        # Forks never write history
+        clone._last_result_recorded = True
+        return clone
+    
+    def step(self, controls):
+        """
+        Advance a fork by one simulation tick
+        
+        Args:
+            controls (InputSnapshot): Input applied during the tick
+        
+        Returns:
+            int: Game state (-1=defeat, 0=playing, 1=victory)
+        """
+        self.get_ticks.tick()
+        self.controls = controls
+        return self.update_game_logic()
     
     def reset_game(self):
         """Reset the game to menu state"""
         self.game_state = GAME_STATE_MENU
         self.game_over = 0
         self.countdown = COUNTDOWN_TIME
-        self.last_count = pygame.time.get_ticks()
-        self.last_alien_shot = pygame.time.get_ticks()
+        self.alien_volley_ready = False
+        self.timers.clear()
+        self._set_wave(1)
         
         # Clear all sprite groups
         self.spaceship_group.empty()
@@ -302,9 +748,19 @@ class GameManager:
         self.alien_group.empty()
         self.alien_bullet_group.empty()
         self.explosion_group.empty()
+        self.bunker_group.empty()
+        self.events.clear()
+        if self.particles is not None:
+            self.particles.clear()
+        if self.arena is not None:
+            self.arena.clear()
     
     def get_player_health(self):
         """Get current player health"""
         if self.spaceship:
             return self.spaceship.health_remaining
-        return 0 
\ No newline at end of file
+        return 0 
+
+
+# Class attributes; instance attributes with these names (wrapped methods) are not forked
+_GAME_MANAGER_ATTRIBUTES = frozenset(dir(GameManager))
@@ -0,0 +1,138 @@
+"""
+GC Scheduler
+Keeps Python's cyclic garbage collector out of the frame: long-lived
+objects are frozen after startup, automatic collection is switched off,
+and the scheduler runs the collections the allocation counts call for in
+the time left over at the end of a frame, or on menu and pause screens.
+"""
+
+import gc
+import time
+from config import *
+
+
+class GCScheduler:
+    """
+    Runs garbage collection in frame idle time and records every pause
+
+    Young collections run when a frame finishes with at least
+    GC_IDLE_MIN_MS to spare; full collections wait for a screen without
+    gameplay. If allocations pile up past GC_FORCE_COUNT without any idle
+    time, a young collection runs anyway so memory stays bounded.
+    """
+
+    def __init__(self, telemetry=None, frame_budget_ms=1000.0 / FPS, idle_min_ms=GC_IDLE_MIN_MS,
+                 force_count=GC_FORCE_COUNT):
+        """
+        Take over collection from the automatic collector
+
+        Args:
+            telemetry: TelemetrySink that receives a 'gc' event per collection, or None
+            frame_budget_ms (float): Time available per frame
+            idle_min_ms (float): Leftover frame time needed to run a young collection
+            force_count (int): Allocations after which a young collection runs without idle time
+        """
+        self.telemetry = telemetry
+        self.frame_budget_ms = frame_budget_ms
+        self.idle_min_ms = idle_min_ms
+        self.force_count = force_count
+        self.thresholds = gc.get_threshold()
+
+        # Pause statistics per generation: [count, total ms, max ms]
+        self.pauses = {generation: [0, 0.0, 0.0] for generation in range(3)}
+        self.in_frame_pauses = 0
+        self.in_frame_max_ms = 0.0
+        self.forced = 0
+        self.frozen = 0
+
+        self._idle = False
+        self._pause_start = 0
+        self._was_enabled = gc.isenabled()
+        gc.disable()
+        gc.callbacks.append(self._on_gc)
+
+    def freeze(self):
+        """
+        Move every object alive now (assets, fonts, UI) out of future collections
+
+        Call once startup and asset loading are done.
+        """
+        self._idle = True
+        gc.collect()
+        self._idle = False
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+
+    def idle(self, frame_start, relaxed=False):
+        """
+        Run the collection the allocation counts call for, if there is time
+
+        Args:
+            frame_start (float): time.perf_counter() at the start of the frame
+            relaxed (bool): True on screens without gameplay, where a full
+                            collection may run
+        """
+        count0, count1, count2 = gc.get_count()
+        threshold0, threshold1, threshold2 = self.thresholds
+        if count0 < threshold0 and count1 < threshold1 and not (relaxed and count2 >= threshold2):
+            return
+
+        if relaxed and count2 >= threshold2:
+            generation = 2
+        elif count1 >= threshold1:
+            generation = 1
+        else:
+            generation = 0
+
+        if not relaxed:
+            remaining_ms = self.frame_budget_ms - (time.perf_counter() - frame_start) * 1000.0
+            if remaining_ms < self.idle_min_ms:
+                if count0 < self.force_count:
+                    return
+                # No idle time for too long: collect the young generation regardless
+                self.forced += 1
+                generation = 0
+
+        self._idle = True
+        gc.collect(generation)
+        self._idle = False
+
+    def close(self):
+        """Stop recording and hand collection back to the automatic collector"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        gc.unfreeze()
+        if self._was_enabled:
+            gc.enable()
+
+    def _on_gc(self, phase, info):
+        """gc callback: time each collection"""
+        if phase == 'start':
+            self._pause_start = time.perf_counter_ns()
+            return
+        ms = (time.perf_counter_ns() - self._pause_start) / 1e6
+        generation = info['generation']
+        stats = self.pauses[generation]
+        stats[0] += 1
+        stats[1] += ms
+        stats[2] = max(stats[2], ms)
+        if not self._idle:
+            self.in_frame_pauses += 1
+            self.in_frame_max_ms = max(self.in_frame_max_ms, ms)
+        if self.telemetry:
+            self.telemetry.record('gc', gen=generation, ms=round(ms, 3), idle=self._idle)
+
+    def format_report(self):
+        """
+        Summarize the collections
+
+        Returns:
+            str: Pause counts and durations per generation
+        """
+        lines = [f"GC: {self.frozen} objects frozen, {self.in_frame_pauses} collections inside frames "
+                 f"(max {self.in_frame_max_ms:.2f} ms), {self.forced} forced"]
+        for generation, (count, total, longest) in self.pauses.items():
+            if count:
+                lines.append(f"  gen {generation}: {count} collections, "
+                             f"mean {total / count:.3f} ms, max {longest:.3f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,169 @@
+"""
+Input Manager
+Single input stage: drains the event queue once per frame, timestamps events,
+builds an input snapshot for the simulation and measures input-to-frame latency.
+"""
+
+import math
+import time
+from collections import deque
+import pygame
+from config import INPUT_LATENCY_SAMPLES, INPUT_LATENCY_TIMEOUT_MS, REWIND_KEY
+
+# Keys that drive the simulation, mapped to their action names
+ACTION_KEYS = {
+    pygame.K_LEFT: 'left',
+    pygame.K_RIGHT: 'right',
+    pygame.K_SPACE: 'fire'
+}
+
+
+class InputSnapshot:
+    """
+    Input state for one frame, as seen by the simulation
+
+    The simulation adds action names to ``effects`` when an action first
+    changes the game (ship moved, bullet fired) so latency can be measured,
+    and to ``refused`` when a game rule holds the action back (fire while
+    reloading), so that wait is not counted as latency.
+    """
+
+    __slots__ = ('left', 'right', 'fire', 'rewind', 'events', 'timestamp', 'effects', 'refused')
+
+    def __init__(self, left=False, right=False, fire=False, events=(), timestamp=0.0, rewind=False):
+        """
+        Create an input snapshot
+
+        Args:
+            left (bool): Move left held
+            right (bool): Move right held
+            fire (bool): Fire held
+            events (list): (timestamp, event) pairs drained this frame
+            timestamp (float): perf_counter time the snapshot was taken
+            rewind (bool): Rewind held
+        """
+        self.left = left
+        self.right = right
+        self.fire = fire
+        self.rewind = rewind
+        self.events = events
+        self.timestamp = timestamp
+        self.effects = set()
+        self.refused = set()
+
+    @classmethod
+    def from_keyboard(cls):
+        """Build a snapshot from the current keyboard state, without events"""
+        key = pygame.key.get_pressed()
+        return cls(key[pygame.K_LEFT], key[pygame.K_RIGHT], key[pygame.K_SPACE],
+                   timestamp=time.perf_counter(), rewind=key[REWIND_KEY])
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list): Values in ascending order
+        pct (float): Percentile between 0 and 100
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class InputManager:
+    """
+    Drains pygame events once per frame and tracks input latency
+
+    Latency is measured from the moment a key press is drained to the moment
+    the first frame showing its effect is presented, so it is a lower bound
+    on the real end-to-end latency.
+    """
+
+    def __init__(self):
+        """Initialize the input manager"""
+        self.snapshot = InputSnapshot()
+
+        # Presses still waiting for a visible effect: action -> timestamp
+        self._pending = {}
+
+        # Recent latencies in milliseconds, per action
+        self._samples = {action: deque(maxlen=INPUT_LATENCY_SAMPLES) for action in ACTION_KEYS.values()}
+
+    def poll(self):
+        """
+        Drain the event queue and build this frame's input snapshot
+
+        Returns:
+            InputSnapshot: Snapshot with held actions and timestamped events
+        """
+        now = time.perf_counter()
+        events = [(now, event) for event in pygame.event.get()]
+
+        for timestamp, event in events:
+            if event.type == pygame.KEYDOWN and event.key in ACTION_KEYS:
+                self._pending.setdefault(ACTION_KEYS[event.key], timestamp)
+            elif event.type == pygame.KEYUP and event.key in ACTION_KEYS:
+                # Released before anything happened (e.g. fire on cooldown)
+                self._pending.pop(ACTION_KEYS[event.key], None)
+
+        key = pygame.key.get_pressed()
+        self.snapshot = InputSnapshot(key[pygame.K_LEFT], key[pygame.K_RIGHT], key[pygame.K_SPACE],
+                                      events, now, key[REWIND_KEY])
+        return self.snapshot
+
+    def frame_presented(self, snapshot=None):
+        """
+        Resolve latencies for actions whose effect is in the frame just shown
+
+        Args:
+            snapshot (InputSnapshot): Snapshot used for the frame, defaults to the last one
+        """
+        snapshot = snapshot or self.snapshot
+        now = time.perf_counter()
+
+        for action in snapshot.effects:
+            pressed_at = self._pending.pop(action, None)
+            if pressed_at is not None:
+                self._samples[action].append((now - pressed_at) * 1000.0)
+
+        # Presses the game held back (fire on cooldown) would time the game rule, not the pipeline
+        for action in snapshot.refused - snapshot.effects:
+            self._pending.pop(action, None)
+
+        # Forget presses that never produced a visible effect
+        timeout = INPUT_LATENCY_TIMEOUT_MS / 1000.0
+        for action, pressed_at in list(self._pending.items()):
+            if now - pressed_at > timeout:
+                del self._pending[action]
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Get input latency percentiles per action
+
+        Args:
+            percentiles (tuple): Percentiles to compute
+
+        Returns:
+            dict: action -> {'count': n, 'p50': ms, ...}
+        """
+        report = {}
+        for action, samples in self._samples.items():
+            values = sorted(samples)
+            stats = {'count': len(values)}
+            for pct in percentiles:
+                stats[f"p{pct}"] = percentile(values, pct)
+            report[action] = stats
+        return report
+
+    def format_latency_report(self):
+        """Return the latency percentiles as printable text"""
+        lines = ["Input-to-frame latency (ms):"]
+        for action, stats in self.latency_percentiles().items():
+            if stats['count'] == 0:
+                continue
+            lines.append(f"  {action:<6} n={stats['count']:<5} p50={stats['p50']:.1f} "
+                         f"p90={stats['p90']:.1f} p99={stats['p99']:.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,265 @@
+"""
+Leaderboard Module
+Offline-first score submission: results are journaled to disk, batched and
+sent to the leaderboard server by a background worker over one keep-alive
+HTTP connection, retrying with exponential backoff while the server is
+unreachable. Nothing here ever blocks the game loop.
+"""
+
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+from config import *
+
+
+class RejectedBatch(Exception):
+    """The server refused a batch for good (a retry would fail the same way)"""
+    pass
+
+
+class ServerBusy(Exception):
+    """The server answered but asked us to try again later (408, 429, 5xx)"""
+    pass
+
+
+class ScoreQueue:
+    """
+    Persistent outgoing queue of game results
+
+    ``submit`` only hands the entry to the worker thread. The worker appends
+    it to a journal file before trying to send it, and records an ack line
+    once the server has accepted it, so results survive crashes and offline
+    sessions and are sent on a later run.
+    """
+
+    def __init__(self, url=LEADERBOARD_URL, path=LEADERBOARD_QUEUE_FILE, batch_size=LEADERBOARD_BATCH_SIZE,
+                 timeout=LEADERBOARD_TIMEOUT, retry_base=LEADERBOARD_RETRY_BASE, retry_max=LEADERBOARD_RETRY_MAX):
+        """
+        Load unsent results from the journal and start the worker thread
+
+        Args:
+            url (str): Leaderboard endpoint, e.g. "http://127.0.0.1:8765/scores"
+            path (str): Journal file of pending results
+            batch_size (int): Maximum results per request
+            timeout (float): Socket timeout in seconds
+            retry_base (float): First retry delay in seconds (doubles per failure)
+            retry_max (float): Longest retry delay in seconds
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported leaderboard URL: {url}")
+        self._connection_type = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._target = parts.path or '/'
+        self.path = path
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        # Counters (written by the worker, read by anyone)
+        self.sent = 0
+        self.rejected = 0
+        self.requests = 0
+        self.failures = 0
+        self.connections = 0
+
+        self._pending = self._load_journal()
+        self._submitted = len(self._pending)  # only changed by the game thread
+        self._done = 0                        # only changed by the worker
+        self._journal = None
+        self._acked_lines = 0
+        self._connection = None
+        self._incoming = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name='leaderboard-worker', daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """Number of results not yet accepted by the server"""
+        return self._submitted - self._done
+
+    def submit(self, entry):
+        """
+        Queue a result for submission without blocking
+
+        Args:
+            entry (dict): JSON-serializable result; an 'id' is added so the
+                          server can ignore duplicates from retries
+        """
+        entry = dict(entry)
+        entry.setdefault('id', uuid.uuid4().hex)
+        self._submitted += 1
+        self._incoming.put(entry)
+
+    def wait_idle(self, timeout=None):
+        """
+        Wait until every queued result has been sent (for tools and tests)
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending > 0:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=1.0):
+        """
+        Stop the worker after one last send attempt
+
+        Results still unsent stay in the journal for the next run.
+
+        Args:
+            timeout (float): Longest time to wait for the worker
+        """
+        self._incoming.put(None)
+        self._thread.join(timeout)
+
+    def _load_journal(self):
+        """Replay the journal into the list of unacknowledged results"""
+        pending = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash
+                        continue
+                    if 'add' in record:
+                        pending[record['add']['id']] = record['add']
+                    for entry_id in record.get('ack', ()):
+                        pending.pop(entry_id, None)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Non-fatal
+            print(f"Warning: Could not read score queue: {e}")
+        return list(pending.values())
+
+    def _append_journal(self, records):
+        """Append records to the journal, compacting it when it is mostly acks"""
+        if self._journal is None or (self._acked_lines > 1000 and self._acked_lines > 4 * len(self._pending)):
+            self._rewrite_journal()
+        self._journal.write(''.join(json.dumps(record, separators=(',', ':')) + "\n" for record in records))
+        self._journal.flush()
+
+    def _rewrite_journal(self):
+        """Replace the journal with just the pending results"""
+        if self._journal:
+            self._journal.close()
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in self._pending:
+                f.write(json.dumps({'add': entry}, separators=(',', ':')) + "\n")
+        os.replace(temp_path, self.path)
+        self._journal = open(self.path, 'a', encoding='utf-8')
+        self._acked_lines = 0
+
+    def _worker(self):
+        """Worker thread: journal new results, send batches and back off on failure"""
+        failures = 0
+        next_attempt = 0.0
+        stopping = False
+        while True:
+            # Sleep until there is something new or the next retry is due
+            wait = max(0.0, next_attempt - time.monotonic()) if self._pending else None
+            try:
+                items = [self._incoming.get(timeout=wait)]
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self._incoming.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                stopping = True
+            new = [item for item in items if item is not None]
+            if new:
+                try:
+                    self._append_journal([{'add': entry} for entry in new])
+                except Exception as e:
+                    # Non-fatal: the results are still sent from memory
+                    print(f"Warning: Could not write score queue: {e}")
+                self._pending.extend(new)
+
+            if self._pending and (stopping or time.monotonic() >= next_attempt):
+                batch = self._pending[:self.batch_size]
+                try:
+                    self._send(batch)
+                    self.sent += len(batch)
+                    failures = 0
+                except RejectedBatch as e:
+                    print(f"Warning: Leaderboard rejected {len(batch)} results: {e}")
+                    self.rejected += len(batch)
+                except (OSError, http.client.HTTPException, ServerBusy) as e:
+                    self.failures += 1
+                    failures += 1
+                    if not isinstance(e, ServerBusy):
+                        # The connection is in an unknown state
+                        self._disconnect()
+                    # Exponential backoff with jitter so clients do not retry in lockstep
+                    delay = min(self.retry_max, self.retry_base * 2 ** (failures - 1))
+                    next_attempt = time.monotonic() + delay * random.uniform(0.5, 1.0)
+                    batch = None
+                if batch is not None:
+                    del self._pending[:len(batch)]
+                    self._done += len(batch)
+                    try:
+                        self._append_journal([{'ack': [entry['id'] for entry in batch]}])
+                        self._acked_lines += 1
+                    except Exception as e:
+                        print(f"Warning: Could not write score queue: {e}")
+
+            if stopping and (not self._pending or failures):
+                break
+
+        self._disconnect()
+        if self._journal:
+            self._journal.close()
+
+    def _send(self, batch):
+        """POST one batch over the kept-alive connection"""
+        if self._connection is None:
+            self._connection = self._connection_type(self._host, self._port, timeout=self.timeout)
+            self.connections += 1
+        body = json.dumps({'scores': batch}, separators=(',', ':')).encode('utf-8')
+        self.requests += 1
+        self._connection.request('POST', self._target, body, {'Content-Type': 'application/json'})
+        response = self._connection.getresponse()
+        # Read the whole body so the connection can be reused
+        detail = response.read()
+        if response.will_close:
+            self._disconnect()
+        if 200 <= response.status < 300:
+            return
+        if response.status in (408, 429) or response.status >= 500:
+            raise ServerBusy(f"HTTP {response.status}")
+        raise RejectedBatch(f"HTTP {response.status} {detail[:200]!r}")
+
+    def _disconnect(self):
+        """Drop the connection so the next request opens a fresh one"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def format_report(self):
+        """
+        Summarize the queue's activity
+
+        Returns:
+            str: Sent/pending counts and connection reuse
+        """
+        return (f"Leaderboard: {self.sent} sent, {self.pending} pending, {self.rejected} rejected, "
+                f"{self.requests} requests over {self.connections} connections, {self.failures} failed attempts")
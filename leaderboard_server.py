@@ -0,0 +1,190 @@
+"""
+Leaderboard Stand-in Server
+Minimal local leaderboard for development: accepts batched score
+submissions over keep-alive HTTP, ignores duplicate ids, and can inject
+failures and latency to exercise the client's retry logic.
+
+Usage:
+    python leaderboard_server.py [--port 8765] [--fail-rate 0.2] [--latency-ms 50]
+    python leaderboard_server.py --bench 20000 [--fail-rate 0.2]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the submitted scores in memory
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 8765), fail_rate=0.0, latency_ms=0.0):
+        """
+        Bind the server
+
+        Args:
+            address (tuple): (host, port) to listen on; port 0 picks a free one
+            fail_rate (float): Fraction of submissions answered with HTTP 503
+            latency_ms (float): Delay added before every response
+        """
+        ThreadingHTTPServer.__init__(self, address, LeaderboardHandler)
+        self.fail_rate = fail_rate
+        self.latency_ms = latency_ms
+        self.scores = {}
+        self.requests = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Submission URL of this server"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/scores"
+
+    def top(self, count=10):
+        """Return the best scores, highest first"""
+        with self.lock:
+            entries = list(self.scores.values())
+        return sorted(entries, key=lambda entry: entry.get('score', 0), reverse=True)[:count]
+
+
+class LeaderboardHandler(BaseHTTPRequestHandler):
+    """Handles POST /scores (submit a batch) and GET /scores (top 10)"""
+
+    # Keep connections open between requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        """Store a batch of scores"""
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if server.latency_ms:
+            time.sleep(server.latency_ms / 1000.0)
+        if self.path != '/scores':
+            self._reply(404, {'error': 'not found'})
+            return
+        try:
+            scores = json.loads(body)['scores']
+        except (ValueError, KeyError, TypeError):
+            self._reply(400, {'error': 'expected {"scores": [...]}'})
+            return
+
+        with server.lock:
+            server.requests += 1
+            if random.random() < server.fail_rate:
+                server.failed += 1
+                failed = True
+            else:
+                failed = False
+                for entry in scores:
+                    if entry.get('id') in server.scores:
+                        server.duplicates += 1
+                    server.scores[entry.get('id')] = entry
+        if failed:
+            self._reply(503, {'error': 'injected failure'})
+        else:
+            self._reply(200, {'accepted': len(scores)})
+
+    def do_GET(self):
+        """Return the top 10 scores"""
+        if self.path != '/scores':
+            self._reply(404, {'error': 'not found'})
+            return
+        self._reply(200, {'scores': self.server.top()})
+
+    def _reply(self, status, payload):
+        """Send a JSON response"""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep the console quiet"""
+        pass
+
+
+def run_benchmark(count, fail_rate=0.0, latency_ms=0.0, batch_size=None):
+    """
+    Push results through a ScoreQueue to a loopback server and check that
+    every one arrives
+
+    Args:
+        count (int): Number of results to submit
+        fail_rate (float): Fraction of requests the server fails
+        latency_ms (float): Server delay per request
+        batch_size (int): Results per request (LEADERBOARD_BATCH_SIZE if None)
+
+    Returns:
+        bool: True if all results were received
+    """
+    from leaderboard import ScoreQueue
+    from config import LEADERBOARD_BATCH_SIZE
+
+    server = LeaderboardServer(('127.0.0.1', 0), fail_rate, latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with tempfile.TemporaryDirectory() as directory:
+        scores = ScoreQueue(server.url, os.path.join(directory, 'queue.jsonl'),
+                            batch_size=batch_size or LEADERBOARD_BATCH_SIZE, retry_base=0.01, retry_max=0.2)
+
+        # Time spent in submit() is what the game loop would pay
+        start = time.perf_counter()
+        for i in range(count):
+            scores.submit({'name': f"bench{i % 100}", 'score': i, 'result': 'victory', 'duration_ms': i})
+        submit_us = (time.perf_counter() - start) / max(1, count) * 1e6
+        drained = scores.wait_idle(timeout=120)
+        elapsed = time.perf_counter() - start
+        scores.close()
+    server.shutdown()
+    server.server_close()
+
+    received = len(server.scores)
+    print(f"{count} results in {elapsed:.2f}s ({count / elapsed:,.0f}/s), submit {submit_us:.1f} us each")
+    print(f"  {scores.requests} requests over {scores.connections} connections, "
+          f"{server.failed} injected failures, {server.duplicates} duplicates ignored")
+    ok = drained and received == count
+    print(f"  received {received}/{count}: {'OK' if ok else 'MISSING RESULTS'}")
+    return ok
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Local stand-in leaderboard server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of submissions to fail with 503")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="delay added to every response")
+    parser.add_argument('--bench', type=int, metavar='N', help="submit N results through a ScoreQueue and exit")
+    parser.add_argument('--batch-size', type=int, help="results per request for --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        return 0 if run_benchmark(args.bench, args.fail_rate, args.latency_ms, args.batch_size) else 1
+
+    server = LeaderboardServer((args.host, args.port), args.fail_rate, args.latency_ms)
+    print(f"Leaderboard listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
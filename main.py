@@ -2,11 +2,22 @@ import pygame
 from pygame import mixer
 from pygame.locals import *
 import sys
+import time
 
 # Import our custom modules
 from config import *
 from ui_manager import UIManager
 from game_manager import GameManager
+from renderer import create_renderer
+from input_manager import InputManager
+from quality_governor import QualityGovernor
+from telemetry import TelemetrySink
+from tracing import create_tracer
+from leaderboard import ScoreQueue
+from savestate import RewindBuffer, save_state_file, load_state_file
+from capture import FrameCapture
+from spectator import SpectatorFeed
+from gc_scheduler import GCScheduler
 
 # Import constants for screen dimensions
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, FPS
@@ -22,20 +33,60 @@ class SpaceInvadersGame:
         self._initialize_pygame()
         
         # Create game components
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption('Space Invaders')
+        self.renderer = create_renderer(RENDER_BACKEND, (SCREEN_WIDTH, SCREEN_HEIGHT), 'Space Invaders')
+        self.screen = self.renderer.surface
         
         # Initialize game managers
-        self.ui_manager = UIManager()
+        self.input_manager = InputManager()
+        self.ui_manager = UIManager(self.renderer.viewport)
         self.game_manager = GameManager()
         
         # Load game assets
         self.game_manager.load_background()
         
+        # Session telemetry
+        self.telemetry = TelemetrySink() if TELEMETRY_ENABLED else None
+        self.game_manager.telemetry = self.telemetry
+        self.frame_count = 0
+        
+        # Garbage collection between frames (frozen below, once everything is loaded)
+        self.gc_scheduler = GCScheduler(self.telemetry) if GC_SCHEDULER_ENABLED else None
+        self._presented_state = None
+        
+        # Leaderboard submissions (sent in the background)
+        self.leaderboard = ScoreQueue() if LEADERBOARD_URL else None
+        self.game_manager.leaderboard = self.leaderboard
+        
+        # Frame tracer (a no-op unless TRACE_ENABLED)
+        self.tracer = create_tracer()
+        self.tracer.instrument(self.game_manager, TRACED_GAME_MANAGER_METHODS)
+        self.tracer.instrument(self.renderer, TRACED_RENDERER_METHODS)
+        
+        # Gameplay recording
+        self.capture = None
+        if CAPTURE_ENABLED:
+            self._start_capture()
+        
+        # Live feed for spectators (savestates, which it is made of, do not cover the arena)
+        self.spectator = SpectatorFeed() if SPECTATOR_ENABLED and not ARENA_ENABLED else None
+        if self.spectator:
+            print(f"Spectator feed on {self.spectator.address}")
+        
+        # Rewind buffer of recent game ticks (not in the arena, which has no savestates)
+        self.rewind_buffer = RewindBuffer() if REWIND_ENABLED and not ARENA_ENABLED else None
+        
+        # Adaptive quality
+        self.quality_governor = QualityGovernor(self.game_manager, self.renderer) if QUALITY_GOVERNOR else None
+        self._governed = False  # Whether the last frame was fed to the governor
+        
         # Game loop control
         self.clock = pygame.time.Clock()
         self.running = True
         
+        # Startup objects live for the whole session; keep them out of collections
+        if self.gc_scheduler:
+            self.gc_scheduler.freeze()
+        
     def _initialize_pygame(self):
         """Initialize Pygame and audio system"""
         # Initialize mixer with optimized settings
@@ -46,38 +97,121 @@ class SpaceInvadersGame:
     def run(self):
         """Main game loop"""
         while self.running:
-            # Handle events
-            self._handle_events()
+            frame_start = time.perf_counter()
+            self.tracer.begin_frame()
+            
+            # Start a new frame on the renderer
+            self.renderer.begin_frame()
+            
+            with self.tracer.span('input'):
+                # Drain input once and hand the snapshot to the simulation
+                controls = self.input_manager.poll()
+                self.game_manager.controls = controls
+                
+                # Handle events
+                self._handle_events(controls.events)
             
             # Update game state based on current state
-            if self.game_manager.game_state == GAME_STATE_MENU:
-                self._update_menu()
-            elif self.game_manager.game_state == GAME_STATE_PLAYING:
-                self._update_game()
-            elif self.game_manager.game_state == GAME_STATE_GAME_OVER:
-                self._update_game_over()
-            elif self.game_manager.game_state == GAME_STATE_VICTORY:
-                self._update_victory()
+            with self.tracer.span('update'):
+                if self.game_manager.game_state == GAME_STATE_MENU:
+                    self._update_menu()
+                elif self.game_manager.game_state == GAME_STATE_PLAYING:
+                    self._update_game()
+                elif self.game_manager.game_state == GAME_STATE_GAME_OVER:
+                    self._update_game_over()
+                elif self.game_manager.game_state == GAME_STATE_VICTORY:
+                    self._update_victory()
+            
+            # Broadcast each simulation tick to spectators
+            if self.spectator and self.frame_count % FRAMES_PER_TICK == 0:
+                with self.tracer.span('spectator'):
+                    self.spectator.publish(self.game_manager)
+            
+            # Update display; menu and end screens only change where the UI changed
+            with self.tracer.span('present'):
+                dirty_rects = self.ui_manager.end_frame()
+                state = self.game_manager.game_state
+                static = state != GAME_STATE_PLAYING and state == self._presented_state
+                self.renderer.present(dirty_rects if static else None)
+                self._presented_state = state
+            self.input_manager.frame_presented(controls)
+            self.tracer.end_frame()
+            
+            # Let the governor adjust quality from the frame's work time; only play
+            # frames count, menus and end screens have nothing to shed
+            frame_ms = (time.perf_counter() - frame_start) * 1000.0
+            if self.quality_governor:
+                playing = self.game_manager.game_state == GAME_STATE_PLAYING
+                if playing:
+                    if not self._governed:
+                        self.quality_governor.clear_window()
+                    self.quality_governor.record_frame(frame_ms)
+                self._governed = playing
             
-            # Handle quit during countdown
-            if (self.game_manager.game_state == GAME_STATE_PLAYING and 
-                self.game_manager.countdown > 0):
-                self._handle_countdown_events()
+            # Sample frame times into telemetry
+            self.frame_count += 1
+            if self.telemetry and self.frame_count % TELEMETRY_FRAME_SAMPLE_EVERY == 0:
+                self.telemetry.record('frame', ms=round(frame_ms, 3), state=self.game_manager.game_state)
             
-            # Update display
-            pygame.display.update()
+            # Collect garbage in the time left before the next frame
+            if self.gc_scheduler:
+                self.gc_scheduler.idle(frame_start, relaxed=self.game_manager.game_state != GAME_STATE_PLAYING)
             
             # Control frame rate
             self.clock.tick(FPS)
+        
+        if self.gc_scheduler:
+            self.gc_scheduler.close()
+            print(self.gc_scheduler.format_report())
+        
+        if self.telemetry:
+            self.telemetry.close()
+        
+        if self.capture:
+            self._stop_capture()
+        
+        if self.spectator:
+            self.spectator.close()
+        
+        self.game_manager.wave_preparer.close()
+        
+        if self.leaderboard:
+            self.leaderboard.close()
+            print(self.leaderboard.format_report())
+        
+        self.tracer.dump()
+        
+        if INPUT_LATENCY_REPORT:
+            print(self.input_manager.format_latency_report())
     
-    def _handle_events(self):
-        """Handle all pygame events"""
-        for event in pygame.event.get():
+    def _handle_events(self, events):
+        """
+        Handle the events drained by the input stage this frame
+        
+        Args:
+            events (list): (timestamp, event) pairs from InputManager.poll
+        """
+        for _, event in events:
             # Quit event
             if event.type == pygame.QUIT:
                 self.running = False
                 return
             
+            # The window needs a full redraw after being uncovered
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._presented_state = None
+            
+            # Dump the frame trace on demand
+            if event.type == pygame.KEYDOWN and event.key == TRACE_DUMP_KEY:
+                self.tracer.dump()
+            
+            # Start/stop recording
+            if event.type == pygame.KEYDOWN and event.key == CAPTURE_KEY:
+                if self.capture:
+                    self._stop_capture()
+                else:
+                    self._start_capture()
+            
             # Handle events based on game state
             if self.game_manager.game_state == GAME_STATE_MENU:
                 self._handle_menu_events(event)
@@ -93,6 +227,8 @@ class SpaceInvadersGame:
             # Player pressed Enter, start game if name is provided
             if self.ui_manager.player_name.strip():
                 self.game_manager.start_new_game(self.ui_manager.player_name)
+                if self.rewind_buffer:
+                    self.rewind_buffer.clear()
         
         # Handle quit from menu
         if event.type == pygame.KEYDOWN:
@@ -102,164 +238,190 @@ class SpaceInvadersGame:
     def _handle_game_events(self, event):
         """Handle events during gameplay"""
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+            if self.game_manager.countdown > 0:
+                # Allow quitting during countdown
+                if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
+                    self._confirm_quit()
+            elif event.key == pygame.K_ESCAPE:
                 # Show pause menu or quit confirmation
                 self._show_pause_menu()
             elif event.key == pygame.K_q:
                 # Quick quit during gameplay
                 self._confirm_quit()
+            elif event.key == SAVESTATE_SAVE_KEY:
+                self._save_state()
+            elif event.key == SAVESTATE_LOAD_KEY:
+                self._load_state()
+    
+    def _start_capture(self):
+        """Start recording the presented frames"""
+        try:
+            self.capture = FrameCapture(self.renderer.output_size)
+        except (ImportError, ValueError, OSError) as e:
+            print(f"Warning: Could not start capture: {e}")
+            return
+        self.renderer.capture = self.capture
+        print(f"Recording to {self.capture.path}")
+    
+    def _stop_capture(self):
+        """Stop recording and wait for the encoder to finish"""
+        self.renderer.capture = None
+        self.capture.close()
+        print(self.capture.format_report())
+        self.capture = None
+    
+    def _save_state(self):
+        """Quick save the running game to the savestate file"""
+        try:
+            save_state_file(self.game_manager)
+            print(f"Game saved to {SAVESTATE_FILE}")
+        except Exception as e:
+            print(f"Warning: Could not save game: {e}")
+    
+    def _load_state(self):
+        """Quick load the game from the savestate file"""
+        try:
+            load_state_file(self.game_manager)
+        except Exception as e:
+            print(f"Warning: Could not load savestate: {e}")
+            return
+        if self.rewind_buffer:
+            self.rewind_buffer.clear()
     
     def _handle_end_game_events(self, event):
         """Handle events during game over/victory state"""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:  # Restart
                 self.game_manager.reset_game()
+                if self.rewind_buffer:
+                    self.rewind_buffer.clear()
                 self.ui_manager.player_name = ""
             elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:  # Quit
                 self.running = False
     
-    def _handle_countdown_events(self):
-        """Handle events during countdown (allow quitting)"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-                return
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                    self._confirm_quit()
-                    return
-    
     def _show_pause_menu(self):
         """Show pause menu with options to resume or quit"""
-        paused = True
-        while paused:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:  # Resume
-                        paused = False
-                    elif event.key == pygame.K_q:  # Quit
-                        self._confirm_quit()
+        # Freeze cooldowns and the countdown while the game is not running
+        self.game_manager.timers.pause()
+        try:
+            paused = True
+            while paused:
+                for _, event in self.input_manager.poll().events:
+                    if event.type == pygame.QUIT:
+                        self.running = False
                         return
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:  # Resume
+                            paused = False
+                        elif event.key == pygame.K_q:  # Quit
+                            self._confirm_quit()
+                            return
             
-            # Draw pause menu
-            self._draw_pause_menu()
-            pygame.display.update()
-            self.clock.tick(FPS)
-    
-    def _draw_pause_menu(self):
-        """Draw the pause menu overlay"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Pause menu text
-        pause_img, pause_pos = self.ui_manager.draw_centered_text("PAUSED", 'large', WHITE, SCREEN_HEIGHT // 2 - 100)
-        self.screen.blit(pause_img, pause_pos)
-        
-        resume_img, resume_pos = self.ui_manager.draw_centered_text("Press ESC to resume", 'medium', WHITE, SCREEN_HEIGHT // 2)
-        self.screen.blit(resume_img, resume_pos)
-        
-        quit_img, quit_pos = self.ui_manager.draw_centered_text("Press Q to quit", 'medium', WHITE, SCREEN_HEIGHT // 2 + 50)
-        self.screen.blit(quit_img, quit_pos)
+                # Draw pause menu
+                self.ui_manager.draw_pause_menu(self.screen)
+                self.ui_manager.end_frame()
+                self.renderer.present()
+                if self.gc_scheduler:
+                    self.gc_scheduler.idle(time.perf_counter(), relaxed=True)
+                self.clock.tick(FPS)
+        finally:
+            self.game_manager.timers.resume()
     
     def _confirm_quit(self):
         """Show quit confirmation dialog"""
-        confirmed = False
-        while not confirmed:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_y:  # Yes, quit
+        # Freeze cooldowns and the countdown while the game is not running
+        self.game_manager.timers.pause()
+        try:
+            confirmed = False
+            while not confirmed:
+                for _, event in self.input_manager.poll().events:
+                    if event.type == pygame.QUIT:
                         self.running = False
                         return
-                    elif event.key == pygame.K_n or event.key == pygame.K_ESCAPE:  # No, cancel
-                        confirmed = True
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_y:  # Yes, quit
+                            self.running = False
+                            return
+                        elif event.key == pygame.K_n or event.key == pygame.K_ESCAPE:  # No, cancel
+                            confirmed = True
             
-            # Draw quit confirmation
-            self._draw_quit_confirmation()
-            pygame.display.update()
-            self.clock.tick(FPS)
-    
-    def _draw_quit_confirmation(self):
-        """Draw quit confirmation dialog"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Confirmation text
-        confirm_img, confirm_pos = self.ui_manager.draw_centered_text("Quit game?", 'large', WHITE, SCREEN_HEIGHT // 2 - 100)
-        self.screen.blit(confirm_img, confirm_pos)
-        
-        yes_img, yes_pos = self.ui_manager.draw_centered_text("Press Y to quit", 'medium', WHITE, SCREEN_HEIGHT // 2)
-        self.screen.blit(yes_img, yes_pos)
-        
-        no_img, no_pos = self.ui_manager.draw_centered_text("Press N or ESC to cancel", 'medium', WHITE, SCREEN_HEIGHT // 2 + 50)
-        self.screen.blit(no_img, no_pos)
+                # Draw quit confirmation
+                self.ui_manager.draw_quit_confirmation(self.screen)
+                self.ui_manager.end_frame()
+                self.renderer.present()
+                if self.gc_scheduler:
+                    self.gc_scheduler.idle(time.perf_counter(), relaxed=True)
+                self.clock.tick(FPS)
+        finally:
+            self.game_manager.timers.resume()
     
     def _update_menu(self):
         """Update and render menu screen"""
-        # Draw background
-        self.game_manager.draw_background(self.screen)
-        
-        # Draw menu UI
         last_history = self.game_manager.get_last_history()
-        self.ui_manager.draw_menu(self.screen, last_history=last_history)
+        with self.tracer.span('draw'):
+            # Draw background
+            self.renderer.draw_background(self.game_manager.bg)
+            
+            # Draw menu UI
+            self.ui_manager.draw_menu(self.screen, last_history=last_history)
     
     def _update_game(self):
         """Update and render game screen"""
-        # Draw background
-        self.game_manager.draw_background(self.screen)
-        
-        # Update game logic
-        game_over = self.game_manager.update_game_logic()
-        
-        # Draw countdown if still counting down
-        if self.game_manager.countdown > 0:
-            self.ui_manager.draw_countdown(self.screen, self.game_manager.countdown)
+        # Update game logic at the simulation tick rate, or step back while rewinding
+        if self.frame_count % FRAMES_PER_TICK == 0:
+            controls = self.game_manager.controls
+            if self.rewind_buffer and controls is not None and controls.rewind:
+                self.rewind_buffer.rewind(self.game_manager)
+            else:
+                self.game_manager.update_game_logic()
+                if self.rewind_buffer and self.game_manager.game_state == GAME_STATE_PLAYING:
+                    self.rewind_buffer.push(self.game_manager)
         
-        # Draw sprites
-        self.game_manager.draw_sprites(self.screen)
-        
-        # Draw HUD (score, player name, health)
-        self.ui_manager.draw_hud(
-            self.screen, 
-            self.game_manager.score, 
-            self.game_manager.player_name, 
-            self.game_manager.get_player_health()
-        )
+        with self.tracer.span('draw'):
+            # Draw background and sprites (what the camera sees, in the arena)
+            viewport = self.game_manager.camera_viewport(self.renderer.viewport)
+            self.renderer.draw_world(self.game_manager.bg, self.game_manager.get_visible_groups(), viewport)
+            self.game_manager.draw_particles(self.screen, viewport)
+            self.game_manager.draw_health_bar(self.screen, viewport)
+            
+            # Draw countdown if still counting down
+            if self.game_manager.countdown > 0:
+                self.ui_manager.draw_countdown(self.screen, self.game_manager.countdown)
+            
+            # Draw HUD (score, player name, health)
+            self.ui_manager.draw_hud(
+                self.screen, 
+                self.game_manager.score, 
+                self.game_manager.player_name, 
+                self.game_manager.get_player_health(),
+                self.game_manager.wave if self.game_manager.endless else None
+            )
     
     def _update_game_over(self):
         """Update and render game over screen"""
-        # Draw background
-        self.game_manager.draw_background(self.screen)
-        
-        # Draw game over screen
-        self.ui_manager.draw_game_over_screen(
-            self.screen, 
-            self.game_manager.score, 
-            self.game_manager.player_name
-        )
+        with self.tracer.span('draw'):
+            # Draw background
+            self.renderer.draw_background(self.game_manager.bg)
+            
+            # Draw game over screen
+            self.ui_manager.draw_game_over_screen(
+                self.screen, 
+                self.game_manager.score, 
+                self.game_manager.player_name
+            )
     
     def _update_victory(self):
         """Update and render victory screen"""
-        # Draw background
-        self.game_manager.draw_background(self.screen)
-        
-        # Draw victory screen
-        self.ui_manager.draw_victory_screen(
-            self.screen, 
-            self.game_manager.score, 
-            self.game_manager.player_name
-        )
+        with self.tracer.span('draw'):
+            # Draw background
+            self.renderer.draw_background(self.game_manager.bg)
+            
+            # Draw victory screen
+            self.ui_manager.draw_victory_screen(
+                self.screen, 
+                self.game_manager.score, 
+                self.game_manager.player_name
+            )
     
     def quit(self):
         """Clean up and quit the game"""
@@ -0,0 +1,206 @@
+"""
+Particles Module
+NumPy-backed particle engine for explosions: debris, sparks and fading are
+integrated and culled in batches, and drawn with a single Surface.blits call.
+"""
+
+from itertools import repeat
+import numpy as np
+import pygame
+from config import *
+
+# Particle kinds
+DEBRIS = 0
+SPARK = 1
+
+# (debris, sparks) emitted per explosion size
+PARTICLE_COUNTS = {
+    1: (6, 6),
+    2: (14, 16),
+    3: (60, 60)
+}
+
+# Base colors and dot sizes per kind
+PARTICLE_COLORS = {
+    DEBRIS: (255, 120, 40),
+    SPARK: (255, 240, 160)
+}
+PARTICLE_SIZES = {
+    DEBRIS: 3,
+    SPARK: 2
+}
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle pool stored as NumPy arrays
+
+    Live particles always occupy the first ``count`` rows; dead ones are
+    removed by compacting the arrays once per update.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None, bounds=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """
+        Initialize the particle pool
+
+        Args:
+            capacity (int): Maximum number of live particles
+            seed (int): Seed for the particle random generator
+            bounds (tuple): (width, height) of the world; particles leaving it are dropped
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.bounds = bounds
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        # Explosion each particle came from; explosions are numbered in emission order
+        self.explosion = np.zeros(capacity, dtype=np.int64)
+        self._explosions = 0
+
+        # Pre-rendered dots, indexed by kind * PARTICLE_FADE_LEVELS + fade level,
+        # plus larger sets for scaled viewports keyed by scale
+        self._dots = self._render_dots(1.0)
+        self._scaled_dots = {}
+
+    def __len__(self):
+        """Number of live particles"""
+        return self.count
+
+    @staticmethod
+    def _render_dots(scale):
+        """Render the dot of every kind and fade level at a scale"""
+        dots = []
+        for kind in sorted(PARTICLE_COLORS):
+            color = PARTICLE_COLORS[kind]
+            size = max(1, round(PARTICLE_SIZES[kind] * scale))
+            for level in range(1, PARTICLE_FADE_LEVELS + 1):
+                fade = level / PARTICLE_FADE_LEVELS
+                dot = pygame.Surface((size, size), pygame.SRCALPHA)
+                dot.fill((int(color[0] * fade), int(color[1] * fade), int(color[2] * fade), int(255 * fade)))
+                dots.append(dot)
+        return dots
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+
+    def emit_explosion(self, x, y, size, max_explosions=None):
+        """
+        Emit the debris and sparks for one explosion
+
+        Args:
+            x (float): Explosion centre x
+            y (float): Explosion centre y
+            size (int): Size of explosion (1=small, 2=medium, 3=large)
+            max_explosions (int): Most explosions with live particles, None for no limit;
+                the oldest are retired so the new one is always shown
+        """
+        if max_explosions is not None and max_explosions > 0:
+            self.retire_explosions(max_explosions - 1)
+        self._explosions += 1
+        debris, sparks = PARTICLE_COUNTS[size]
+        scale = EXPLOSION_SIZES[size][0] / 40.0
+        self._emit(x, y, debris, DEBRIS, 0.5 * scale, 2.0 * scale, 18, 30)
+        self._emit(x, y, sparks, SPARK, 2.0 * scale, 5.0 * scale, 8, 16)
+
+    def _emit(self, x, y, amount, kind, min_speed, max_speed, min_life, max_life):
+        """Append ``amount`` particles flying out from (x, y) in random directions"""
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return
+        start = self.count
+        end = start + amount
+        rng = self.rng
+
+        angle = rng.uniform(0.0, 2.0 * np.pi, amount)
+        speed = rng.uniform(min_speed, max_speed, amount)
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        life = rng.uniform(min_life, max_life, amount)
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.kind[start:end] = kind
+        self.explosion[start:end] = self._explosions
+        self.count = end
+
+    def retire_explosions(self, keep):
+        """
+        Remove the particles of the oldest explosions, keeping the newest ``keep``
+
+        Args:
+            keep (int): Number of explosions whose particles stay
+        """
+        n = self.count
+        if n == 0:
+            return
+        # Particles stay in emission order, so each explosion is one run of rows
+        starts = np.flatnonzero(np.diff(self.explosion[:n])) + 1
+        retire = len(starts) + 1 - keep
+        if retire <= 0:
+            return
+        cut = int(starts[retire - 1]) if retire <= len(starts) else n
+        for array in (self.pos, self.vel, self.life, self.max_life, self.kind, self.explosion):
+            array[:n - cut] = array[cut:n]
+        self.count = n - cut
+
+    def update(self, frames=FRAMES_PER_TICK):
+        """
+        Integrate motion and drop dead particles and those outside the world
+
+        Args:
+            frames (int): Number of frames the tick covers
+        """
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        life = self.life[:n]
+
+        # Drag, gravity (debris only) and motion
+        vel *= PARTICLE_DRAG ** frames
+        vel[:, 1] += np.where(self.kind[:n] == DEBRIS, PARTICLE_GRAVITY * frames, 0.0)
+        pos += vel * frames
+        life -= frames
+
+        width, height = self.bounds
+        alive = ((life > 0) & (pos[:, 0] >= 0) & (pos[:, 0] < width)
+                 & (pos[:, 1] >= 0) & (pos[:, 1] < height))
+        live = int(np.count_nonzero(alive))
+        if live != n:
+            for array in (self.pos, self.vel, self.life, self.max_life, self.kind, self.explosion):
+                array[:live] = array[:n][alive]
+            self.count = live
+
+    def draw(self, surface, viewport=None):
+        """
+        Draw every live particle with one additive Surface.blits call
+
+        Args:
+            surface (pygame.Surface): Surface to draw on
+            viewport (Viewport): Mapping of logical positions to the surface, None if they match
+        """
+        n = self.count
+        if n == 0:
+            return
+        levels = np.ceil(self.life[:n] / self.max_life[:n] * PARTICLE_FADE_LEVELS).astype(np.int32)
+        np.clip(levels, 1, PARTICLE_FADE_LEVELS, out=levels)
+        dot_index = self.kind[:n].astype(np.int32) * PARTICLE_FADE_LEVELS + levels - 1
+        pos = self.pos[:n]
+        if viewport is None or viewport.identity:
+            dot_set = self._dots
+        else:
+            dot_set = self._scaled_dots.get(viewport.scale)
+            if dot_set is None:
+                dot_set = self._scaled_dots[viewport.scale] = self._render_dots(viewport.scale)
+            pos = pos * viewport.scale + viewport.offset
+        dots = map(dot_set.__getitem__, dot_index.tolist())
+        positions = map(tuple, pos.astype(np.int32).tolist())
+        surface.blits(zip(dots, positions, repeat(None), repeat(pygame.BLEND_RGBA_ADD)), False)
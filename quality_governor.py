@@ -0,0 +1,109 @@
+"""
+Quality Governor
+Watches recent frame times and steps quality down when frames overrun the
+budget, then restores it once there is headroom again.
+"""
+
+from collections import deque
+import pygame
+from config import *
+from input_manager import percentile
+
+# Quality levels in the order they are applied; level N enables steps 1..N
+QUALITY_LEVELS = (
+    'full quality',
+    'cap concurrent explosions',
+    'smaller explosion frames',
+    'reduced sound polyphony',
+    'background redraw disabled',
+    'low-resolution back buffer'
+)
+
+
+class QualityGovernor:
+    """
+    Adaptive quality controller with hysteresis
+
+    A level change needs a full window of frames whose 90th percentile frame
+    time is over (or comfortably under) budget, and after any change the
+    governor holds still for a while before moving again. The last level
+    is only used with a renderer that has a low-resolution back buffer.
+    """
+
+    def __init__(self, game_manager, renderer, budget_ms=1000.0 / FPS):
+        """
+        Initialize the governor
+
+        Args:
+            game_manager: GameManager whose explosion and sound limits are adjusted
+            renderer: Renderer whose background and resolution knobs are adjusted
+            budget_ms (float): Target frame time in milliseconds
+        """
+        self.game_manager = game_manager
+        self.renderer = renderer
+        self.budget_ms = budget_ms
+        self.level = 0
+        # The texture backend has no back buffer to shrink, so it stops a level earlier
+        self.max_level = len(QUALITY_LEVELS) - (1 if hasattr(renderer, 'set_resolution_scale') else 2)
+        self._frames = deque(maxlen=QUALITY_WINDOW_FRAMES)
+        self._hold = 0
+
+    def record_frame(self, frame_ms):
+        """
+        Record the work time of one frame and adjust quality if needed
+
+        Args:
+            frame_ms (float): Time spent on the frame, excluding the frame-rate sleep
+        """
+        self._frames.append(frame_ms)
+        if self._hold > 0:
+            self._hold -= 1
+            return
+        if len(self._frames) < self._frames.maxlen:
+            return
+
+        p90 = percentile(sorted(self._frames), 90)
+        if p90 > self.budget_ms * QUALITY_DEGRADE_RATIO and self.level < self.max_level:
+            self.set_level(self.level + 1, p90)
+        elif p90 < self.budget_ms * QUALITY_RESTORE_RATIO and self.level > 0:
+            self.set_level(self.level - 1, p90)
+
+    def clear_window(self):
+        """Forget the recorded frames, so the next decision only sees frames from now on"""
+        self._frames.clear()
+
+    def set_level(self, level, p90=None):
+        """
+        Switch to a quality level and apply every setting it implies
+
+        Args:
+            level (int): Index into QUALITY_LEVELS, at most max_level
+            p90 (float): Frame time that triggered the change, for the log
+        """
+        previous = self.level
+        self.level = level
+        self._frames.clear()
+        self._hold = QUALITY_HOLD_FRAMES
+        self.apply()
+
+        if QUALITY_LOG and level != previous:
+            direction = "down" if level > previous else "up"
+            reason = f" (frame p90 {p90:.1f}ms, budget {self.budget_ms:.1f}ms)" if p90 is not None else ""
+            print(f"Quality {direction}: level {level} - {QUALITY_LEVELS[level]}{reason}")
+
+    def apply(self):
+        """Push the settings for the current level to the game and renderer"""
+        level = self.level
+        game_manager = self.game_manager
+
+        game_manager.max_explosions = QUALITY_MAX_EXPLOSIONS if level >= 1 else None
+        game_manager.explosion_size_shift = 1 if level >= 2 else 0
+
+        if pygame.mixer.get_init():
+            pygame.mixer.set_num_channels(QUALITY_REDUCED_CHANNELS if level >= 3 else QUALITY_FULL_CHANNELS)
+
+        self.renderer.background_enabled = level < 4
+        if self.max_level >= 5:
+            scale = QUALITY_LOW_RESOLUTION_SCALE if level >= 5 else 1.0
+            if scale != self.renderer.resolution_scale:
+                self.renderer.set_resolution_scale(scale)
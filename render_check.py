@@ -0,0 +1,432 @@
+"""
+Render Check
+Replays deterministic scripted sessions (menu, autopilot play, end screen)
+and draws every frame twice: through the reference path (background blit,
+GameManager.draw_sprites and UIManager onto a plain Surface) and through a
+candidate path built on a renderer backend. The frames are compared pixel
+by pixel within a tolerance, or by hash, and the first frame that differs
+is reported. With --bench the two paths are timed side by side instead.
+
+Candidate paths:
+    surface      SurfaceRenderer, as the game loop draws a frame
+    dirty        SurfaceRenderer, keeping only the areas present() updates
+    backbuffer   SurfaceRenderer through a half-resolution back buffer
+    texture      TextureRenderer (SDL2 textures), read back after present()
+
+Usage:
+    python render_check.py --path dirty
+    python render_check.py --path texture --explosions sprites --tolerance 3 --save-diff diffs
+    python render_check.py --path texture --bench
+"""
+
+import os
+
+# Run without a window or sound card
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import time
+import numpy as np
+import pygame
+from config import *
+from game_clock import SimulatedClock
+from autopilot import AutoPilot
+from arena import Arena
+from input_manager import percentile
+
+# Candidate paths that can be checked against the reference
+CANDIDATE_PATHS = ('surface', 'dirty', 'backbuffer', 'texture')
+
+
+def draw_ui(ui_manager, screen, game_manager, player_name, history):
+    """
+    Draw the UI of the current game state, as the game loop does
+
+    Args:
+        ui_manager: UIManager of the path
+        screen (pygame.Surface): Surface the UI is drawn onto
+        game_manager: GameManager being replayed
+        player_name (str): Name typed so far on the menu
+        history (list): History entries shown on the menu
+
+    Returns:
+        list: Screen areas whose UI changed since the previous frame
+    """
+    state = game_manager.game_state
+    if state == GAME_STATE_MENU:
+        ui_manager.player_name = player_name
+        ui_manager.draw_menu(screen, last_history=history)
+    elif state == GAME_STATE_PLAYING:
+        if game_manager.countdown > 0:
+            ui_manager.draw_countdown(screen, game_manager.countdown)
+        ui_manager.draw_hud(screen, game_manager.score, game_manager.player_name,
+                            game_manager.get_player_health(),
+                            game_manager.wave if game_manager.endless else None)
+    elif state == GAME_STATE_GAME_OVER:
+        ui_manager.draw_game_over_screen(screen, game_manager.score, game_manager.player_name)
+    elif state == GAME_STATE_VICTORY:
+        ui_manager.draw_victory_screen(screen, game_manager.score, game_manager.player_name)
+    return ui_manager.end_frame()
+
+
+class ReferencePath:
+    """The plain draw path: everything blitted onto one logical-size Surface"""
+
+    name = 'reference'
+
+    def __init__(self):
+        """Create the frame surface and the path's own UI"""
+        from ui_manager import UIManager
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.ui_manager = UIManager()
+
+    def draw(self, game_manager, player_name, history):
+        """Draw the current frame"""
+        screen = self.surface
+        if game_manager.bg:
+            screen.blit(game_manager.bg, (0, 0))
+        else:
+            screen.fill(BLACK)
+        if game_manager.game_state == GAME_STATE_PLAYING:
+            game_manager.draw_sprites(screen)
+        draw_ui(self.ui_manager, screen, game_manager, player_name, history)
+
+    def frame(self):
+        """Return the finished frame"""
+        return self.surface
+
+    def close(self):
+        """Nothing to release"""
+        pass
+
+
+class RendererPath:
+    """
+    A candidate path drawing through a renderer backend, the way the game
+    loop does: draw_world for play, draw_background for the other screens,
+    then present
+    """
+
+    def __init__(self, name, software=RENDER_SOFTWARE):
+        """
+        Create the renderer for a candidate path
+
+        Args:
+            name (str): One of CANDIDATE_PATHS
+            software (bool): Use SDL's software renderer for the texture path
+        """
+        from renderer import SurfaceRenderer, TextureRenderer
+        from ui_manager import UIManager
+        self.name = name
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        if name == 'texture':
+            self.renderer = TextureRenderer(size, 'Render check', software=software)
+        else:
+            self.renderer = SurfaceRenderer(size, 'Render check')
+            if name == 'backbuffer':
+                self.renderer.set_resolution_scale(0.5)
+        self.ui_manager = UIManager(self.renderer.viewport)
+        self._frame = pygame.Surface(self.renderer.output_size)
+        self._frame_valid = False
+        self._presented_state = None
+
+    def draw(self, game_manager, player_name, history):
+        """Draw and present the current frame"""
+        renderer = self.renderer
+        screen = renderer.surface
+        viewport = renderer.viewport
+        renderer.begin_frame()
+        state = game_manager.game_state
+        if state == GAME_STATE_PLAYING:
+            # Through the camera in the arena
+            viewport = game_manager.camera_viewport(viewport)
+            renderer.draw_world(game_manager.bg, game_manager.get_visible_groups(), viewport)
+            game_manager.draw_particles(screen, viewport)
+            game_manager.draw_health_bar(screen, viewport)
+        else:
+            renderer.draw_background(game_manager.bg)
+        dirty_rects = draw_ui(self.ui_manager, screen, game_manager, player_name, history)
+
+        # Same choice as the game loop: static screens only update what changed
+        static = state != GAME_STATE_PLAYING and state == self._presented_state
+        renderer.present(dirty_rects if static else None)
+        self._presented_state = state
+
+        if self.name == 'dirty':
+            # What the window shows: the areas actually updated on top of the last frame
+            if static and self._frame_valid:
+                for rect in dirty_rects:
+                    self._frame.blit(screen, rect, rect)
+            else:
+                self._frame.blit(screen, (0, 0))
+            self._frame_valid = True
+        else:
+            self._frame_valid = False
+
+    def frame(self):
+        """Return the finished frame"""
+        if not self._frame_valid:
+            self.renderer.read_frame(self._frame)
+            self._frame_valid = True
+        return self._frame
+
+    def close(self):
+        """Nothing to release; the window closes with pygame"""
+        pass
+
+
+def frame_hash(surface):
+    """Hash of a frame's RGB pixels"""
+    return hashlib.blake2b(pygame.image.tobytes(surface, 'RGB'), digest_size=16).hexdigest()
+
+
+def compare_frames(reference, candidate, tolerance):
+    """
+    Compare two frames pixel by pixel
+
+    Args:
+        reference (pygame.Surface): Reference frame
+        candidate (pygame.Surface): Candidate frame of the same size
+        tolerance (int): Largest per-channel difference still counted as equal
+
+    Returns:
+        dict | None: None if the frames match, else the number of differing
+                     pixels, the largest difference, their bounding box and
+                     the per-pixel difference image
+    """
+    if reference.get_size() != candidate.get_size():
+        return {'pixels': -1, 'max_diff': 255, 'bounds': None, 'diff': None}
+    diff = np.abs(pygame.surfarray.array3d(reference).astype(np.int16)
+                  - pygame.surfarray.array3d(candidate).astype(np.int16)).max(axis=2)
+    over = diff > tolerance
+    count = int(np.count_nonzero(over))
+    if count == 0:
+        return None
+    xs, ys = np.nonzero(over)
+    bounds = pygame.Rect(int(xs.min()), int(ys.min()), int(xs.max() - xs.min()) + 1, int(ys.max() - ys.min()) + 1)
+    return {'pixels': count, 'max_diff': int(diff.max()), 'bounds': bounds, 'diff': diff}
+
+
+def save_difference(directory, index, reference, candidate, mismatch):
+    """Write the two frames and a difference image for a mismatching frame"""
+    os.makedirs(directory, exist_ok=True)
+    pygame.image.save(reference, os.path.join(directory, f"frame{index:06d}_reference.png"))
+    pygame.image.save(candidate, os.path.join(directory, f"frame{index:06d}_candidate.png"))
+    if mismatch['diff'] is not None:
+        # Every differing pixel shows up, brighter the larger the difference
+        levels = np.where(mismatch['diff'] > 0, np.minimum(255, 64 + mismatch['diff'] * 4), 0).astype(np.uint8)
+        pygame.image.save(pygame.surfarray.make_surface(np.repeat(levels[:, :, None], 3, axis=2)),
+                          os.path.join(directory, f"frame{index:06d}_diff.png"))
+
+
+def play_script(seed, max_play_frames, history_path, endless=False, explosions=EXPLOSION_STYLE,
+                arena=ARENA_ENABLED, menu_frames=60, end_frames=60):
+    """
+    Play one scripted session, yielding after each frame's simulation
+
+    The session types a name on the menu, plays under the autopilot until
+    the game ends (or max_play_frames pass) and lingers on the end screen.
+    The game and particle generators are seeded, so a seed always replays
+    the same frames.
+
+    Args:
+        seed (int): Session seed
+        max_play_frames (int): Frames of play before the session is cut short
+        history_path (str): History file for the session's game manager
+        endless (bool): Play endless waves
+        explosions (str): 'particles' or 'sprites'
+        arena (bool): Play in a world wider than the screen
+        menu_frames (int): Frames spent on the menu
+        end_frames (int): Frames spent on the end screen
+
+    Yields:
+        tuple: (game_manager, player_name, history) for each frame to draw
+    """
+    from game_manager import GameManager
+
+    clock = SimulatedClock(frame_ms=1000.0 / FPS)
+    game_manager = GameManager(clock=clock, history_path=history_path)
+    game_manager.endless = endless
+    game_manager.arena = Arena() if arena else None
+    game_manager.rng.seed(seed)
+    if explosions != 'particles':
+        game_manager.particles = None
+    if game_manager.particles is not None:
+        game_manager.particles.rng = np.random.default_rng(seed)
+    game_manager.load_background()
+    pilot = AutoPilot()
+    name = f"check{seed}"
+    history = game_manager.get_last_history()
+
+    try:
+        # Menu, typing one letter of the name every few frames
+        for frame in range(menu_frames):
+            clock.tick()
+            yield game_manager, name[:frame * len(name) // menu_frames], history
+
+        game_manager.start_new_game(name)
+        frame = 0
+        while game_manager.game_state == GAME_STATE_PLAYING and frame < max_play_frames:
+            clock.tick()
+            if frame % FRAMES_PER_TICK == 0:
+                game_manager.controls = pilot.control(game_manager)
+                game_manager.update_game_logic()
+            frame += 1
+            yield game_manager, name, history
+
+        if game_manager.game_state != GAME_STATE_PLAYING:
+            for _ in range(end_frames):
+                clock.tick()
+                yield game_manager, name, history
+    finally:
+        game_manager.wave_preparer.close()
+
+
+def run_check(candidate_name, sessions, seed, max_play_frames, tolerance=0, use_hash=False,
+              save_dir=None, keep_going=False, endless=False, explosions=EXPLOSION_STYLE,
+              software=RENDER_SOFTWARE, arena=ARENA_ENABLED):
+    """
+    Replay the sessions through the reference and a candidate path and compare every frame
+
+    Args:
+        candidate_name (str): One of CANDIDATE_PATHS
+        sessions (int): Number of scripted sessions
+        seed (int): Seed of the first session (the others follow it)
+        max_play_frames (int): Frames of play per session at most
+        tolerance (int): Largest per-channel difference still counted as equal
+        use_hash (bool): Compare frame hashes (exact) instead of pixels
+        save_dir (str): Where to write differing frames, or None
+        keep_going (bool): Count every differing frame instead of stopping at the first
+        endless (bool): Play endless waves
+        explosions (str): 'particles' or 'sprites'
+        software (bool): Use SDL's software renderer for the texture path
+        arena (bool): Play in a world wider than the screen
+
+    Returns:
+        dict: Frames checked and the mismatches found (index, session, state, details)
+    """
+    reference = ReferencePath()
+    candidate = RendererPath(candidate_name, software)
+    mismatches = []
+    index = 0
+    with tempfile.TemporaryDirectory(prefix='render_check_') as directory:
+        for session in range(sessions):
+            history_path = os.path.join(directory, f"history{session}.json")
+            for game_manager, player_name, history in play_script(seed + session, max_play_frames,
+                                                                  history_path, endless, explosions, arena):
+                reference.draw(game_manager, player_name, history)
+                candidate.draw(game_manager, player_name, history)
+                expected, actual = reference.frame(), candidate.frame()
+                if use_hash:
+                    mismatch = None if frame_hash(expected) == frame_hash(actual) else \
+                        {'pixels': None, 'max_diff': None, 'bounds': None, 'diff': None}
+                else:
+                    mismatch = compare_frames(expected, actual, tolerance)
+                if mismatch is not None:
+                    if save_dir and not mismatches:
+                        save_difference(save_dir, index, expected, actual, mismatch)
+                    mismatch.pop('diff')
+                    mismatches.append((index, session, game_manager.game_state, mismatch))
+                    if not keep_going:
+                        break
+                index += 1
+            if mismatches and not keep_going:
+                break
+    reference.close()
+    candidate.close()
+    return {'frames': index + (1 if mismatches and not keep_going else 0), 'mismatches': mismatches}
+
+
+def run_benchmark(candidate_name, sessions, seed, max_play_frames, endless=False, explosions=EXPLOSION_STYLE,
+                  software=RENDER_SOFTWARE, arena=ARENA_ENABLED):
+    """
+    Time the reference and a candidate path side by side on the same frames
+
+    Only drawing (and presenting, for the candidate) is timed; the
+    simulation and frame read-back are left out.
+
+    Returns:
+        dict: path name -> sorted frame times in milliseconds
+    """
+    paths = [ReferencePath(), RendererPath(candidate_name, software)]
+    times = {path.name: [] for path in paths}
+    with tempfile.TemporaryDirectory(prefix='render_check_') as directory:
+        for session in range(sessions):
+            history_path = os.path.join(directory, f"history{session}.json")
+            for game_manager, player_name, history in play_script(seed + session, max_play_frames,
+                                                                  history_path, endless, explosions, arena):
+                for path in paths:
+                    start = time.perf_counter()
+                    path.draw(game_manager, player_name, history)
+                    times[path.name].append((time.perf_counter() - start) * 1000.0)
+    for path in paths:
+        path.close()
+    return {name: sorted(values) for name, values in times.items()}
+
+
+def main(argv=None):
+    """Run the render check from the command line"""
+    parser = argparse.ArgumentParser(description="Check a draw path against the reference, frame by frame")
+    parser.add_argument('--path', choices=CANDIDATE_PATHS, default='dirty', help="candidate path to check")
+    parser.add_argument('--sessions', type=int, default=1, help="scripted sessions to replay")
+    parser.add_argument('--seed', type=int, default=1, help="seed of the first session")
+    parser.add_argument('--frames', type=int, default=RENDER_CHECK_MAX_FRAMES,
+                        help="frames of play per session at most")
+    parser.add_argument('--tolerance', type=int, default=RENDER_CHECK_TOLERANCE,
+                        help="largest per-channel difference still counted as equal")
+    parser.add_argument('--hash', action='store_true', help="compare frame hashes (exact) instead of pixels")
+    parser.add_argument('--save-diff', metavar='DIR', help="write the first differing frames and their difference")
+    parser.add_argument('--keep-going', action='store_true', help="count every differing frame")
+    parser.add_argument('--endless', action='store_true', default=ENDLESS_WAVES, help="play endless waves")
+    parser.add_argument('--explosions', choices=('particles', 'sprites'), default=EXPLOSION_STYLE,
+                        help="explosion style of the replayed sessions")
+    parser.add_argument('--arena', action='store_true', default=ARENA_ENABLED,
+                        help="play in a world wider than the screen")
+    parser.add_argument('--software', action='store_true', default=RENDER_SOFTWARE,
+                        help="use SDL's software renderer for the texture path")
+    parser.add_argument('--bench', action='store_true', help="time the two paths side by side instead")
+    args = parser.parse_args(argv)
+
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.init()
+
+    if args.bench:
+        times = run_benchmark(args.path, args.sessions, args.seed, args.frames, args.endless,
+                              args.explosions, args.software, args.arena)
+        print(f"{'path':>10} {'frames':>7} {'mean ms':>8} {'p50 ms':>7} {'p99 ms':>7} {'fps':>7}")
+        for name, values in times.items():
+            mean = sum(values) / max(1, len(values))
+            print(f"{name:>10} {len(values):>7} {mean:>8.3f} {percentile(values, 50):>7.3f} "
+                  f"{percentile(values, 99):>7.3f} {1000.0 / mean if mean else 0.0:>7.0f}")
+        return 0
+
+    result = run_check(args.path, args.sessions, args.seed, args.frames, args.tolerance, args.hash,
+                       args.save_diff, args.keep_going, args.endless, args.explosions, args.software,
+                       args.arena)
+    mismatches = result['mismatches']
+    if not mismatches:
+        print(f"{args.path}: {result['frames']} frames match the reference"
+              + ("" if args.hash else f" (tolerance {args.tolerance})"))
+        return 0
+    index, session, state, details = mismatches[0]
+    where = f"frame {index} (session {session + 1}, {state})"
+    if details['pixels'] is None:
+        print(f"{args.path}: first difference at {where}: frame hashes differ")
+    elif details['pixels'] < 0:
+        print(f"{args.path}: first difference at {where}: frame sizes differ")
+    else:
+        print(f"{args.path}: first difference at {where}: {details['pixels']} pixels differ "
+              f"by up to {details['max_diff']} in {tuple(details['bounds'])}")
+    if args.keep_going:
+        print(f"{len(mismatches)} of {result['frames']} frames differ")
+    if args.save_diff:
+        print(f"Frames written to {args.save_diff}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
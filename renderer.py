@@ -0,0 +1,417 @@
+"""
+Renderer Module
+Drawing backends for the game window: classic software Surface blits or
+SDL2 Renderer/Texture copies via pygame._sdl2.video.
+"""
+
+import os
+import weakref
+import pygame
+from config import *
+from assets import preload_images, scaled_image_set, smoothscale
+from viewport import Viewport
+
+
+def _cache_ref(cache, image):
+    """Weak reference to a cached image that drops its cache entry when the image is freed"""
+    key = id(image)
+
+    def forget(ref):
+        entry = cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del cache[key]
+    return weakref.ref(image, forget)
+
+
+def _scaled_copy(cache, image, serial, factor, smooth=True):
+    """
+    Scale an image that has no pre-scaled copy, caching the result per surface
+
+    Args:
+        cache (dict): Scaled copies keyed by id(image)
+        image (pygame.Surface): Sprite image
+        serial (int): The sprite's image_serial; a new value rescales the image
+        factor (float): Scale factor
+        smooth (bool): Filter the image (otherwise nearest-neighbour, which is faster)
+    """
+    entry = cache.get(id(image))
+    if entry is not None and entry[0]() is image and entry[2] == serial:
+        return entry[1]
+    width, height = image.get_size()
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    scaled = smoothscale(image, size) if smooth else pygame.transform.scale(image, size)
+    cache[id(image)] = (_cache_ref(cache, image), scaled, serial)
+    return scaled
+
+
+def _cover(image, size):
+    """Scale an image to cover an area of the given size, cropped to it (centered)"""
+    width, height = image.get_size()
+    factor = max(size[0] / width, size[1] / height)
+    scaled = pygame.transform.scale(image, (max(1, round(width * factor)), max(1, round(height * factor))))
+    area = pygame.Rect((0, 0), size)
+    area.center = scaled.get_rect().center
+    return scaled.subsurface(area.clip(scaled.get_rect())).copy()
+
+
+class SurfaceRenderer:
+    """
+    Software backend that blits everything onto the display surface
+    """
+
+    name = 'surface'
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), caption='Space Invaders', resolution=None):
+        """
+        Create the window and its display surface
+
+        Args:
+            size (tuple): Logical (width, height) of the game
+            caption (str): Window title
+            resolution (tuple): Window (width, height) in pixels, None for the logical size
+        """
+        self.size = size
+        pygame.display.set_caption(caption)
+
+        # Quality knobs driven by the quality governor
+        self.background_enabled = True
+        self.resolution_scale = 1.0
+        self._back_buffer = None
+        self._scaled_images = {}
+        self._cover = (None, None, None)
+
+        # FrameCapture fed with every presented frame, if recording
+        self.capture = None
+        self._presented_quality = None
+
+        self.set_resolution(resolution or size)
+
+    def set_resolution(self, resolution):
+        """
+        Open the window at a resolution and switch to its pre-scaled images
+
+        The images are scaled once per resolution (or read back from
+        SCALED_ASSET_DIR), so switching back and forth never rescales them.
+
+        Args:
+            resolution (tuple): Window (width, height) in pixels
+        """
+        self.viewport = Viewport(resolution, self.size)
+        self.output_size = self.viewport.resolution
+        self.surface = pygame.display.set_mode(self.output_size)
+        if self.viewport.identity:
+            self._images = {}
+        else:
+            preload_images()
+            self._images = scaled_image_set(self.viewport, SCALED_ASSET_DIR, (IMAGES['background'],))
+        self.set_resolution_scale(self.resolution_scale)
+
+    def begin_frame(self):
+        """Prepare a new frame (nothing to do for the software backend)"""
+        pass
+
+    def draw_background(self, bg):
+        """Draw the background image over the whole window, or clear to black if there is none"""
+        if bg and self.background_enabled:
+            self.surface.blit(bg if self.viewport.identity else self._background(bg, self.output_size), (0, 0))
+        else:
+            self.surface.fill(BLACK)
+
+    def draw_groups(self, groups, viewport=None):
+        """
+        Draw every sprite of the given groups, in order
+
+        Args:
+            groups: Sprite groups (or lists of sprites) in drawing order
+            viewport (Viewport): Mapping of sprite positions to the window,
+                                 e.g. through a camera (the renderer's if None)
+        """
+        viewport = viewport or self.viewport
+        if viewport.identity:
+            self.surface.blits([(sprite.image, sprite.rect) for group in groups for sprite in group], False)
+            return
+        point = viewport.point
+        if viewport.scale == 1.0:
+            # Only moved by a camera: the images are drawn as they are
+            self.surface.blits([(sprite.image, point(*sprite.rect.topleft)) for group in groups for sprite in group],
+                               False)
+            return
+        scaled = self._scaled
+        self.surface.blits([(scaled(sprite.image, getattr(sprite, 'image_serial', 0)), point(*sprite.rect.topleft))
+                            for group in groups for sprite in group], False)
+
+    def draw_world(self, bg, groups, viewport=None):
+        """
+        Draw the background and sprites, through the low-resolution back
+        buffer when the resolution scale is below 1
+
+        Args:
+            bg (pygame.Surface): Background image, or None
+            groups: Sprite groups in drawing order
+            viewport (Viewport): Mapping of sprite positions to the window (the renderer's if None)
+        """
+        viewport = viewport or self.viewport
+        if self._back_buffer is None:
+            self.draw_background(bg)
+            self.draw_groups(groups, viewport)
+            return
+
+        back_buffer = self._back_buffer
+        scale = viewport.scale * self.resolution_scale
+        offset_x = int(viewport.offset[0] * self.resolution_scale)
+        offset_y = int(viewport.offset[1] * self.resolution_scale)
+        if bg and self.background_enabled:
+            back_buffer.blit(self._background(bg, back_buffer.get_size()), (0, 0))
+        else:
+            back_buffer.fill(BLACK)
+        back_buffer.blits([(self._scaled(sprite.image, getattr(sprite, 'image_serial', 0)),
+                            (int(sprite.rect.x * scale) + offset_x, int(sprite.rect.y * scale) + offset_y))
+                           for group in groups for sprite in group], False)
+        pygame.transform.scale(back_buffer, self.output_size, self.surface)
+
+    def set_resolution_scale(self, scale):
+        """
+        Render the world into a back buffer of ``scale`` times the window size
+
+        Args:
+            scale (float): Back buffer scale, 1.0 draws straight to the window
+        """
+        self.resolution_scale = scale
+        self._scaled_images.clear()
+        if scale >= 1.0:
+            self._back_buffer = None
+        else:
+            size = (max(1, int(self.output_size[0] * scale)), max(1, int(self.output_size[1] * scale)))
+            self._back_buffer = pygame.Surface(size).convert()
+
+    def _scaled(self, image, serial=0):
+        """
+        Return an image at the window scale (times the back buffer scale)
+
+        Shared images come from the resolution's pre-scaled set; others
+        (bunkers, images loaded late, the low-resolution back buffer) are
+        scaled on first use and cached per surface.
+
+        Args:
+            image (pygame.Surface): Sprite image
+            serial (int): The sprite's image_serial; a new value rescales the image
+        """
+        if self._back_buffer is None:
+            scaled = self._images.get(id(image))
+            if scaled is not None:
+                return scaled
+            return _scaled_copy(self._scaled_images, image, serial, self.viewport.scale)
+        return _scaled_copy(self._scaled_images, image, serial, self.viewport.scale * self.resolution_scale,
+                            smooth=False)
+
+    def _background(self, bg, size):
+        """Return the background scaled to cover an area of the given size"""
+        if size == self.output_size and id(bg) in self._images:
+            return self._images[id(bg)]
+        ref, cover_size, cover = self._cover
+        if ref is None or ref() is not bg or cover_size != size:
+            cover = _cover(bg, size)
+            self._cover = (weakref.ref(bg), size, cover)
+        return cover
+
+    def read_frame(self, dest):
+        """Copy the finished frame into dest (a Surface of output_size)"""
+        dest.blit(self.surface, (0, 0))
+
+    def present(self, rects=None):
+        """
+        Show the finished frame
+
+        Args:
+            rects (list): Only these screen areas changed since the last frame
+                          (None = update the whole window)
+        """
+        if self.capture is not None:
+            self.capture.capture(self.read_frame)
+        # A quality change alters the whole frame
+        quality = (self.background_enabled, self.resolution_scale)
+        if rects is None or quality != self._presented_quality:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+        self._presented_quality = quality
+
+
+class TextureRenderer:
+    """
+    Hardware (or SDL software) backend built on pygame._sdl2.video
+
+    Sprite images are uploaded once as textures and drawn with renderer copies.
+    Anything drawn onto ``surface`` (UI text, health bar, overlays) is uploaded
+    as a single transparent overlay texture on present. The window may be
+    scaled by any factor; SDL scales the logical size, not the CPU. With a
+    resolution, the window is drawn at full resolution from pre-scaled images
+    instead.
+    """
+
+    name = 'texture'
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), caption='Space Invaders',
+                 scale=1.0, software=False, resolution=None):
+        """
+        Create the window, renderer and overlay texture
+
+        Args:
+            size (tuple): Logical (width, height) of the game
+            caption (str): Window title
+            scale (float): Window scale factor, integer or fractional (ignored with a resolution)
+            software (bool): Force SDL's software renderer (no GPU needed)
+            resolution (tuple): Window (width, height) in pixels, None to scale the logical size
+        """
+        from pygame._sdl2.video import Window, Renderer, Texture
+
+        # Nearest-neighbour scaling keeps the pixel art sharp
+        os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', '0')
+
+        self._texture_type = Texture
+        self.size = size
+        self.scale = scale
+        if resolution:
+            window_size = tuple(resolution)
+        else:
+            window_size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        self.output_size = window_size
+        self.window = Window(caption, size=window_size)
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1)
+
+        # Without a resolution everything is drawn at the logical size and SDL
+        # scales it; with one, the overlay and sprites are at window resolution
+        canvas_size = window_size if resolution else size
+        self.viewport = Viewport(canvas_size, size)
+        if resolution:
+            preload_images()
+            self._images = scaled_image_set(self.viewport, SCALED_ASSET_DIR, (IMAGES['background'],))
+        else:
+            self.renderer.logical_size = size
+            self._images = {}
+        self._scaled_images = {}
+
+        # Overlay surface the UI draws onto, uploaded once per frame
+        self.surface = pygame.Surface(canvas_size, pygame.SRCALPHA)
+        self._overlay = Texture(self.renderer, canvas_size, streaming=True)
+        self._overlay.blend_mode = 1  # SDL_BLENDMODE_BLEND
+
+        # Uploaded textures keyed by id(surface); the weakref detects reuse of ids
+        self._textures = {}
+        self._commands = []
+
+        # Quality knob driven by the quality governor
+        self.background_enabled = True
+
+        # FrameCapture fed with every presented frame, if recording
+        self.capture = None
+
+    def texture_for(self, image, serial=0):
+        """
+        Return the texture for a surface, uploading it on first use
+
+        Args:
+            image (pygame.Surface): Shared sprite image
+            serial (int): The sprite's image_serial; a new value re-uploads the
+                          pixels of an image that was modified in place
+
+        Returns:
+            Texture: Texture holding the image pixels
+        """
+        entry = self._textures.get(id(image))
+        if entry is not None and entry[0]() is image:
+            if entry[2] != serial:
+                entry[1].update(image)
+                self._textures[id(image)] = (entry[0], entry[1], serial)
+            return entry[1]
+        texture = self._texture_type.from_surface(self.renderer, image)
+        self._textures[id(image)] = (_cache_ref(self._textures, image), texture, serial)
+        return texture
+
+    def begin_frame(self):
+        """Forget the previous frame's draw list and clear the overlay"""
+        self._commands.clear()
+        self.surface.fill((0, 0, 0, 0))
+
+    def draw_background(self, bg):
+        """Queue the background image (black clear if there is none)"""
+        if bg and self.background_enabled:
+            bg = self._images.get(id(bg), bg)
+            self._commands.append((self.texture_for(bg), pygame.Rect((0, 0), bg.get_size())))
+
+    def draw_groups(self, groups, viewport=None):
+        """
+        Queue every sprite of the given groups, in order
+
+        Args:
+            groups: Sprite groups (or lists of sprites) in drawing order
+            viewport (Viewport): Mapping of sprite positions to the canvas,
+                                 e.g. through a camera (the renderer's if None)
+        """
+        viewport = viewport or self.viewport
+        commands = self._commands
+        texture_for = self.texture_for
+        if viewport.identity:
+            for group in groups:
+                for sprite in group:
+                    commands.append((texture_for(sprite.image, getattr(sprite, 'image_serial', 0)),
+                                     sprite.rect.copy()))
+            return
+        point = viewport.point
+        if viewport.scale == 1.0:
+            # Only moved by a camera: the images are drawn as they are
+            for group in groups:
+                for sprite in group:
+                    commands.append((texture_for(sprite.image, getattr(sprite, 'image_serial', 0)),
+                                     pygame.Rect(point(*sprite.rect.topleft), sprite.rect.size)))
+            return
+        images = self._images
+        for group in groups:
+            for sprite in group:
+                image = images.get(id(sprite.image))
+                if image is None:
+                    # Bunkers and images loaded late: the scaled copy changes with the serial
+                    image = _scaled_copy(self._scaled_images, sprite.image, getattr(sprite, 'image_serial', 0),
+                                         viewport.scale)
+                commands.append((texture_for(image), pygame.Rect(point(*sprite.rect.topleft), image.get_size())))
+
+    def draw_world(self, bg, groups, viewport=None):
+        """Queue the background and sprites (through a viewport other than the renderer's, if given)"""
+        self.draw_background(bg)
+        self.draw_groups(groups, viewport)
+
+    def present(self, rects=None):
+        """Replay the queued copies plus the overlay and show the frame (rects are ignored)"""
+        renderer = self.renderer
+        renderer.draw_color = BLACK + (255,)
+        renderer.clear()
+        for texture, rect in self._commands:
+            texture.draw(dstrect=rect)
+        self._overlay.update(self.surface)
+        self._overlay.draw()
+        if self.capture is not None:
+            self.capture.capture(self.read_frame)
+        renderer.present()
+
+    def read_frame(self, dest):
+        """Read the rendered frame back into dest (a Surface of output_size)"""
+        self.renderer.to_surface(dest)
+
+
+def create_renderer(backend=RENDER_BACKEND, size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                    caption='Space Invaders'):
+    """
+    Create the configured rendering backend
+
+    Args:
+        backend (str): 'surface' or 'texture'
+        size (tuple): Logical (width, height) of the game
+        caption (str): Window title
+
+    Returns:
+        SurfaceRenderer | TextureRenderer: The renderer
+    """
+    if backend == 'texture':
+        return TextureRenderer(size, caption, scale=RENDER_SCALE, software=RENDER_SOFTWARE,
+                               resolution=DISPLAY_RESOLUTION)
+    return SurfaceRenderer(size, caption, resolution=DISPLAY_RESOLUTION)
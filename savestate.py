@@ -0,0 +1,394 @@
+"""
+Savestate Module
+Compact binary snapshots of a running game, savestate files, and an
+in-memory rewind buffer of delta-encoded snapshots with a fixed memory cap.
+"""
+
+import struct
+import zlib
+from collections import deque
+from config import *
+from sprites import Spaceship, Aliens, Bullets, Alien_Bullets, Explosion, Bunker
+
+MAGIC = b'SIS1'
+FORMAT_VERSION = 4
+
+# Game states in the order they are encoded
+STATES = (GAME_STATE_MENU, GAME_STATE_PLAYING, GAME_STATE_GAME_OVER, GAME_STATE_VICTORY)
+
+# Fixed-size records
+_HEADER = struct.Struct('<4sH')
+_GAME = struct.Struct('<BbiiB')             # state, game_over, score, countdown, name length
+_TIMERS = struct.Struct('<iBBH')            # elapsed, started flag, alien volley ready, pending timer count
+_TIMER = struct.Struct('<BI')               # timer key, remaining ms
+_WAVE = struct.Struct('<BHI')               # endless flag, wave number, seed of the next wave
+_SHIP = struct.Struct('<BhhhhB')            # 0=none 1=alive 2=destroyed, x, y, health, health_start, reloading
+_COUNT = struct.Struct('<I')
+_ALIEN = struct.Struct('<hhBhb')            # x, y, image number, move counter, move direction
+_BULLET = struct.Struct('<hhh')             # x, y, speed
+_EXPLOSION = struct.Struct('<hhBBB')        # x, y, size, frame index, frame counter
+_BUNKER = struct.Struct('<hhH')             # x, y, crater count
+_CRATER = struct.Struct('<bb')              # crater centre inside the bunker
+_RNG = struct.Struct('<i625IB')             # version, Mersenne Twister state, has gauss
+_GAUSS = struct.Struct('<d')
+
+# Bytes per particle: float32 pos (2), vel (2), life, max_life and int8 kind
+_PARTICLE_BYTES = 8 + 8 + 4 + 4 + 1
+
+
+def capture_state(game_manager):
+    """
+    Encode the mutable state of a game into bytes
+
+    Timers are stored as the time they have left, so a snapshot restores
+    correctly whatever the clock reads at restore time. Pending timers must
+    not carry payloads.
+
+    Args:
+        game_manager: GameManager to capture
+
+    Returns:
+        bytes: Encoded snapshot
+
+    Raises:
+        ValueError: In an arena game (its world is too large to snapshot every tick)
+    """
+    gm = game_manager
+    if gm.arena is not None:
+        raise ValueError("Arena games have no savestates")
+    now = gm.get_ticks()
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION)]
+
+    name = gm.player_name.encode('utf-8')[:255]
+    parts.append(_GAME.pack(STATES.index(gm.game_state), gm.game_over, gm.score, gm.countdown, len(name)))
+    parts.append(name)
+
+    started = gm._game_started_at_ms
+    timers = gm.timers.pending()
+    parts.append(_TIMERS.pack(now - started if started is not None else 0, started is not None,
+                              gm.alien_volley_ready, len(timers)))
+    parts.extend(_TIMER.pack(key, remaining) for key, remaining, _ in timers)
+    parts.append(_WAVE.pack(gm.endless, gm.wave, gm.next_wave_seed))
+
+    ship = gm.spaceship
+    if ship is not None:
+        parts.append(_SHIP.pack(1 if ship.alive() else 2, ship.rect.x, ship.rect.y, ship.health_remaining,
+                                ship.health_start, ship.reloading))
+    else:
+        parts.append(_SHIP.pack(0, 0, 0, 0, 0, 0))
+
+    aliens = gm.alien_group.sprites()
+    parts.append(_COUNT.pack(len(aliens)))
+    parts.extend(_ALIEN.pack(a.rect.x, a.rect.y, a.alien_number, a.move_counter, a.move_direction)
+                 for a in aliens)
+
+    for group in (gm.bullet_group, gm.alien_bullet_group):
+        bullets = group.sprites()
+        parts.append(_COUNT.pack(len(bullets)))
+        parts.extend(_BULLET.pack(b.rect.x, b.rect.y, b.speed) for b in bullets)
+
+    explosions = gm.explosion_group.sprites()
+    parts.append(_COUNT.pack(len(explosions)))
+    parts.extend(_EXPLOSION.pack(e.rect.centerx, e.rect.centery, e.size, e.index, min(255, e.counter))
+                 for e in explosions)
+
+    # Bunker damage is stored as its craters and replayed on restore
+    bunkers = gm.bunker_group.sprites()
+    parts.append(_COUNT.pack(len(bunkers)))
+    for bunker in bunkers:
+        parts.append(_BUNKER.pack(bunker.rect.centerx, bunker.rect.centery, len(bunker.craters)))
+        parts.extend(_CRATER.pack(x, y) for x, y in bunker.craters)
+
+    particles = gm.particles
+    count = particles.count if particles is not None else 0
+    parts.append(_COUNT.pack(count))
+    if count:
+        for array in (particles.pos, particles.vel, particles.life, particles.max_life, particles.kind):
+            parts.append(array[:count].tobytes())
+
+    version, mt_state, gauss = gm.rng.getstate()
+    parts.append(_RNG.pack(version, *mt_state, gauss is not None))
+    if gauss is not None:
+        parts.append(_GAUSS.pack(gauss))
+
+    return b''.join(parts)
+
+
+def restore_state(game_manager, data):
+    """
+    Replace the state of a game with a snapshot from capture_state
+
+    The game is captured first; if the snapshot turns out to be truncated
+    or corrupt partway through, that capture is restored, so a bad
+    savestate never leaves the game half replaced.
+
+    Args:
+        game_manager: GameManager to restore into
+        data (bytes): Encoded snapshot
+
+    Raises:
+        ValueError: If the data is not a snapshot this version can read, or the game is in an arena
+    """
+    gm = game_manager
+    if gm.arena is not None:
+        raise ValueError("Arena games have no savestates")
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Not a compatible savestate")
+    magic, version = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a compatible savestate")
+
+    backup = capture_state(gm)
+    try:
+        _restore(gm, view)
+    except Exception as e:
+        _restore(gm, memoryview(backup))
+        raise ValueError("Corrupt savestate") from e
+
+
+def _restore(gm, view):
+    """Decode a snapshot whose header has been checked into the game (see restore_state)"""
+    offset = _HEADER.size
+    now = gm.get_ticks()
+
+    state, gm.game_over, gm.score, gm.countdown, name_length = _GAME.unpack_from(view, offset)
+    offset += _GAME.size
+    gm.player_name = bytes(view[offset:offset + name_length]).decode('utf-8', 'replace')
+    offset += name_length
+
+    elapsed, started, volley_ready, timer_count = _TIMERS.unpack_from(view, offset)
+    offset += _TIMERS.size
+    gm._game_started_at_ms = now - elapsed if started else None
+    gm.alien_volley_ready = bool(volley_ready)
+    gm.timers.clear()
+    for key, remaining in _TIMER.iter_unpack(view[offset:offset + timer_count * _TIMER.size]):
+        gm.timers.schedule(remaining, key)
+    offset += timer_count * _TIMER.size
+
+    endless, wave, gm.next_wave_seed = _WAVE.unpack_from(view, offset)
+    offset += _WAVE.size
+    gm.endless = bool(endless)
+    gm._set_wave(wave)
+    if gm.endless:
+        gm._prepare_next_wave()
+
+    for group in gm.get_sprite_groups():
+        group.empty()
+
+    present, x, y, health, health_start, reloading = _SHIP.unpack_from(view, offset)
+    offset += _SHIP.size
+    gm.spaceship = None
+    if present:
+        ship = Spaceship(0, 0, health_start)
+        ship.rect.topleft = (x, y)
+        ship.health_remaining = health
+        ship.reloading = bool(reloading)
+        gm.spaceship = ship
+        if present == 1:
+            gm.spaceship_group.add(ship)
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    for x, y, number, move_counter, move_direction in _ALIEN.iter_unpack(view[offset:offset + count * _ALIEN.size]):
+        alien = Aliens(0, 0, alien_number=number)
+        alien.rect.topleft = (x, y)
+        alien.move_counter = move_counter
+        alien.move_direction = move_direction
+        gm.alien_group.add(alien)
+    offset += count * _ALIEN.size
+
+    for group, bullet_type in ((gm.bullet_group, Bullets), (gm.alien_bullet_group, Alien_Bullets)):
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        for x, y, speed in _BULLET.iter_unpack(view[offset:offset + count * _BULLET.size]):
+            bullet = bullet_type(0, 0)
+            bullet.rect.topleft = (x, y)
+            bullet.speed = speed
+            group.add(bullet)
+        offset += count * _BULLET.size
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    for x, y, size, index, counter in _EXPLOSION.iter_unpack(view[offset:offset + count * _EXPLOSION.size]):
+        explosion = Explosion(x, y, size)
+        explosion.index = index
+        explosion.counter = counter
+        explosion.image = explosion.images[index]
+        gm.explosion_group.add(explosion)
+    offset += count * _EXPLOSION.size
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        x, y, craters = _BUNKER.unpack_from(view, offset)
+        offset += _BUNKER.size
+        bunker = Bunker(x, y)
+        for crater_x, crater_y in _CRATER.iter_unpack(view[offset:offset + craters * _CRATER.size]):
+            bunker.stamp_crater(crater_x, crater_y)
+        offset += craters * _CRATER.size
+        gm.bunker_group.add(bunker)
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    particles = gm.particles
+    if particles is not None:
+        import numpy as np
+        for array in (particles.pos, particles.vel, particles.life, particles.max_life, particles.kind):
+            size = count * array[0].nbytes
+            array[:count] = np.frombuffer(view[offset:offset + size], dtype=array.dtype).reshape(
+                (count,) + array.shape[1:])
+            offset += size
+        # Which explosion a particle came from is not saved; the restored ones count as one
+        particles.explosion[:count] = particles._explosions
+        particles.count = count
+    else:
+        # Particles saved with the particle engine on; skip them
+        offset += count * _PARTICLE_BYTES
+
+    rng_state = _RNG.unpack_from(view, offset)
+    offset += _RNG.size
+    gauss = None
+    if rng_state[-1]:
+        (gauss,) = _GAUSS.unpack_from(view, offset)
+        offset += _GAUSS.size
+    if offset != len(view):
+        raise ValueError("Savestate has trailing data")
+    gm.rng.setstate((rng_state[0], tuple(rng_state[1:-1]), gauss))
+
+    gm.game_state = STATES[state]
+
+
+def save_state_file(game_manager, path=SAVESTATE_FILE):
+    """
+    Write a compressed savestate of the game to disk
+
+    Args:
+        game_manager: GameManager to save
+        path (str): Savestate file
+    """
+    with open(path, 'wb') as f:
+        f.write(zlib.compress(capture_state(game_manager), 6))
+
+
+def load_state_file(game_manager, path=SAVESTATE_FILE):
+    """
+    Restore the game from a savestate file
+
+    Args:
+        game_manager: GameManager to restore into
+        path (str): Savestate file
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a compatible savestate
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        data = zlib.decompress(data)
+    except zlib.error as e:
+        raise ValueError("Corrupt savestate file") from e
+    restore_state(game_manager, data)
+    # A quick-loaded game is not played straight through
+    game_manager.assisted = True
+
+
+def _xor(a, b):
+    """XOR two byte strings, padding the shorter one with zeros"""
+    length = max(len(a), len(b))
+    x = int.from_bytes(a.ljust(length, b'\0'), 'little') ^ int.from_bytes(b.ljust(length, b'\0'), 'little')
+    return x.to_bytes(length, 'little')
+
+
+class RewindBuffer:
+    """
+    Ring buffer of recent snapshots for rewinding
+
+    Snapshots are stored in groups: a zlib-compressed keyframe followed by
+    compressed XOR deltas against that keyframe. Nearby snapshots differ in
+    only a few bytes, so deltas compress very well, and any snapshot decodes
+    from just its keyframe and one delta. When the buffer exceeds its memory
+    cap whole groups are dropped, oldest first.
+    """
+
+    def __init__(self, max_bytes=REWIND_MAX_BYTES, keyframe_interval=REWIND_KEYFRAME_INTERVAL):
+        """
+        Initialize the rewind buffer
+
+        Args:
+            max_bytes (int): Memory cap for the stored (compressed) snapshots
+            keyframe_interval (int): Snapshots per group (one keyframe + deltas)
+        """
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.bytes_used = 0
+        self._groups = deque()  # lists of (snapshot length, compressed keyframe or delta)
+        self._keyframe = None   # uncompressed keyframe of the newest group
+
+    def __len__(self):
+        """Number of snapshots available to rewind through"""
+        return sum(len(group) for group in self._groups)
+
+    def clear(self):
+        """Drop every snapshot"""
+        self._groups.clear()
+        self.bytes_used = 0
+        self._keyframe = None
+
+    def push(self, game_manager):
+        """
+        Capture the game and append the snapshot
+
+        Args:
+            game_manager: GameManager to capture
+        """
+        snapshot = capture_state(game_manager)
+        if self._keyframe is None or len(self._groups[-1]) >= self.keyframe_interval:
+            entry = (len(snapshot), zlib.compress(snapshot, 1))
+            self._groups.append([entry])
+            self._keyframe = snapshot
+        else:
+            entry = (len(snapshot), zlib.compress(_xor(snapshot, self._keyframe), 1))
+            self._groups[-1].append(entry)
+        self.bytes_used += len(entry[1])
+
+        while self.bytes_used > self.max_bytes and len(self._groups) > 1:
+            dropped = self._groups.popleft()
+            self.bytes_used -= sum(len(data) for _, data in dropped)
+
+    def rewind(self, game_manager, steps=1):
+        """
+        Step back in time and restore the game to an older snapshot
+
+        The newest ``steps`` snapshots are discarded; the one before them is
+        restored and stays in the buffer.
+
+        Args:
+            game_manager: GameManager to restore into
+            steps (int): Number of snapshots to go back
+
+        Returns:
+            bool: False if there was nothing to rewind to
+        """
+        for _ in range(steps):
+            if len(self) <= 1:
+                break
+            entry = self._groups[-1].pop()
+            self.bytes_used -= len(entry[1])
+            if not self._groups[-1]:
+                self._groups.pop()
+                self._keyframe = None
+        if not self._groups:
+            return False
+
+        group = self._groups[-1]
+        if self._keyframe is None:
+            self._keyframe = zlib.decompress(group[0][1])
+        snapshot = self._keyframe
+        if len(group) > 1:
+            length, data = group[-1]
+            snapshot = _xor(self._keyframe, zlib.decompress(data))[:length]
+        restore_state(game_manager, snapshot)
+        game_manager.assisted = True
+        return True
@@ -0,0 +1,298 @@
+"""
+Soak Test
+Plays autopilot sessions back-to-back headlessly and reports memory and
+object-count telemetry, flagging anything that grows session after session.
+
+Usage:
+    python soak.py --hours 12 --report soak_report.json
+"""
+
+import os
+
+# Run without a window or sound card
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+import pygame
+from config import *
+from game_clock import SimulatedClock
+from autopilot import AutoPilot, SearchPilot
+
+
+def run_session(game_manager, ui_manager, renderer, clock, pilot, session_index):
+    """
+    Play one autopilot session to the end
+
+    Args:
+        game_manager: GameManager driven by the simulated clock
+        ui_manager: UIManager used to draw the HUD
+        renderer: Renderer the frames are drawn with
+        clock: SimulatedClock of the game manager
+        pilot: AutoPilot or SearchPilot providing the input
+        session_index (int): Session number, used in the player name
+
+    Returns:
+        tuple: (result, frames)
+    """
+    game_manager.start_new_game(f"soak{session_index}")
+    max_frames = int(SOAK_MAX_SESSION_SECONDS * FPS)
+    frames = 0
+
+    while game_manager.game_state == GAME_STATE_PLAYING and frames < max_frames:
+        clock.tick()
+        renderer.begin_frame()
+        game_manager.controls = pilot.control(game_manager)
+        game_manager.update_game_logic()
+        viewport = game_manager.camera_viewport(renderer.viewport)
+        renderer.draw_world(game_manager.bg, game_manager.get_visible_groups(), viewport)
+        game_manager.draw_particles(renderer.surface, viewport)
+        game_manager.draw_health_bar(renderer.surface, viewport)
+        ui_manager.draw_hud(renderer.surface, game_manager.score, game_manager.player_name,
+                            game_manager.get_player_health())
+        ui_manager.end_frame()
+        frames += 1
+
+    result = game_manager.game_state if game_manager.game_state != GAME_STATE_PLAYING else 'timeout'
+    game_manager.reset_game()
+    return result, frames
+
+
+def app_snapshot():
+    """Take a tracemalloc snapshot that leaves out the soak harness itself"""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__)
+    ])
+
+
+def _collect_surfaces(value, found):
+    """Add every Surface in value (a Surface or nested dicts, lists and tuples) to found, by id"""
+    if isinstance(value, pygame.Surface):
+        found[id(value)] = value
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_surfaces(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect_surfaces(item, found)
+
+
+def reachable_surfaces(game_manager, renderer, ui_manager):
+    """
+    Find the surfaces the game holds on to
+
+    pygame Surfaces are not tracked by the garbage collector, so they are
+    gathered from where the game keeps them: sprite images, the background,
+    the asset, renderer, widget and particle caches.
+
+    Args:
+        game_manager: GameManager whose sprites and particles are searched
+        renderer: SurfaceRenderer whose buffers and scaled copies are searched
+        ui_manager: UIManager whose panels are searched
+
+    Returns:
+        list: Distinct surfaces
+    """
+    import assets
+    import sprites
+    from widgets import Panel
+
+    found = {}
+    for group in game_manager.get_sprite_groups():
+        for sprite in group:
+            _collect_surfaces(sprite.image, found)
+    _collect_surfaces(game_manager.bg, found)
+    if game_manager.particles is not None:
+        _collect_surfaces((game_manager.particles._dots, game_manager.particles._scaled_dots), found)
+
+    _collect_surfaces((assets._image_cache, assets._scaled_cache, assets._resolution_sets), found)
+    _collect_surfaces((sprites._bunker_shape, sprites._crater_stamp_cache), found)
+
+    _collect_surfaces((renderer.surface, renderer._back_buffer, renderer._cover, renderer._images), found)
+    _collect_surfaces([entry[1] for entry in renderer._scaled_images.values()], found)
+
+    for panel in vars(ui_manager).values():
+        if isinstance(panel, Panel):
+            _collect_surfaces([panel.image] + [child.image for child in panel.children], found)
+    return list(found.values())
+
+
+def take_sample(session, game_manager, renderer, ui_manager):
+    """
+    Collect memory and object-count telemetry after a session
+
+    Args:
+        session (int): Number of sessions completed
+        game_manager: GameManager whose sprite groups are measured
+        renderer: Renderer whose surfaces are measured
+        ui_manager: UIManager whose surfaces are measured
+
+    Returns:
+        dict: Sample with scalar metrics under 'metrics'
+    """
+    gc.collect()
+    sprite_counts = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, pygame.sprite.Sprite):
+            name = type(obj).__name__
+            sprite_counts[name] = sprite_counts.get(name, 0) + 1
+
+    surfaces = reachable_surfaces(game_manager, renderer, ui_manager)
+    # Subsurfaces share their parent's pixels
+    surface_bytes = sum(surface.get_pitch() * surface.get_height()
+                        for surface in surfaces if surface.get_parent() is None)
+
+    metrics = {
+        'traced_bytes': sum(stat.size for stat in app_snapshot().statistics('filename')),
+        'surface_count': len(surfaces),
+        'surface_bytes': surface_bytes
+    }
+    for name, count in sprite_counts.items():
+        metrics[f"sprites.{name}"] = count
+    for name in ('spaceship_group', 'bullet_group', 'alien_group', 'alien_bullet_group', 'explosion_group'):
+        metrics[f"group.{name}"] = len(getattr(game_manager, name))
+
+    return {
+        'session': session,
+        'time': time.time(),
+        'metrics': metrics,
+        'gc_counts': list(gc.get_count()),
+        'gc_stats': gc.get_stats()
+    }
+
+
+def growth_slope(values):
+    """Least-squares slope of values against their index (growth per sample)"""
+    n = len(values)
+    mean_x = (n - 1) / 2.0
+    mean_y = sum(values) / n
+    spread = sum((x - mean_x) ** 2 for x in range(n))
+    return sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / spread
+
+
+def find_growth(samples, window, min_ratio=SOAK_GROWTH_MIN_RATIO, min_slope=SOAK_GROWTH_MIN_SLOPE):
+    """
+    Find metrics that grew monotonically, and by more than noise, over the last ``window`` samples
+
+    A metric is flagged if it never went down, and the slope fitted through
+    it is at least ``min_slope`` per sample and adds up to at least
+    ``min_ratio`` of its mean over the window. Caches filling up by a few
+    bytes a session are not leaks.
+
+    Args:
+        samples (list): Samples from take_sample, oldest first
+        window (int): Number of consecutive samples to examine
+        min_ratio (float): Least fitted growth over the window, relative to the mean
+        min_slope (float): Least fitted growth per sample
+
+    Returns:
+        dict: metric -> {'first': value, 'last': value, 'slope': growth per sample} for each flagged metric
+    """
+    recent = samples[-window:]
+    if len(recent) < window or window < 2:
+        return {}
+    names = set()
+    for sample in recent:
+        names.update(sample['metrics'])
+
+    flagged = {}
+    for name in sorted(names):
+        values = [sample['metrics'].get(name, 0) for sample in recent]
+        if not all(b >= a for a, b in zip(values, values[1:])) or values[-1] <= values[0]:
+            continue
+        slope = growth_slope(values)
+        mean = sum(values) / len(values)
+        if slope >= min_slope and slope * (len(values) - 1) >= min_ratio * mean:
+            flagged[name] = {'first': values[0], 'last': values[-1], 'slope': slope}
+    return flagged
+
+
+def main(argv=None):
+    """Run the soak test from the command line"""
+    parser = argparse.ArgumentParser(description="Headless autopilot soak test")
+    parser.add_argument('--hours', type=float, default=1.0, help="wall-clock hours to run")
+    parser.add_argument('--sessions', type=int, default=0, help="stop after this many sessions (0 = no limit)")
+    parser.add_argument('--sample-every', type=int, default=1, help="sessions between telemetry samples")
+    parser.add_argument('--window', type=int, default=SOAK_GROWTH_WINDOW,
+                        help="consecutive samples that must grow to flag a metric")
+    parser.add_argument('--report', default='soak_report.json', help="report file to write")
+    parser.add_argument('--pilot', choices=('heuristic', 'search'), default='heuristic',
+                        help="autopilot playing the sessions")
+    parser.add_argument('--endless', action='store_true', default=ENDLESS_WAVES,
+                        help="play endless waves instead of a single formation")
+    parser.add_argument('--arena', action='store_true', default=ARENA_ENABLED,
+                        help="play in a world wider than the screen")
+    args = parser.parse_args(argv)
+    if args.arena and args.pilot == 'search':
+        parser.error("the search pilot cannot play the arena (arena games cannot be forked)")
+
+    # Imported late so the SDL environment variables above take effect
+    from game_manager import GameManager
+    from ui_manager import UIManager
+    from renderer import SurfaceRenderer
+    from arena import Arena
+
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.init()
+    renderer = SurfaceRenderer()
+
+    tracemalloc.start()
+    history_dir = tempfile.TemporaryDirectory(prefix='soak_')
+    history_path = os.path.join(history_dir.name, HISTORY_FILE)
+    clock = SimulatedClock(frame_ms=1000.0 * FRAMES_PER_TICK / FPS)
+    game_manager = GameManager(clock=clock, history_path=history_path)
+    game_manager.endless = args.endless
+    game_manager.arena = Arena() if args.arena else None
+    game_manager.load_background()
+    ui_manager = UIManager()
+    pilot = SearchPilot() if args.pilot == 'search' else AutoPilot()
+
+    deadline = time.time() + args.hours * 3600
+    baseline = app_snapshot()
+    samples = []
+    results = {}
+    session = 0
+
+    while time.time() < deadline and (args.sessions <= 0 or session < args.sessions):
+        session += 1
+        result, frames = run_session(game_manager, ui_manager, renderer, clock, pilot, session)
+        results[result] = results.get(result, 0) + 1
+        if session % args.sample_every == 0:
+            samples.append(take_sample(session, game_manager, renderer, ui_manager))
+            growth = find_growth(samples, args.window)
+            print(f"session {session}: {result} after {frames} frames, "
+                  f"traced {samples[-1]['metrics']['traced_bytes'] / 1024:.0f} KiB"
+                  + (f", growing: {', '.join(growth)}" if growth else ""))
+
+    top_growth = [str(stat) for stat in app_snapshot().compare_to(baseline, 'lineno')[:10]]
+    growth = find_growth(samples, args.window)
+    report = {
+        'sessions': session,
+        'results': results,
+        'growth': growth,
+        'top_allocation_growth': top_growth,
+        'samples': samples
+    }
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    game_manager.wave_preparer.close()
+    history_dir.cleanup()
+    print(f"Soak finished: {session} sessions, report written to {args.report}")
+    if isinstance(pilot, SearchPilot):
+        print(pilot.format_report())
+    if growth:
+        print("Monotonic growth detected in: " + ", ".join(growth))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
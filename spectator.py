@@ -0,0 +1,509 @@
+"""
+Spectator Module
+Live game feed for lobby screens: each simulation tick is encoded once as
+a compressed delta of the savestate snapshot and fanned out to any number
+of viewers over a TCP or UNIX socket by a background thread.
+
+Viewers that cannot keep up are downsampled: their pending deltas are
+skipped and they resync from a fresh keyframe once their socket drains.
+Viewers that stay behind for too long are dropped.
+
+Usage:
+    python spectator.py [--connect ADDRESS]          # watch a running game
+    python spectator.py --bench [--viewers 1,10,100] # measure fan-out capacity
+"""
+
+import argparse
+import os
+import queue
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from config import *
+from savestate import capture_state, restore_state, _xor
+
+# Message framing: payload length, message type
+_FRAME = struct.Struct('<IB')
+KEYFRAME = 0  # zlib(snapshot)
+DELTA = 1     # zlib(snapshot XOR previous snapshot), then the snapshot length
+
+_LENGTH = struct.Struct('<I')
+
+
+def parse_address(address):
+    """
+    Parse a feed address
+
+    Args:
+        address (str): "unix:/path/to.sock" or "host:port"
+
+    Returns:
+        tuple: (socket family, address for bind/connect)
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class _Viewer:
+    """Connection state of one subscriber"""
+
+    __slots__ = ('sock', 'out', 'needs_keyframe', 'behind_since', 'sent', 'skipped')
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.out = bytearray()
+        self.needs_keyframe = True
+        self.behind_since = None
+        self.sent = 0
+        self.skipped = 0
+
+
+class SpectatorFeed:
+    """
+    Publishes game state to socket subscribers
+
+    ``publish`` runs on the game thread and only captures and encodes the
+    tick's snapshot; accepting viewers, backpressure and socket writes happen
+    on the feed's own thread.
+    """
+
+    def __init__(self, address=SPECTATOR_ADDRESS, max_buffer=SPECTATOR_MAX_BUFFER,
+                 drop_after=SPECTATOR_DROP_SECONDS):
+        """
+        Open the listening socket and start the broadcaster thread
+
+        Args:
+            address (str): "unix:/path/to.sock" or "host:port" (port 0 picks a free one)
+            max_buffer (int): Unsent bytes a viewer may queue before it is downsampled
+            drop_after (float): Seconds a viewer may stay behind before it is dropped
+        """
+        self.max_buffer = max_buffer
+        self.drop_after = drop_after
+        self.published = 0
+        self.encode_ns = 0
+        self.skipped = 0
+        self.dropped_viewers = 0
+
+        family, bind_address = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.remove(bind_address)
+        self._listener = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(bind_address)
+        self._listener.listen(64)
+        self._listener.setblocking(False)
+        self.address = (f"unix:{bind_address}" if family == socket.AF_UNIX
+                        else "{}:{}".format(*self._listener.getsockname()[:2]))
+
+        self._previous = b''
+        self._ticks = queue.SimpleQueue()
+        self._viewers = {}
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._running = True
+        self._thread = threading.Thread(target=self._broadcast, name='spectator-feed', daemon=True)
+        self._thread.start()
+
+    @property
+    def viewer_count(self):
+        """Number of connected viewers"""
+        return len(self._viewers)
+
+    def publish(self, game_manager):
+        """
+        Encode the current tick and hand it to the broadcaster
+
+        Args:
+            game_manager: GameManager to broadcast
+        """
+        start = time.perf_counter_ns()
+        snapshot = capture_state(game_manager)
+        delta = zlib.compress(_xor(snapshot, self._previous), 1) + _LENGTH.pack(len(snapshot))
+        self._previous = snapshot
+        self._ticks.put((snapshot, _FRAME.pack(len(delta), DELTA) + delta))
+        self.published += 1
+        self.encode_ns += time.perf_counter_ns() - start
+        try:
+            self._wake_writer.send(b'\0')
+        except (BlockingIOError, InterruptedError):
+            # A wakeup is already pending
+            pass
+
+    def close(self):
+        """Disconnect every viewer and stop the broadcaster"""
+        self._running = False
+        try:
+            self._wake_writer.send(b'\0')
+        except OSError:
+            pass
+        self._thread.join(1.0)
+        self._wake_writer.close()
+        self._wake_reader.close()
+
+    def _broadcast(self):
+        """Broadcaster thread: accept viewers, queue ticks and write sockets"""
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ, 'accept')
+        selector.register(self._wake_reader, selectors.EVENT_READ, 'wake')
+        while self._running:
+            for key, events in selector.select(timeout=1.0):
+                if key.data == 'accept':
+                    self._accept(selector)
+                elif key.data == 'wake':
+                    try:
+                        while self._wake_reader.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                elif events & selectors.EVENT_READ:
+                    # Viewers never send anything; readable means closed
+                    self._drop(selector, key.data)
+                elif events & selectors.EVENT_WRITE:
+                    self._flush(selector, key.data)
+
+            while True:
+                try:
+                    snapshot, delta = self._ticks.get_nowait()
+                except queue.Empty:
+                    break
+                self._fan_out(selector, snapshot, delta)
+
+        for viewer in list(self._viewers.values()):
+            self._drop(selector, viewer, counted=False)
+        selector.close()
+        self._listener.close()
+
+    def _accept(self, selector):
+        """Accept all pending viewer connections"""
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            # Keep the backlog in our queue, where it can be skipped, not in the kernel's
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.max_buffer)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            viewer = _Viewer(sock)
+            self._viewers[sock.fileno()] = viewer
+            selector.register(sock, selectors.EVENT_READ, viewer)
+
+    def _fan_out(self, selector, snapshot, delta):
+        """Queue one tick for every viewer, honouring backpressure"""
+        keyframe = None
+        now = time.monotonic()
+        for viewer in list(self._viewers.values()):
+            if len(viewer.out) > self.max_buffer:
+                # Behind: skip this tick and resync later
+                viewer.needs_keyframe = True
+                viewer.skipped += 1
+                self.skipped += 1
+                if viewer.behind_since is None:
+                    viewer.behind_since = now
+                elif now - viewer.behind_since > self.drop_after:
+                    self._drop(selector, viewer)
+                continue
+            viewer.behind_since = None
+            if viewer.needs_keyframe:
+                if keyframe is None:
+                    # Encoded at most once per tick, however many viewers resync
+                    payload = zlib.compress(snapshot, 1)
+                    keyframe = _FRAME.pack(len(payload), KEYFRAME) + payload
+                was_empty = not viewer.out
+                viewer.out += keyframe
+                viewer.needs_keyframe = False
+            else:
+                was_empty = not viewer.out
+                viewer.out += delta
+            viewer.sent += 1
+            if was_empty:
+                self._flush(selector, viewer)
+
+    def _flush(self, selector, viewer):
+        """Write as much of a viewer's queue as its socket accepts"""
+        try:
+            sent = viewer.sock.send(viewer.out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._drop(selector, viewer)
+            return
+        del viewer.out[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if viewer.out else 0)
+        selector.modify(viewer.sock, events, viewer)
+
+    def _drop(self, selector, viewer, counted=True):
+        """Disconnect a viewer"""
+        if self._viewers.pop(viewer.sock.fileno(), None) is None:
+            return
+        selector.unregister(viewer.sock)
+        viewer.sock.close()
+        if counted:
+            self.dropped_viewers += 1
+
+
+class SpectatorClient:
+    """
+    Reads the feed and rebuilds the latest snapshot
+    """
+
+    def __init__(self, address=SPECTATOR_ADDRESS, timeout=5.0):
+        """
+        Connect to a feed
+
+        Args:
+            address (str): "unix:/path/to.sock" or "host:port"
+            timeout (float): Connection timeout in seconds
+        """
+        family, connect_address = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(connect_address)
+        self.sock.setblocking(False)
+        self.snapshot = None
+        self.messages = 0
+        self.keyframes = 0
+        self.closed = False
+        self._buffer = bytearray()
+
+    def poll(self):
+        """
+        Apply every message received so far
+
+        Returns:
+            bool: True if the snapshot changed
+        """
+        try:
+            while True:
+                data = self.sock.recv(1 << 16)
+                if not data:
+                    self.closed = True
+                    break
+                self._buffer += data
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self.closed = True
+
+        changed = False
+        buffer = self._buffer
+        offset = 0
+        while len(buffer) - offset >= _FRAME.size:
+            length, kind = _FRAME.unpack_from(buffer, offset)
+            end = offset + _FRAME.size + length
+            if len(buffer) < end:
+                break
+            payload = bytes(buffer[offset + _FRAME.size:end])
+            offset = end
+            if kind == KEYFRAME:
+                self.snapshot = zlib.decompress(payload)
+                self.keyframes += 1
+            elif self.snapshot is not None:
+                (length,) = _LENGTH.unpack_from(payload, len(payload) - _LENGTH.size)
+                self.snapshot = _xor(self.snapshot, zlib.decompress(payload[:-_LENGTH.size]))[:length]
+            else:
+                continue
+            self.messages += 1
+            changed = True
+        del buffer[:offset]
+        return changed
+
+    def close(self):
+        """Disconnect from the feed"""
+        self.sock.close()
+
+
+def watch(address=SPECTATOR_ADDRESS):
+    """
+    Render a live game from the feed alone
+
+    Args:
+        address (str): Feed address
+    """
+    import pygame
+    from game_manager import GameManager
+    from ui_manager import UIManager
+    from renderer import create_renderer
+
+    pygame.init()
+    renderer = create_renderer(RENDER_BACKEND, (SCREEN_WIDTH, SCREEN_HEIGHT), 'Space Invaders - Spectator')
+    screen = renderer.surface
+    game_manager = GameManager()
+    # The feed only carries one-screen games
+    game_manager.arena = None
+    game_manager.load_background()
+    ui_manager = UIManager(renderer.viewport)
+    client = SpectatorClient(address)
+    clock = pygame.time.Clock()
+
+    running = True
+    while running and not client.closed:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q)):
+                running = False
+        if client.poll():
+            restore_state(game_manager, client.snapshot)
+
+        renderer.begin_frame()
+        renderer.draw_background(game_manager.bg)
+        state = game_manager.game_state
+        if client.snapshot is None or state == GAME_STATE_MENU:
+            img, pos = ui_manager.draw_centered_text("Waiting for a game...", 'medium', WHITE, SCREEN_HEIGHT // 2)
+            screen.blit(img, pos)
+        elif state == GAME_STATE_PLAYING:
+            renderer.draw_groups(game_manager.get_sprite_groups())
+            game_manager.draw_particles(screen, renderer.viewport)
+            game_manager.draw_health_bar(screen, renderer.viewport)
+            ui_manager.draw_countdown(screen, game_manager.countdown)
+            ui_manager.draw_hud(screen, game_manager.score, game_manager.player_name,
+                                game_manager.get_player_health(),
+                                game_manager.wave if game_manager.endless else None)
+        elif state == GAME_STATE_GAME_OVER:
+            ui_manager.draw_game_over_screen(screen, game_manager.score, game_manager.player_name)
+        else:
+            ui_manager.draw_victory_screen(screen, game_manager.score, game_manager.player_name)
+        ui_manager.end_frame()
+        renderer.present()
+        clock.tick(FPS)
+
+    client.close()
+    pygame.quit()
+
+
+def _bench_viewers(address, count, seconds, results):
+    """Benchmark helper process: hold ``count`` viewers and decode everything they receive"""
+    clients = [SpectatorClient(address) for _ in range(count)]
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        for client in clients:
+            client.poll()
+        time.sleep(0.002)
+    results.put([(client.messages, client.keyframes, client.closed) for client in clients])
+    for client in clients:
+        client.close()
+
+
+def run_benchmark(viewer_counts=(1, 10, 100, 300), seconds=3.0, processes=4, stalled=0,
+                  max_buffer=SPECTATOR_MAX_BUFFER, drop_after=SPECTATOR_DROP_SECONDS):
+    """
+    Serve a headless autopilot game at FPS to growing numbers of viewers
+
+    Args:
+        viewer_counts (tuple): Viewer counts to try
+        seconds (float): Duration of each run
+        processes (int): Viewer processes sharing the load
+        stalled (int): Extra viewers that connect but never read
+        max_buffer (int): Feed backpressure threshold in bytes
+        drop_after (float): Seconds before a lagging viewer is dropped
+
+    Returns:
+        list: (viewers, ticks, mean ticks received, keyframes, skipped ticks,
+               dropped viewers, publish ms) per run
+    """
+    import multiprocessing
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from game_manager import GameManager
+    from game_clock import SimulatedClock
+    from autopilot import AutoPilot
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    context = multiprocessing.get_context('spawn')
+    rows = []
+    print(f"{'viewers':>8} {'ticks':>6} {'recv/viewer':>12} {'keyframes':>10} {'skipped':>8} "
+          f"{'dropped':>8} {'publish ms':>11}")
+    for count in viewer_counts:
+        clock = SimulatedClock(frame_ms=1000 * FRAMES_PER_TICK / FPS)
+        with tempfile.TemporaryDirectory() as directory:
+            game_manager = GameManager(clock=clock, history_path=os.path.join(directory, 'history.json'))
+            game_manager.arena = None
+            pilot = AutoPilot()
+            feed = SpectatorFeed('127.0.0.1:0', max_buffer, drop_after)
+            results = context.Queue()
+            shares = [count // processes + (1 if i < count % processes else 0) for i in range(processes)]
+            workers = [context.Process(target=_bench_viewers, args=(feed.address, share, seconds + 1.0, results))
+                       for share in shares if share]
+            for worker in workers:
+                worker.start()
+            # Stalled viewers hold a connection without ever reading from it
+            stalled_sockets = []
+            for _ in range(stalled):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+                sock.connect(parse_address(feed.address)[1])
+                stalled_sockets.append(sock)
+            while feed.viewer_count < count + stalled:
+                time.sleep(0.01)
+
+            ticks = 0
+            tick_seconds = FRAMES_PER_TICK / FPS
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                if game_manager.game_state != GAME_STATE_PLAYING:
+                    game_manager.start_new_game('bench')
+                clock.tick()
+                game_manager.controls = pilot.control(game_manager)
+                game_manager.update_game_logic()
+                feed.publish(game_manager)
+                ticks += 1
+                # Real-time pacing, like the game loop
+                delay = start + ticks * tick_seconds - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            skipped = feed.skipped
+            dropped = feed.dropped_viewers
+
+            stats = []
+            for _ in workers:
+                stats.extend(results.get())
+            for worker in workers:
+                worker.join()
+            feed.close()
+            for sock in stalled_sockets:
+                sock.close()
+
+        received = sum(messages for messages, _, _ in stats) / max(1, len(stats))
+        keyframes = sum(keyframes for _, keyframes, _ in stats)
+        publish_ms = feed.encode_ns / 1e6 / max(1, feed.published)
+        rows.append((count, ticks, received, keyframes, skipped, dropped, publish_ms))
+        print(f"{count:>8} {ticks:>6} {received:>12.1f} {keyframes:>10} {skipped:>8} "
+              f"{dropped:>8} {publish_ms:>11.3f}")
+    return rows
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Watch a live game, or benchmark the spectator feed")
+    parser.add_argument('--connect', default=SPECTATOR_ADDRESS, help="feed address (host:port or unix:/path)")
+    parser.add_argument('--bench', action='store_true', help="measure how many viewers one game can serve")
+    parser.add_argument('--viewers', default='1,10,100,300', help="comma-separated viewer counts for --bench")
+    parser.add_argument('--seconds', type=float, default=3.0, help="duration of each --bench run")
+    parser.add_argument('--stalled', type=int, default=0, help="extra --bench viewers that never read")
+    parser.add_argument('--max-buffer', type=int, default=SPECTATOR_MAX_BUFFER,
+                        help="bytes a viewer may queue before it is downsampled")
+    parser.add_argument('--drop-after', type=float, default=SPECTATOR_DROP_SECONDS,
+                        help="seconds a lagging viewer may stay behind before it is dropped")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(tuple(int(v) for v in args.viewers.split(',')), args.seconds,
+                      stalled=args.stalled, max_buffer=args.max_buffer, drop_after=args.drop_after)
+    else:
+        watch(args.connect)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
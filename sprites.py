@@ -6,6 +6,11 @@ Contains all sprite classes for the Space Invaders game including player, aliens
 import pygame
 import random
 from config import *
+from assets import load_image, load_scaled_image, load_mask
+from collision import sweep_rect, sweep_mask, sweep_masks
+from input_manager import InputSnapshot
+from events import EVENT_SHOT, EVENT_ALIEN_KILLED, EVENT_PLAYER_HIT, EVENT_EXPLOSION
+from timers import TIMER_SHIP_RELOAD
 
 class Spaceship(pygame.sprite.Sprite):
     """
@@ -25,7 +30,7 @@ class Spaceship(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         
         # Load and set up the spaceship image
-        self.image = pygame.image.load(IMAGES['spaceship'])
+        self.image = load_image(IMAGES['spaceship'])
         self.rect = self.image.get_rect()
         self.rect.center = [x, y]
         
@@ -33,13 +38,13 @@ class Spaceship(pygame.sprite.Sprite):
         self.health_start = health
         self.health_remaining = health
         
-        # Shooting cooldown
-        self.last_shot = pygame.time.get_ticks()
+        # Shooting cooldown (cleared by the game's timer wheel)
+        self.reloading = False
         
-        # Create collision mask for precise collision detection
-        self.mask = pygame.mask.from_surface(self.image)
+        # Collision mask for precise collision detection (shared, the image never changes)
+        self.mask = load_mask(IMAGES['spaceship'])
 
-    def update(self, bullet_group, explosion_group, spaceship_group, game_manager=None):
+    def update(self, bullet_group, explosion_group, spaceship_group, game_manager=None, controls=None):
         """
         Update spaceship state - movement, shooting, and health
         
@@ -47,63 +52,70 @@ class Spaceship(pygame.sprite.Sprite):
             bullet_group: Sprite group for player bullets
             explosion_group: Sprite group for explosions
             spaceship_group: Sprite group containing the spaceship
-            game_manager: Game manager instance for sound effects
+            game_manager: Game manager whose event bus receives shots and explosions,
+                          and whose timer wheel runs the shooting cooldown
+            controls: InputSnapshot for this frame (keyboard state if None)
             
         Returns:
             int: Game state (-1 for game over, 0 for continue)
         """
-        # Get current time for cooldown management
-        time_now = pygame.time.get_ticks()
         game_over = 0
 
-        # Handle keyboard input for movement
-        key = pygame.key.get_pressed()
+        # Handle input for movement
+        if controls is None:
+            controls = InputSnapshot.from_keyboard()
         
         # Left movement with boundary check
-        if key[pygame.K_LEFT] and self.rect.left > 0:
-            self.rect.x -= PLAYER_SPEED
+        if controls.left and self.rect.left > 0:
+            self.rect.x -= PLAYER_SPEED * FRAMES_PER_TICK
+            controls.effects.add('left')
             
-        # Right movement with boundary check
-        if key[pygame.K_RIGHT] and self.rect.right < SCREEN_WIDTH:
-            self.rect.x += PLAYER_SPEED
+        # Right movement with boundary check (the arena is wider than the screen)
+        world_width = game_manager.world_size[0] if game_manager else SCREEN_WIDTH
+        if controls.right and self.rect.right < world_width:
+            self.rect.x += PLAYER_SPEED * FRAMES_PER_TICK
+            controls.effects.add('right')
 
         # Shooting mechanism with cooldown
-        if key[pygame.K_SPACE] and time_now - self.last_shot > PLAYER_COOLDOWN:
+        if controls.fire and not self.reloading:
             # Create new bullet at spaceship position
             bullet = Bullets(self.rect.centerx, self.rect.top)
             bullet_group.add(bullet)
-            self.last_shot = time_now
+            controls.effects.add('fire')
             
-            # Play laser sound if game manager is available
             if game_manager:
-                game_manager.handle_laser_sound()
+                self.reloading = True
+                game_manager.timers.schedule(PLAYER_COOLDOWN, TIMER_SHIP_RELOAD)
+                game_manager.events.emit(EVENT_SHOT, self.rect.centerx, self.rect.top)
+        elif controls.fire:
+            # Held back until reloaded; not input latency
+            controls.refused.add('fire')
 
-        # Update collision mask
-        self.mask = pygame.mask.from_surface(self.image)
-
-        # Draw health bar
-        self._draw_health_bar()
-        
         # Check if spaceship is destroyed
         if self.health_remaining <= 0:
-            explosion = Explosion(self.rect.centerx, self.rect.centery, 3)
-            explosion_group.add(explosion)
+            spawn_explosion(explosion_group, self.rect.centerx, self.rect.centery, 3, game_manager)
             self.kill()
             game_over = -1
             
         return game_over
 
-    def _draw_health_bar(self):
-        """Draw the health bar below the spaceship"""
+    def draw_health_bar(self, surface, viewport=None):
+        """
+        Draw the health bar below the spaceship
+        
+        Args:
+            surface: Surface to draw the health bar on
+            viewport (Viewport): Mapping of logical positions to the surface, None if they match
+        """
+        bar = (self.rect.x, self.rect.bottom + 10, self.rect.width, 15)
         # Draw red background (empty health)
-        pygame.draw.rect(pygame.display.get_surface(), RED, 
-                        (self.rect.x, self.rect.bottom + 10, self.rect.width, 15))
+        pygame.draw.rect(surface, RED, viewport.rect(bar) if viewport else bar)
         
         # Draw green health bar (remaining health)
         if self.health_remaining > 0:
             health_width = int(self.rect.width * (self.health_remaining / self.health_start))
-            pygame.draw.rect(pygame.display.get_surface(), GREEN, 
-                           (self.rect.x, self.rect.bottom + 10, health_width, 15))
+            bar = (self.rect.x, self.rect.bottom + 10, health_width, 15)
+            pygame.draw.rect(surface, GREEN, viewport.rect(bar) if viewport else bar)
 
 
 class Bullets(pygame.sprite.Sprite):
@@ -123,36 +135,51 @@ class Bullets(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         
         # Load bullet image
-        self.image = pygame.image.load(IMAGES['bullet'])
+        self.image = load_image(IMAGES['bullet'])
         self.rect = self.image.get_rect()
         self.rect.center = [x, y]
+        self.mask = load_mask(IMAGES['bullet'])
+        
+        # Distance travelled per simulation tick
+        self.speed = PLAYER_BULLET_SPEED * FRAMES_PER_TICK
 
-    def update(self, alien_group, explosion_group, game_manager=None):
+    def update(self, alien_group, explosion_group, game_manager=None, bunker_group=()):
         """
         Update bullet position and check collisions
         
         Args:
             alien_group: Sprite group containing aliens
             explosion_group: Sprite group for explosions
-            game_manager: Game manager instance for scoring and sound effects
+            game_manager: Game manager whose event bus receives kills and explosions
+            bunker_group: Sprite group containing bunkers
         """
-        # Move bullet upward
-        self.rect.y -= PLAYER_BULLET_SPEED
+        # Check collision with aliens along the whole path for this tick,
+        # so fast bullets cannot pass through an alien between two frames
+        hit = sweep_rect(self.rect, 0, -self.speed, alien_group)
         
-        # Remove bullet if it goes off screen
-        if self.rect.bottom < 0:
-            self.kill()
-            
-        # Check collision with aliens
-        if pygame.sprite.spritecollide(self, alien_group, True):
+        # A bunker in the way stops the bullet first
+        if bunker_group and erode_bunker(self, 0, -self.speed, bunker_group, hit[0] if hit else None):
+            return
+        
+        if hit:
+            t, alien = hit
+            self.rect.y -= int(self.speed * t)
+            alien.kill()
             self.kill()
             # Create explosion at bullet position
-            explosion = Explosion(self.rect.centerx, self.rect.centery, 2)
-            explosion_group.add(explosion)
+            spawn_explosion(explosion_group, self.rect.centerx, self.rect.centery, 2, game_manager)
             
-            # Update score and play sound if game manager is available
+            # Scoring and sound happen when the frame's events are dispatched
             if game_manager:
-                game_manager.handle_bullet_collision()
+                game_manager.events.emit(EVENT_ALIEN_KILLED, self.rect.centerx, self.rect.centery, ALIEN_POINTS)
+            return
+        
+        # Move bullet upward
+        self.rect.y -= self.speed
+        
+        # Remove bullet if it goes off screen
+        if self.rect.bottom < 0:
+            self.kill()
 
 
 class Aliens(pygame.sprite.Sprite):
@@ -161,19 +188,23 @@ class Aliens(pygame.sprite.Sprite):
     Handles alien movement patterns
     """
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None, alien_number=None):
         """
         Initialize alien
         
         Args:
             x (int): Initial x position
             y (int): Initial y position
+            rng (random.Random): Random generator for the image choice
+            alien_number (int): Alien image (1-5), random if None
         """
         pygame.sprite.Sprite.__init__(self)
         
         # Load random alien image (1-5)
-        alien_number = random.randint(1, 5)
-        self.image = pygame.image.load(f"{ASSETS_PATH}alien{alien_number}.png")
+        if alien_number is None:
+            alien_number = (rng or random).randint(1, 5)
+        self.alien_number = alien_number
+        self.image = load_image(f"{ASSETS_PATH}alien{alien_number}.png")
         self.rect = self.image.get_rect()
         self.rect.center = [x, y]
         
@@ -183,14 +214,69 @@ class Aliens(pygame.sprite.Sprite):
 
     def update(self):
         """Update alien movement"""
-        # Move alien horizontally
-        self.rect.x += self.move_direction
-        self.move_counter += 1
+        dx, self.move_counter, self.move_direction = _alien_step(self.move_counter, self.move_direction)
+        self.rect.x += dx
+    
+    def fast_forward(self, home_x, age):
+        """
+        Put the alien where ``age`` updates since its creation have taken it,
+        without running them (for aliens left alone while off screen)
         
-        # Change direction when reaching movement limit
-        if abs(self.move_counter) > ALIEN_MOVE_DISTANCE:
-            self.move_direction *= -1
-            self.move_counter *= self.move_direction
+        Args:
+            home_x (int): The alien's rect.x when it was created
+            age (int): Updates since it was created
+        """
+        dx, self.move_counter, self.move_direction = alien_motion(age)
+        self.rect.x = home_x + dx
+
+
+def _alien_step(move_counter, move_direction):
+    """
+    One alien movement update
+    
+    Returns:
+        tuple: (x displacement, new move counter, new direction)
+    """
+    dx = move_direction * FRAMES_PER_TICK
+    move_counter += FRAMES_PER_TICK
+    
+    # Change direction when reaching movement limit
+    if abs(move_counter) > ALIEN_MOVE_DISTANCE:
+        move_direction *= -1
+        move_counter *= move_direction
+    return dx, move_counter, move_direction
+
+
+# Alien movement states (x offset, move counter, direction) after each update
+# since creation, up to the first repeated state, and where the repeat loops back to
+_alien_motion_states = []
+_alien_motion_loop = 0
+
+
+def alien_motion(age):
+    """
+    Movement state of an alien ``age`` updates after its creation
+    
+    The movement is periodic, so every age maps onto one recorded cycle.
+    
+    Returns:
+        tuple: (x offset from the starting position, move counter, direction)
+    """
+    global _alien_motion_loop
+    states = _alien_motion_states
+    if not states:
+        seen = {}
+        offset, counter, direction = 0, 0, ALIEN_MOVE_SPEED
+        while (offset, counter, direction) not in seen:
+            seen[(offset, counter, direction)] = len(states)
+            states.append((offset, counter, direction))
+            dx, counter, direction = _alien_step(counter, direction)
+            offset += dx
+        _alien_motion_loop = seen[(offset, counter, direction)]
+    if age < len(states):
+        return states[age]
+    loop = _alien_motion_loop
+    return states[loop + (age - loop) % (len(states) - loop)]
 
 
 class Alien_Bullets(pygame.sprite.Sprite):
@@ -210,39 +296,180 @@ class Alien_Bullets(pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         
         # Load alien bullet image
-        self.image = pygame.image.load(IMAGES['alien_bullet'])
+        self.image = load_image(IMAGES['alien_bullet'])
         self.rect = self.image.get_rect()
         self.rect.center = [x, y]
+        self.mask = load_mask(IMAGES['alien_bullet'])
+        
+        # Distance travelled per simulation tick
+        self.speed = ALIEN_BULLET_SPEED * FRAMES_PER_TICK
 
-    def update(self, spaceship_group, explosion_group, game_manager=None):
+    def update(self, spaceship_group, explosion_group, game_manager=None, bunker_group=()):
         """
         Update alien bullet position and check collisions
         
         Args:
             spaceship_group: Sprite group containing the spaceship
             explosion_group: Sprite group for explosions
-            game_manager: Game manager instance for sound effects
+            game_manager: Game manager whose event bus receives hits and explosions
+            bunker_group: Sprite group containing bunkers
         """
+        # Check collision with spaceship along the whole path for this tick,
+        # refined with masks for precise collision
+        hit = sweep_rect(self.rect, 0, self.speed, spaceship_group)
+        t = sweep_mask(self, 0, self.speed, hit[1], hit[0]) if hit else None
+        
+        # A bunker in the way stops the bullet first
+        if bunker_group and erode_bunker(self, 0, self.speed, bunker_group, t):
+            return
+        
+        if t is not None:
+            self.rect.y += int(self.speed * t)
+            self.kill()
+            # Reduce spaceship health (applied with the frame's events when there is a game manager)
+            if game_manager:
+                game_manager.events.emit(EVENT_PLAYER_HIT, self.rect.centerx, self.rect.centery, 1)
+            else:
+                for spaceship in spaceship_group:
+                    spaceship.health_remaining -= 1
+            # Create explosion at bullet position
+            spawn_explosion(explosion_group, self.rect.centerx, self.rect.centery, 1, game_manager)
+            return
+        
         # Move bullet downward
-        self.rect.y += ALIEN_BULLET_SPEED
+        self.rect.y += self.speed
         
         # Remove bullet if it goes off screen
         if self.rect.top > SCREEN_HEIGHT:
             self.kill()
-            
-        # Check collision with spaceship using mask for precise collision
-        if pygame.sprite.spritecollide(self, spaceship_group, False, pygame.sprite.collide_mask):
-            self.kill()
-            # Reduce spaceship health
-            for spaceship in spaceship_group:
-                spaceship.health_remaining -= 1
-            # Create explosion at bullet position
-            explosion = Explosion(self.rect.centerx, self.rect.centery, 1)
-            explosion_group.add(explosion)
-            
-            # Play explosion sound if game manager is available
-            if game_manager:
-                game_manager.handle_explosion_sound()
+
+
+class Bunker(pygame.sprite.Sprite):
+    """
+    Destructible shield
+    Bullets blast craters into its image and mask in place, so each hit only
+    touches the pixels around the impact
+    """
+    
+    def __init__(self, x, y, shared=False):
+        """
+        Initialize bunker
+        
+        Args:
+            x (int): X position of the bunker centre
+            y (int): Y position of the bunker centre
+            shared (bool): Start on the shared shape's pixels and copy them on
+                           first erosion (for arenas with hundreds of bunkers)
+        """
+        pygame.sprite.Sprite.__init__(self)
+        
+        # Each bunker erodes its own copy of the shared shape
+        image, mask = _bunker_template()
+        self.image = image if shared else image.copy()
+        self.mask = mask if shared else mask.copy()
+        self.rect = self.image.get_rect()
+        self.rect.center = [x, y]
+        
+        # Crater centres in bunker coordinates, in impact order (for savestates)
+        self.craters = []
+        
+        # Bumped on every change so renderers refresh cached copies of the image
+        self.image_serial = 0
+        
+        # True while the image and mask are shared with a fork or the template (copied on first erosion)
+        self._shared = shared
+
+    def fork(self):
+        """
+        Copy the bunker for a forked game without copying its pixels
+        
+        Returns:
+            Bunker: Copy sharing this bunker's image and mask until either erodes
+        """
+        clone = fork_sprite(self)
+        clone.craters = list(self.craters)
+        self._shared = clone._shared = True
+        return clone
+
+    def erode(self, x, y):
+        """
+        Blast a crater into the bunker around an impact point
+        
+        Args:
+            x (int): Impact x position on screen
+            y (int): Impact y position on screen
+        """
+        self.stamp_crater(x - self.rect.x, y - self.rect.y)
+
+    def stamp_crater(self, x, y):
+        """
+        Clear the crater stamp around a point in bunker coordinates
+        
+        Args:
+            x (int): Crater centre x inside the bunker
+            y (int): Crater centre y inside the bunker
+        """
+        stamps = _crater_stamps()
+        # The stamp variant depends only on the position, so replays match
+        stamp_image, stamp_mask = stamps[(x * 7 + y * 13) % len(stamps)]
+        offset = (x - BUNKER_CRATER_RADIUS, y - BUNKER_CRATER_RADIUS)
+        if self._shared:
+            self.image = self.image.copy()
+            self.mask = self.mask.copy()
+            self._shared = False
+        self.mask.erase(stamp_mask, offset)
+        self.image.blit(stamp_image, offset, special_flags=pygame.BLEND_RGBA_MULT)
+        self.craters.append((x, y))
+        self.image_serial += 1
+
+
+# Shared bunker shape and crater stamps, built on first use
+_bunker_shape = None
+_crater_stamp_cache = []
+
+
+def _bunker_template():
+    """Return the intact bunker (image, mask) shared by every bunker"""
+    global _bunker_shape
+    if _bunker_shape is None:
+        width, height = BUNKER_SIZE
+        image = pygame.Surface(BUNKER_SIZE, pygame.SRCALPHA)
+        bevel = height // 4
+        pygame.draw.polygon(image, GREEN, [(0, bevel), (bevel, 0), (width - 1 - bevel, 0),
+                                           (width - 1, bevel), (width - 1, height - 1), (0, height - 1)])
+        # Arch the player can shelter under
+        arch = pygame.Rect(0, 0, width // 3, height // 2)
+        arch.midbottom = (width // 2, height + arch.height // 2)
+        pygame.draw.ellipse(image, (0, 0, 0, 0), arch)
+        _bunker_shape = (image, pygame.mask.from_surface(image))
+    return _bunker_shape
+
+
+def _crater_stamps():
+    """
+    Return the crater stamps as (image, mask) pairs
+    
+    Stamp images are opaque white outside the crater and fully transparent
+    inside it, so multiplying them onto a bunker clears just the crater.
+    A few jagged variants keep the damage from looking uniform.
+    """
+    if not _crater_stamp_cache:
+        rng = random.Random(BUNKER_CRATER_RADIUS)
+        radius = BUNKER_CRATER_RADIUS
+        size = 2 * radius + 1
+        for _ in range(4):
+            image = pygame.Surface((size, size), pygame.SRCALPHA)
+            image.fill((255, 255, 255, 255))
+            mask = pygame.mask.Mask((size, size))
+            for y in range(size):
+                for x in range(size):
+                    distance = ((x - radius) ** 2 + (y - radius) ** 2) ** 0.5
+                    # Solid core, ragged rim
+                    if distance <= radius - 1.5 or (distance <= radius + 0.5 and rng.random() < 0.5):
+                        image.set_at((x, y), (255, 255, 255, 0))
+                        mask.set_at((x, y))
+            _crater_stamp_cache.append((image, mask))
+    return _crater_stamp_cache
 
 
 class Explosion(pygame.sprite.Sprite):
@@ -261,14 +488,14 @@ class Explosion(pygame.sprite.Sprite):
             size (int): Size of explosion (1=small, 2=medium, 3=large)
         """
         pygame.sprite.Sprite.__init__(self)
+        self.size = size
         
         # Load explosion animation frames
         self.images = []
         for num in range(1, 6):
-            img = pygame.image.load(f"{ASSETS_PATH}exp{num}.png")
             # Scale image based on explosion size
             scaled_size = EXPLOSION_SIZES[size]
-            img = pygame.transform.scale(img, scaled_size)
+            img = load_scaled_image(f"{ASSETS_PATH}exp{num}.png", scaled_size)
             self.images.append(img)
             
         # Animation variables
@@ -281,7 +508,7 @@ class Explosion(pygame.sprite.Sprite):
     def update(self):
         """Update explosion animation"""
         # Update animation counter
-        self.counter += 1
+        self.counter += FRAMES_PER_TICK
 
         # Advance to next frame when counter reaches speed limit
         if self.counter >= EXPLOSION_SPEED and self.index < len(self.images) - 1:
@@ -291,4 +518,92 @@ class Explosion(pygame.sprite.Sprite):
 
         # Remove explosion when animation is complete
         if self.index >= len(self.images) - 1 and self.counter >= EXPLOSION_SPEED:
-            self.kill() 
\ No newline at end of file
+            self.kill()
+
+
+_sprite_init = pygame.sprite.Sprite.__init__
+
+
+def fork_sprite(sprite):
+    """
+    Copy a sprite's simulation state for a forked game
+    
+    The copy gets its own rect and belongs to no groups. Every other
+    attribute, including the image and mask, is shared with the original,
+    so attributes that are changed in place must be copied by the caller.
+    
+    Args:
+        sprite: Sprite to copy
+    
+    Returns:
+        pygame.sprite.Sprite: Copy of the same class
+    """
+    clone = object.__new__(type(sprite))
+    state = sprite.__dict__.copy()
+    state['rect'] = sprite.rect.copy()
+    clone.__dict__ = state
+    # Reset group membership copied from the original
+    _sprite_init(clone)
+    return clone
+
+
+def fork_group(group, fork=fork_sprite):
+    """
+    Copy a sprite group for a forked game
+    
+    Args:
+        group: Sprite group to copy
+        fork (callable): Copies one sprite (fork_sprite by default)
+    
+    Returns:
+        pygame.sprite.Group: New group holding a copy of each sprite
+    """
+    clone = pygame.sprite.Group()
+    # The copies are new, so skip Group.add's membership checks and fill the group at once
+    copies = [fork(sprite) for sprite in group.spritedict]
+    for copy in copies:
+        copy.add_internal(clone)
+    clone.spritedict = dict.fromkeys(copies)
+    return clone
+
+
+def erode_bunker(bullet, dx, dy, bunker_group, t_other=None):
+    """
+    Stop a bullet at the first bunker pixel on its path and blast a crater there
+    
+    Args:
+        bullet: Bullet sprite with ``rect`` and ``mask``
+        dx, dy (float): Bullet displacement for the tick
+        bunker_group: Sprite group containing bunkers
+        t_other (float): Path time of another hit; bunkers only count if reached first
+    
+    Returns:
+        bool: True if the bullet hit a bunker (and was removed)
+    """
+    contact = sweep_masks(bullet, dx, dy, bunker_group)
+    if contact is None or (t_other is not None and t_other < contact[0]):
+        return False
+    t, bunker, point = contact
+    bunker.erode(*point)
+    bullet.kill()
+    return True
+
+
+def spawn_explosion(explosion_group, x, y, size, game_manager=None):
+    """
+    Create an explosion, or queue it on the game manager's event bus when
+    available so quality limits apply
+    
+    Args:
+        explosion_group: Sprite group for explosions
+        x (int): X position for explosion
+        y (int): Y position for explosion
+        size (int): Size of explosion (1=small, 2=medium, 3=large)
+        game_manager: Game manager instance, or None
+    """
+    if game_manager:
+        game_manager.events.emit(EVENT_EXPLOSION, x, y, size)
+        return None
+    explosion = Explosion(x, y, size)
+    explosion_group.add(explosion)
+    return explosion
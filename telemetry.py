@@ -0,0 +1,125 @@
+"""
+Telemetry Module
+Low-overhead event log: events are buffered in memory on the game thread and
+written by a background thread to size-rotated JSONL files.
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from config import *
+
+# Pattern of the log file names written by the sink
+FILE_PATTERN = re.compile(r"^telemetry-(\d+)\.jsonl$")
+
+
+class TelemetrySink:
+    """
+    Buffered, rotating JSONL event writer
+
+    ``record`` only appends a tuple to a list. Full buffers are handed to the
+    writer thread, which serializes them and rotates files by size.
+    """
+
+    def __init__(self, directory=TELEMETRY_DIR, max_bytes=TELEMETRY_MAX_BYTES,
+                 max_files=TELEMETRY_MAX_FILES, buffer_size=TELEMETRY_BUFFER_EVENTS):
+        """
+        Initialize the sink and start its writer thread
+
+        Args:
+            directory (str): Directory the JSONL files are written to
+            max_bytes (int): Size at which a file is closed and a new one started
+            max_files (int): Oldest files are deleted beyond this count (0 = keep all)
+            buffer_size (int): Events buffered before handing off to the writer
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.buffer_size = buffer_size
+        self.session = None
+        self.dropped = 0
+
+        self._buffer = []
+        self._queue = queue.Queue(maxsize=TELEMETRY_QUEUE_BATCHES)
+        self._file = None
+        self._file_index = 0
+        self._thread = threading.Thread(target=self._writer, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, kind, **fields):
+        """
+        Record an event for the current session
+
+        Args:
+            kind (str): Event name ('shot', 'hit', 'damage', 'frame', 'state', ...)
+            **fields: JSON-serializable event data
+        """
+        self._buffer.append((time.time(), self.session, kind, fields))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered events to the writer thread without blocking"""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            # The writer cannot keep up; never stall the game for telemetry
+            self.dropped += len(batch)
+
+    def close(self):
+        """Flush everything and wait for the writer thread to finish"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _writer(self):
+        """Writer thread: serialize batches and append them to the log files"""
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            try:
+                lines = []
+                for timestamp, session, kind, fields in batch:
+                    event = {'t': round(timestamp, 4), 's': session, 'e': kind}
+                    event.update(fields)
+                    lines.append(json.dumps(event, separators=(',', ':')))
+                self._write("\n".join(lines) + "\n")
+            except Exception as e:
+                # Non-fatal
+                print(f"Warning: Could not write telemetry: {e}")
+        if self._file:
+            self._file.close()
+
+    def _write(self, text):
+        """Append text to the current file, rotating first if it is full"""
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            existing = [int(m.group(1)) for m in map(FILE_PATTERN.match, os.listdir(self.directory)) if m]
+            self._file_index = max(existing, default=0)
+            self._open_next()
+        elif self._file.tell() >= self.max_bytes:
+            self._open_next()
+        self._file.write(text)
+        self._file.flush()
+
+    def _open_next(self):
+        """Close the current file and start the next one"""
+        if self._file:
+            self._file.close()
+        self._file_index += 1
+        path = os.path.join(self.directory, f"telemetry-{self._file_index:05d}.jsonl")
+        self._file = open(path, 'a', encoding='utf-8')
+
+        if self.max_files > 0:
+            stale = self._file_index - self.max_files
+            for index in range(max(1, stale - self.max_files), stale + 1):
+                old = os.path.join(self.directory, f"telemetry-{index:05d}.jsonl")
+                if os.path.exists(old):
+                    os.remove(old)
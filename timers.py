@@ -0,0 +1,251 @@
+"""
+Timers Module
+Hierarchical timer wheel driven by the game clock. Timers are plain data
+(a key and an optional payload) dispatched to handlers registered per key,
+so pending timers can be copied into forks and saved in savestates.
+
+Usage:
+    python timers.py [--timers 10000]   # benchmark with many active timers
+"""
+
+# Timer keys used by the game (saved in savestates, so only append)
+TIMER_COUNTDOWN = 0       # one second of the pre-game countdown elapsed
+TIMER_ALIEN_VOLLEY = 1    # aliens may fire again
+TIMER_SHIP_RELOAD = 2     # the player may fire again
+
+# Wheel geometry: 1 ms slots on the first level, each further level
+# covering a whole turn of the one below
+_LEVEL_BITS = (8, 6, 6, 6)
+_LEVEL_SHIFTS = (0, 8, 14, 20)
+_HORIZON = 1 << 26  # about 18.6 hours; longer timers are re-filed when they come round
+
+
+class Timer:
+    """A scheduled timer; keep it to cancel the timer"""
+
+    __slots__ = ('deadline', 'key', 'payload', 'active')
+
+    def __init__(self, deadline, key, payload):
+        self.deadline = deadline
+        self.key = key
+        self.payload = payload
+        self.active = True
+
+
+class TimerWheel:
+    """
+    Hashed hierarchical timer wheel with millisecond resolution
+
+    Scheduling and cancelling are O(1); each timer is re-filed at most once
+    per level on its way down, so expiry is O(1) amortized however many
+    timers are active. The wheel keeps its own time, which only moves while
+    it is not paused, so pausing freezes every timer at once.
+    """
+
+    def __init__(self, clock):
+        """
+        Initialize an empty wheel
+
+        Args:
+            clock: Callable returning the game time in milliseconds
+        """
+        self.clock = clock
+        self.time = 0
+        self.paused = False
+        self.fired = 0
+        self._handlers = {}
+        # Slots are sparse (slot index -> timers) so empty wheels are cheap to create and copy
+        self._levels = [{} for _ in _LEVEL_BITS]
+        self._active = 0
+        self._last_now = clock()
+
+    def __len__(self):
+        """Number of pending timers"""
+        return self._active
+
+    def on(self, key, handler):
+        """
+        Set the handler of a timer key
+
+        Args:
+            key: Timer key
+            handler (callable): Called with the timer's payload when it expires
+        """
+        self._handlers[key] = handler
+
+    def schedule(self, delay_ms, key, payload=None):
+        """
+        Start a timer
+
+        Args:
+            delay_ms (int): Milliseconds of unpaused game time until it expires
+                            (at least 1; expired timers fire on the next advance)
+            key: Timer key selecting the handler
+            payload: Passed to the handler
+
+        Returns:
+            Timer: Handle for cancel and remaining
+        """
+        timer = Timer(self.time + max(1, int(delay_ms)), key, payload)
+        self._file(timer)
+        self._active += 1
+        return timer
+
+    def cancel(self, timer):
+        """Stop a timer (it is dropped lazily when its slot comes round)"""
+        if timer is not None and timer.active:
+            timer.active = False
+            self._active -= 1
+
+    def remaining(self, timer):
+        """Milliseconds until a timer expires (0 if it is not pending)"""
+        return max(0, timer.deadline - self.time) if timer.active else 0
+
+    def pending(self):
+        """
+        List the pending timers
+
+        Returns:
+            list: (key, remaining ms, payload) tuples, soonest first
+        """
+        timers = [timer for level in self._levels for slot in level.values() for timer in slot if timer.active]
+        timers.sort(key=lambda timer: timer.deadline)
+        return [(timer.key, timer.deadline - self.time, timer.payload) for timer in timers]
+
+    def clear(self):
+        """Drop every timer and resynchronize with the clock"""
+        for level in self._levels:
+            level.clear()
+        self._active = 0
+        self._last_now = self.clock()
+
+    def pause(self):
+        """Freeze every timer"""
+        self.paused = True
+
+    def resume(self):
+        """Unfreeze the timers; the time spent paused does not count"""
+        if self.paused:
+            self.paused = False
+            self._last_now = self.clock()
+
+    def copy(self, clock):
+        """
+        Copy the pending timers into a new wheel
+
+        Handlers are not copied; the owner of the copy registers its own.
+
+        Args:
+            clock: Clock of the new wheel
+
+        Returns:
+            TimerWheel: Wheel with the same timers at the same remaining times
+        """
+        wheel = TimerWheel(clock)
+        wheel.paused = self.paused
+        # Same time and slots, so the live timers keep their places without re-filing
+        wheel.time = self.time
+        for level, source in zip(wheel._levels, self._levels):
+            for slot, timers in source.items():
+                live = [Timer(timer.deadline, timer.key, timer.payload) for timer in timers if timer.active]
+                if live:
+                    level[slot] = live
+        wheel._active = self._active
+        return wheel
+
+    def advance(self):
+        """Move the wheel to the clock's time, firing expired timers in deadline order"""
+        now = self.clock()
+        elapsed = now - self._last_now
+        self._last_now = now
+        if self.paused or elapsed <= 0:
+            return
+        if not self._active:
+            self.time += elapsed
+            return
+
+        level0 = self._levels[0]
+        mask0 = (1 << _LEVEL_BITS[0]) - 1
+        target = self.time + elapsed
+        while self.time < target and self._active:
+            self.time += 1
+            t = self.time
+            if not t & mask0:
+                self._cascade(1)
+            due = level0.pop(t & mask0, None)
+            if due:
+                # Handlers may schedule new timers (never into this slot)
+                for timer in due:
+                    if timer.active:
+                        timer.active = False
+                        self._active -= 1
+                        self.fired += 1
+                        self._handlers[timer.key](timer.payload)
+        self.time = target
+
+    def _file(self, timer):
+        """Put a timer in the slot of the lowest level that reaches its deadline"""
+        distance = timer.deadline - self.time
+        for level, shift in enumerate(_LEVEL_SHIFTS):
+            if distance < 1 << (shift + _LEVEL_BITS[level]) or level == len(_LEVEL_SHIFTS) - 1:
+                deadline = min(timer.deadline, self.time + _HORIZON - 1)
+                index = (deadline >> shift) & ((1 << _LEVEL_BITS[level]) - 1)
+                self._levels[level].setdefault(index, []).append(timer)
+                return
+
+    def _cascade(self, level):
+        """Re-file the timers of the next slot of a level into the levels below"""
+        if level >= len(self._levels):
+            return
+        index = (self.time >> _LEVEL_SHIFTS[level]) & ((1 << _LEVEL_BITS[level]) - 1)
+        if index == 0:
+            self._cascade(level + 1)
+        due = self._levels[level].pop(index, None)
+        if due:
+            for timer in due:
+                if timer.active:
+                    self._file(timer)
+
+
+def run_benchmark(count=10000, seconds=60.0, tick_ms=1000.0 / 30):
+    """
+    Keep ``count`` timers active (each rescheduled when it fires) and
+    advance the wheel tick by tick
+
+    Args:
+        count (int): Active timers
+        seconds (float): Simulated time
+        tick_ms (float): Simulated time per tick
+
+    Returns:
+        tuple: (microseconds per tick, timers fired)
+    """
+    import random
+    import time
+    from game_clock import SimulatedClock
+
+    clock = SimulatedClock(frame_ms=tick_ms)
+    wheel = TimerWheel(clock)
+    rng = random.Random(1)
+    wheel.on(0, lambda payload: wheel.schedule(rng.randint(50, 20000), 0))
+    for _ in range(count):
+        wheel.schedule(rng.randint(1, 20000), 0)
+
+    ticks = int(seconds * 1000 / tick_ms)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        clock.tick()
+        wheel.advance()
+    per_tick_us = (time.perf_counter() - start) / ticks * 1e6
+    print(f"{count} active timers, {ticks} ticks: {per_tick_us:.1f} us per tick, "
+          f"{wheel.fired} fired ({per_tick_us * ticks * 1000 / max(1, wheel.fired):.0f} ns per fired timer)")
+    return per_tick_us, wheel.fired
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the timer wheel")
+    parser.add_argument('--timers', type=int, default=10000, help="active timers")
+    parser.add_argument('--seconds', type=float, default=60.0, help="simulated seconds")
+    args = parser.parse_args()
+    run_benchmark(args.timers, args.seconds)
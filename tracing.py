@@ -0,0 +1,199 @@
+"""
+Tracing Module
+Opt-in frame tracer: records lightweight spans for the phases of each frame
+into a ring buffer and dumps them as Chrome/Perfetto trace-event JSON.
+
+Open a dumped file in chrome://tracing or https://ui.perfetto.dev
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from config import *
+
+# Shared no-op context manager used when tracing is disabled
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class NullTracer:
+    """
+    Tracer stand-in used when tracing is disabled; every call is a no-op
+    """
+
+    enabled = False
+
+    def span(self, name):
+        """Return a context manager that does nothing"""
+        return _NULL_SPAN
+
+    def instrument(self, obj, method_names):
+        """Leave the methods untouched"""
+        pass
+
+    def begin_frame(self):
+        """Nothing to do"""
+        pass
+
+    def end_frame(self):
+        """Nothing to do"""
+        pass
+
+    def dump(self, path=None):
+        """Nothing to dump"""
+        return None
+
+
+class _Span:
+    """Context manager that records one span into the tracer's current frame"""
+
+    __slots__ = ('spans', 'name', 'start')
+
+    def __init__(self, spans, name):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.spans.append((self.name, self.start, time.perf_counter_ns()))
+        return False
+
+
+class FrameTracer:
+    """
+    Records spans per frame and keeps sampled frames in a ring buffer
+
+    A frame's spans are kept if the frame was slower than ``slow_frame_ms``
+    or if it falls on the ``sample_every`` stride; other frames are dropped
+    when they end.
+    """
+
+    enabled = True
+
+    def __init__(self, capacity=TRACE_BUFFER_SPANS, slow_frame_ms=TRACE_SLOW_FRAME_MS,
+                 sample_every=TRACE_SAMPLE_EVERY):
+        """
+        Initialize the tracer
+
+        Args:
+            capacity (int): Maximum number of spans kept in the ring buffer
+            slow_frame_ms (float): Frames at least this long are always kept
+            sample_every (int): Also keep every Nth frame (0 = slow frames only)
+        """
+        self.slow_frame_ms = slow_frame_ms
+        self.sample_every = sample_every
+        self.frame_index = 0
+        self.kept_frames = 0
+        self._buffer = deque(maxlen=capacity)
+        self._spans = []
+        self._frame_start = None
+        self._tid = threading.get_ident()
+
+    def span(self, name):
+        """
+        Time a block of code as a span of the current frame
+
+        Args:
+            name (str): Span name shown in the trace viewer
+        """
+        return _Span(self._spans, name)
+
+    def instrument(self, obj, method_names):
+        """
+        Wrap methods of an object instance so every call becomes a span
+
+        Args:
+            obj: Object whose methods are wrapped (only this instance changes)
+            method_names (iterable): Names of the methods to wrap
+        """
+        prefix = type(obj).__name__
+        for name in method_names:
+            setattr(obj, name, self._wrap(f"{prefix}.{name}", getattr(obj, name)))
+
+    def _wrap(self, label, method):
+        """Return a wrapper recording a span around each call of method"""
+        spans = self._spans
+
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                spans.append((label, start, time.perf_counter_ns()))
+        return traced
+
+    def begin_frame(self):
+        """Mark the start of a frame"""
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Close the frame and keep its spans if it is slow or sampled"""
+        if self._frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        frame_ms = (end - self._frame_start) / 1e6
+        sampled = self.sample_every > 0 and self.frame_index % self.sample_every == 0
+        if frame_ms >= self.slow_frame_ms or sampled:
+            self._buffer.append((f"frame {self.frame_index}", self._frame_start, end))
+            self._buffer.extend(self._spans)
+            self.kept_frames += 1
+        # Clear in place: instrumented wrappers hold a reference to this list
+        self._spans.clear()
+        self.frame_index += 1
+        self._frame_start = None
+
+    def to_trace_events(self):
+        """
+        Convert the buffered spans to Chrome trace events
+
+        Returns:
+            list: Complete ('X') events with microsecond timestamps
+        """
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': self._tid,
+                   'args': {'name': 'Space Invaders'}}]
+        for name, start, end in self._buffer:
+            events.append({
+                'name': name,
+                'cat': 'frame' if name.startswith('frame ') else 'game',
+                'ph': 'X',
+                'ts': start / 1000.0,
+                'dur': (end - start) / 1000.0,
+                'pid': pid,
+                'tid': self._tid
+            })
+        return events
+
+    def dump(self, path=None):
+        """
+        Write the ring buffer as a Chrome/Perfetto trace JSON file
+
+        Args:
+            path (str): Output file, defaults to a timestamped file in TRACE_DIR
+
+        Returns:
+            str: Path written, or None if writing failed
+        """
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': self.to_trace_events(), 'displayTimeUnit': 'ms'}, f)
+        except Exception as e:
+            print(f"Warning: Could not write trace: {e}")
+            return None
+        print(f"Trace with {self.kept_frames} frames written to {path}")
+        return path
+
+
+def create_tracer(enabled=TRACE_ENABLED):
+    """Return a FrameTracer if tracing is enabled, otherwise a NullTracer"""
+    return FrameTracer() if enabled else NullTracer()
@@ -1,25 +1,61 @@
 """
 UI Manager
 Handles all user interface elements including text rendering, menus, and input handling.
+Screens are retained widget panels: labels are re-rendered only when the
+values bound to them change.
 """
 
 import pygame
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, FONT_SIZES, WHITE, RED, GREEN, YELLOW
+from widgets import Label, TextInput, ListWidget, Panel
+from viewport import Viewport
+
+# Fonts keyed by pixel size, shared by every resolution that uses the size
+_font_cache = {}
+
+
+def _font(size):
+    """Get the UI font at a pixel size, creating it once"""
+    font = _font_cache.get(size)
+    if font is None:
+        font = _font_cache[size] = pygame.font.SysFont('Constantia', size)
+    return font
+
 
 class UIManager:
-    def __init__(self):
-        """Initialize UI manager with fonts and UI elements"""
-        # Initialize fonts with different sizes
-        self.fonts = {
-            'small': pygame.font.SysFont('Constantia', FONT_SIZES['small']),
-            'medium': pygame.font.SysFont('Constantia', FONT_SIZES['medium']),
-            'large': pygame.font.SysFont('Constantia', FONT_SIZES['large'])
-        }
+    def __init__(self, viewport=None):
+        """
+        Initialize UI manager with fonts and UI elements
         
+        Args:
+            viewport (Viewport): Window the UI is laid out for (the logical screen if None)
+        """
         # Input field for player name
         self.player_name = ""
         self.input_active = False
-        self.input_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 50, 200, 30)
+        
+        # Fonts, screens and the name box, laid out for the viewport
+        self.set_viewport(viewport or Viewport((SCREEN_WIDTH, SCREEN_HEIGHT)))
+        
+        # Panels drawn this frame and the last
+        self._drawn = []
+        self._last_drawn = []
+        self._dirty_rects = []
+    
+    def set_viewport(self, viewport):
+        """
+        Lay the UI out for a window: fonts are sized and screens placed by the
+        viewport scale, once per change rather than per frame
+        
+        Args:
+            viewport (Viewport): Window to lay out for
+        """
+        self.viewport = viewport
+        self.fonts = {name: _font(viewport.length(size)) for name, size in FONT_SIZES.items()}
+        self.input_rect = viewport.rect((SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 50, 200, 30))
+        self._build_panels()
+        # Everything is redrawn at the new layout
+        self._last_drawn = []
         
     def draw_text(self, text, font_size, color, x, y, center=False):
         """
@@ -42,146 +78,183 @@ class UIManager:
         return img, (x, y)
     
     def draw_centered_text(self, text, font_size, color, y):
-        """Draw text centered horizontally on screen"""
-        img, (x, _) = self.draw_text(text, font_size, color, SCREEN_WIDTH // 2, y, center=True)
+        """Draw text centered horizontally on screen (y is in logical coordinates)"""
+        x, y = self.viewport.point(SCREEN_WIDTH // 2, y)
+        img, (x, _) = self.draw_text(text, font_size, color, x, y, center=True)
         return img, (x, y)
     
-    def draw_menu(self, screen, last_history=None):
-        """Draw the main menu screen
-        Args:
-            last_history (list[dict] | None): recent history entries
+    def _build_panels(self):
         """
-        # Title
-        title_img, title_pos = self.draw_centered_text("SPACE INVADERS", 'large', WHITE, 200)
-        screen.blit(title_img, title_pos)
+        Build the retained widget trees for every screen
         
-        # Instructions
+        Full-screen panels cover the whole window and place their children
+        with ``point``; the HUD and countdown bands are mapped as a whole and
+        their children only scaled with ``at``.
+        """
+        large, medium, small = self.fonts['large'], self.fonts['medium'], self.fonts['small']
+        viewport = self.viewport
+        point = viewport.point
+        center = SCREEN_WIDTH // 2
+        full_screen = pygame.Rect((0, 0), viewport.resolution)
+
+        def at(x, y):
+            return (viewport.length(x), viewport.length(y))
+
+        # Main menu
         instructions = [
             "Enter your name:",
             "Press ENTER to start",
             "Use ARROW KEYS to move",
             "Press SPACE to shoot"
         ]
-        
-        for i, instruction in enumerate(instructions):
-            img, pos = self.draw_centered_text(instruction, 'medium', WHITE, 300 + i * 40)
-            screen.blit(img, pos)
-        
-        # Player name input field
-        pygame.draw.rect(screen, WHITE, self.input_rect, 2)
-        if self.player_name:
-            name_img, name_pos = self.draw_text(self.player_name, 'medium', WHITE, 
-                                              self.input_rect.x + 5, self.input_rect.y + 5)
-            screen.blit(name_img, name_pos)
-        else:
-            placeholder_img, placeholder_pos = self.draw_text("Enter name...", 'medium', (128, 128, 128),
-                                                           self.input_rect.x + 5, self.input_rect.y + 5)
-            screen.blit(placeholder_img, placeholder_pos)
-
-        # Quit instruction - moved below input field to avoid overlap
-        quit_img, quit_pos = self.draw_centered_text("Press ESC or Q to quit", 'medium', WHITE, 500)
-        screen.blit(quit_img, quit_pos)
+        self._name_input = TextInput(medium, self.input_rect, "Enter name...")
+        self._history_header = Label(medium, "Last 3 games:", YELLOW, point(center, 620), 'midtop')
+        self._history_list = ListWidget(small, point(center, 660), viewport.length(24), WHITE)
+        self.menu_panel = Panel(full_screen, [
+            Label(large, "SPACE INVADERS", WHITE, point(center, 200), 'midtop'),
+            *[Label(medium, text, WHITE, point(center, 300 + i * 40), 'midtop') for i, text in enumerate(instructions)],
+            self._name_input,
+            # Quit instruction - below input field to avoid overlap
+            Label(medium, "Press ESC or Q to quit", WHITE, point(center, 500), 'midtop'),
+            self._history_header,
+            self._history_list
+        ])
+
+        # Game over and victory screens
+        self.game_over_panel, self._game_over_labels = self._build_end_panel("GAME OVER!", RED)
+        self.victory_panel, self._victory_labels = self._build_end_panel("YOU WIN!", GREEN)
+
+        # Heads-up display
+        self._hud_score = Label(medium, "", WHITE, at(10, 10), fmt="Score: {}")
+        self._hud_name = Label(medium, "", WHITE, at(10, 40), fmt="Player: {}")
+        self._hud_health = Label(medium, "", WHITE, at(10, 70), fmt="Health: {}")
+        self._hud_wave = Label(medium, "", WHITE, at(SCREEN_WIDTH - 10, 10), 'topright')
+        self.hud_panel = Panel(viewport.rect((0, 0, SCREEN_WIDTH, 130)), [
+            self._hud_score,
+            self._hud_name,
+            self._hud_health,
+            self._hud_wave,
+            Label(small, "ESC: Pause | Q: Quit", WHITE, at(10, 100))
+        ])
+
+        # Countdown before the game starts
+        self._countdown_label = Label(large, "", WHITE, at(center, 50), 'midtop')
+        self.countdown_panel = Panel(viewport.rect((0, SCREEN_HEIGHT // 2 + 50, SCREEN_WIDTH, 200)), [
+            Label(large, "GET READY!", WHITE, at(center, 0), 'midtop'),
+            self._countdown_label,
+            Label(small, "Press ESC or Q to quit", WHITE, at(center, 100), 'midtop')
+        ])
+
+        # Semi-transparent overlays
+        self.pause_panel = Panel(full_screen, [
+            Label(large, "PAUSED", WHITE, point(center, SCREEN_HEIGHT // 2 - 100), 'midtop'),
+            Label(medium, "Press ESC to resume", WHITE, point(center, SCREEN_HEIGHT // 2), 'midtop'),
+            Label(medium, "Press Q to quit", WHITE, point(center, SCREEN_HEIGHT // 2 + 50), 'midtop')
+        ], background=(0, 0, 0, 128))
+        self.quit_panel = Panel(full_screen, [
+            Label(large, "Quit game?", WHITE, point(center, SCREEN_HEIGHT // 2 - 100), 'midtop'),
+            Label(medium, "Press Y to quit", WHITE, point(center, SCREEN_HEIGHT // 2), 'midtop'),
+            Label(medium, "Press N or ESC to cancel", WHITE, point(center, SCREEN_HEIGHT // 2 + 50), 'midtop')
+        ], background=(0, 0, 0, 128))
+
+    def _build_end_panel(self, title, color):
+        """Build a game over/victory screen; returns the panel and its (name, score) labels"""
+        medium = self.fonts['medium']
+        point = self.viewport.point
+        center = SCREEN_WIDTH // 2
+        name_label = Label(medium, "", WHITE, point(center, 300), 'midtop', fmt="Player: {}")
+        score_label = Label(medium, "", YELLOW, point(center, 350), 'midtop', fmt="Final Score: {}")
+        panel = Panel(pygame.Rect((0, 0), self.viewport.resolution), [
+            Label(self.fonts['large'], title, color, point(center, 200), 'midtop'),
+            name_label,
+            score_label,
+            Label(medium, "Press R to restart", WHITE, point(center, 450), 'midtop'),
+            Label(medium, "Press Q to quit", WHITE, point(center, 490), 'midtop'),
+            Label(medium, "Press ESC to quit", WHITE, point(center, 530), 'midtop')
+        ])
+        return panel, (name_label, score_label)
+
+    def _draw_panel(self, screen, panel):
+        """Draw a panel and collect the screen areas it changed"""
+        changed = panel.draw(screen)
+        if panel not in self._last_drawn:
+            # Newly shown: all of it needs redrawing
+            changed = [panel.rect.copy()]
+        self._drawn.append(panel)
+        self._dirty_rects.extend(changed)
+
+    def end_frame(self):
+        """
+        Finish the UI for this frame
+
+        Returns:
+            list: Screen areas whose UI changed since the previous frame,
+                  including panels that are no longer shown
+        """
+        dirty = self._dirty_rects
+        dirty.extend(panel.rect.copy() for panel in self._last_drawn if panel not in self._drawn)
+        self._last_drawn, self._drawn = self._drawn, []
+        self._dirty_rects = []
+        return dirty
+
+    def draw_menu(self, screen, last_history=None):
+        """Draw the main menu screen
+        Args:
+            last_history (list[dict] | None): recent history entries
+        """
+        self._name_input.set(self.player_name)
 
         # Recent history
-        if last_history:
-            header_img, header_pos = self.draw_centered_text("Last 3 games:", 'medium', YELLOW, 620)
-            screen.blit(header_img, header_pos)
-            for idx, h in enumerate(last_history[-3:][::-1]):
-                name = h.get('name', 'Unknown')
-                score = h.get('score', 0)
-                result = h.get('result', 'n/a')
-                duration_ms = h.get('duration_ms', 0)
-                duration_s = max(0, int(duration_ms // 1000))
-                line = f"{name} - {result} - score {score} - {duration_s}s"
-                img, pos = self.draw_centered_text(line, 'small', WHITE, 660 + idx * 24)
-                screen.blit(img, pos)
+        lines = []
+        for h in (last_history or [])[-3:][::-1]:
+            name = h.get('name', 'Unknown')
+            score = h.get('score', 0)
+            result = h.get('result', 'n/a')
+            duration_ms = h.get('duration_ms', 0)
+            duration_s = max(0, int(duration_ms // 1000))
+            assisted = " (assisted)" if h.get('assisted') else ""
+            lines.append(f"{name} - {result}{assisted} - score {score} - {duration_s}s")
+        self._history_list.set_items(lines)
+        self._history_header.set_visible(bool(lines))
+        self._history_list.set_visible(bool(lines))
+
+        self._draw_panel(screen, self.menu_panel)
     
     def draw_game_over_screen(self, screen, score, player_name):
         """Draw the game over screen with final score"""
-        # Game over text
-        game_over_img, game_over_pos = self.draw_centered_text("GAME OVER!", 'large', RED, 200)
-        screen.blit(game_over_img, game_over_pos)
-        
-        # Player name and score
-        score_text = f"Player: {player_name}"
-        score_img, score_pos = self.draw_centered_text(score_text, 'medium', WHITE, 300)
-        screen.blit(score_img, score_pos)
-        
-        final_score_text = f"Final Score: {score}"
-        final_score_img, final_score_pos = self.draw_centered_text(final_score_text, 'medium', YELLOW, 350)
-        screen.blit(final_score_img, final_score_pos)
-        
-        # Instructions
-        restart_img, restart_pos = self.draw_centered_text("Press R to restart", 'medium', WHITE, 450)
-        screen.blit(restart_img, restart_pos)
-        
-        quit_img, quit_pos = self.draw_centered_text("Press Q to quit", 'medium', WHITE, 490)
-        screen.blit(quit_img, quit_pos)
-        
-        # Additional quit option
-        esc_quit_img, esc_quit_pos = self.draw_centered_text("Press ESC to quit", 'medium', WHITE, 530)
-        screen.blit(esc_quit_img, esc_quit_pos)
+        name_label, score_label = self._game_over_labels
+        name_label.set(player_name)
+        score_label.set(score)
+        self._draw_panel(screen, self.game_over_panel)
     
     def draw_victory_screen(self, screen, score, player_name):
         """Draw the victory screen with final score"""
-        # Victory text
-        victory_img, victory_pos = self.draw_centered_text("YOU WIN!", 'large', GREEN, 200)
-        screen.blit(victory_img, victory_pos)
-        
-        # Player name and score
-        score_text = f"Player: {player_name}"
-        score_img, score_pos = self.draw_centered_text(score_text, 'medium', WHITE, 300)
-        screen.blit(score_img, score_pos)
-        
-        final_score_text = f"Final Score: {score}"
-        final_score_img, final_score_pos = self.draw_centered_text(final_score_text, 'medium', YELLOW, 350)
-        screen.blit(final_score_img, final_score_pos)
-        
-        # Instructions
-        restart_img, restart_pos = self.draw_centered_text("Press R to restart", 'medium', WHITE, 450)
-        screen.blit(restart_img, restart_pos)
-        
-        quit_img, quit_pos = self.draw_centered_text("Press Q to quit", 'medium', WHITE, 490)
-        screen.blit(quit_img, quit_pos)
-        
-        # Additional quit option
-        esc_quit_img, esc_quit_pos = self.draw_centered_text("Press ESC to quit", 'medium', WHITE, 530)
-        screen.blit(esc_quit_img, esc_quit_pos)
+        name_label, score_label = self._victory_labels
+        name_label.set(player_name)
+        score_label.set(score)
+        self._draw_panel(screen, self.victory_panel)
     
-    def draw_hud(self, screen, score, player_name, health):
-        """Draw the heads-up display during gameplay"""
-        # Score
-        score_text = f"Score: {score}"
-        score_img, score_pos = self.draw_text(score_text, 'medium', WHITE, 10, 10)
-        screen.blit(score_img, score_pos)
-        
-        # Player name
-        name_text = f"Player: {player_name}"
-        name_img, name_pos = self.draw_text(name_text, 'medium', WHITE, 10, 40)
-        screen.blit(name_img, name_pos)
-        
-        # Health
-        health_text = f"Health: {health}"
-        health_img, health_pos = self.draw_text(health_text, 'medium', WHITE, 10, 70)
-        screen.blit(health_img, health_pos)
-        
-        # Quit instruction
-        quit_text = "ESC: Pause | Q: Quit"
-        quit_img, quit_pos = self.draw_text(quit_text, 'small', WHITE, 10, 100)
-        screen.blit(quit_img, quit_pos)
+    def draw_hud(self, screen, score, player_name, health, wave=None):
+        """Draw the heads-up display during gameplay (wave is shown in endless mode)"""
+        self._hud_score.set(score)
+        self._hud_name.set(player_name)
+        self._hud_health.set(health)
+        self._hud_wave.set(f"Wave: {wave}" if wave else "")
+        self._draw_panel(screen, self.hud_panel)
     
     def draw_countdown(self, screen, countdown):
         """Draw the countdown screen before game starts"""
         if countdown > 0:
-            ready_img, ready_pos = self.draw_centered_text("GET READY!", 'large', WHITE, SCREEN_HEIGHT // 2 + 50)
-            screen.blit(ready_img, ready_pos)
-            
-            count_img, count_pos = self.draw_centered_text(str(countdown), 'large', WHITE, SCREEN_HEIGHT // 2 + 100)
-            screen.blit(count_img, count_pos)
-            
-            # Quit instruction during countdown
-            quit_img, quit_pos = self.draw_centered_text("Press ESC or Q to quit", 'small', WHITE, SCREEN_HEIGHT // 2 + 150)
-            screen.blit(quit_img, quit_pos)
+            self._countdown_label.set(countdown)
+            self._draw_panel(screen, self.countdown_panel)
+    
+    def draw_pause_menu(self, screen):
+        """Draw the pause menu overlay"""
+        self._draw_panel(screen, self.pause_panel)
+    
+    def draw_quit_confirmation(self, screen):
+        """Draw the quit confirmation overlay"""
+        self._draw_panel(screen, self.quit_panel)
     
     def handle_input_events(self, event):
         """Handle input events for player name entry"""
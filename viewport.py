@@ -0,0 +1,78 @@
+"""
+Viewport Module
+Maps the game's fixed logical coordinates (SCREEN_WIDTH x SCREEN_HEIGHT)
+onto a window of any resolution: one uniform scale, centered, so the
+simulation, savestates and spectator feeds never depend on the display.
+"""
+
+import copy
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class Viewport:
+    """
+    Logical-to-window coordinate transform
+
+    The playfield is scaled by the largest factor that fits the window and
+    centered; the background covers the whole window around it.
+    """
+
+    def __init__(self, resolution, logical_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """
+        Fit the logical playfield into a window
+
+        Args:
+            resolution (tuple): Window (width, height) in pixels
+            logical_size (tuple): Logical (width, height) of the game
+        """
+        self.resolution = tuple(resolution)
+        self.logical_size = tuple(logical_size)
+        self.scale = min(resolution[0] / logical_size[0], resolution[1] / logical_size[1])
+        self.offset = ((resolution[0] - round(logical_size[0] * self.scale)) // 2,
+                       (resolution[1] - round(logical_size[1] * self.scale)) // 2)
+        self.identity = self.scale == 1.0 and self.offset == (0, 0)
+
+    def shifted(self, origin):
+        """
+        The same mapping for a camera whose view starts at a logical point
+
+        Args:
+            origin (tuple): Logical (x, y) shown at the playfield's top left
+
+        Returns:
+            Viewport: Mapping of world coordinates to window pixels
+        """
+        viewport = copy.copy(self)
+        viewport.offset = (self.offset[0] - round(origin[0] * self.scale),
+                           self.offset[1] - round(origin[1] * self.scale))
+        viewport.identity = self.scale == 1.0 and viewport.offset == (0, 0)
+        return viewport
+
+    @property
+    def playfield(self):
+        """Window area covered by the logical playfield"""
+        return self.rect((0, 0) + self.logical_size)
+
+    def length(self, value):
+        """Scale a logical length to window pixels"""
+        return round(value * self.scale)
+
+    def point(self, x, y):
+        """Map a logical point to window pixels"""
+        return (round(x * self.scale) + self.offset[0], round(y * self.scale) + self.offset[1])
+
+    def rect(self, rect):
+        """Map a logical rect to window pixels"""
+        x, y, width, height = rect
+        left, top = self.point(x, y)
+        right, bottom = self.point(x + width, y + height)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_logical(self, pos):
+        """Map a window position (e.g. the mouse) back to logical coordinates"""
+        return (int((pos[0] - self.offset[0]) / self.scale), int((pos[1] - self.offset[1]) / self.scale))
+
+    def image_size(self, size):
+        """Window size of an image drawn at a logical size (at least 1x1)"""
+        return (max(1, round(size[0] * self.scale)), max(1, round(size[1] * self.scale)))
@@ -0,0 +1,173 @@
+"""
+Waves Module
+Procedurally generated alien waves for endless mode. Each wave is built
+from its number and a seed alone, so the next formation can be prepared by
+a background worker while the current one is played and swapped in within
+a single frame; forks and restored savestates rebuild the same wave.
+"""
+
+import queue
+import random
+import threading
+from config import *
+from sprites import Aliens
+
+# Formation shapes a wave can take
+WAVE_SHAPES = ('block', 'staggered', 'wedge')
+
+
+def wave_difficulty(wave):
+    """
+    Alien fire settings of a wave
+
+    Args:
+        wave (int): Wave number (1 is the opening formation)
+
+    Returns:
+        tuple: (alien cooldown in ms, maximum alien bullets on screen)
+    """
+    cooldown = max(WAVE_MIN_ALIEN_COOLDOWN, int(ALIEN_COOLDOWN * WAVE_COOLDOWN_FACTOR ** (wave - 1)))
+    return cooldown, min(WAVE_MAX_ALIEN_BULLETS, MAX_ALIEN_BULLETS + wave - 1)
+
+
+class WavePlan:
+    """A formation ready to be swapped into the alien group"""
+
+    __slots__ = ('wave', 'seed', 'shape', 'aliens')
+
+    def __init__(self, wave, seed, shape, aliens):
+        self.wave = wave
+        self.seed = seed
+        self.shape = shape
+        self.aliens = aliens
+
+
+def build_wave(wave, seed):
+    """
+    Lay out a wave and create its alien sprites
+
+    Later waves have more rows and columns, up to WAVE_MAX_ROWS and
+    WAVE_MAX_COLS, squeezed into the same area above the bunkers.
+
+    Args:
+        wave (int): Wave number (2 and up; 1 is the standard formation)
+        seed (int): Seed for the shape and alien images
+
+    Returns:
+        WavePlan: The wave, with sprites not yet in any group
+    """
+    rng = random.Random(seed)
+    rows = min(WAVE_MAX_ROWS, ROWS + (wave - 1) // 2)
+    cols = min(WAVE_MAX_COLS, COLS + wave // 2)
+    shape = rng.choice(WAVE_SHAPES)
+
+    # Same footprint as the standard formation: x from 100 to width - 100,
+    # rows from y = 100 down to well above the bunkers
+    x_step = (SCREEN_WIDTH - 200) / max(1, cols - 1)
+    y_step = min(70, (BUNKER_Y - 250) / max(1, rows - 1))
+
+    aliens = []
+    for row in range(rows):
+        if shape == 'wedge':
+            # Narrow at the top, full width at the bottom
+            trim = (rows - 1 - row) * cols // (2 * rows)
+            columns = range(trim, cols - trim)
+        elif shape == 'staggered' and row % 2:
+            columns = range(cols - 1)
+        else:
+            columns = range(cols)
+        offset = x_step / 2 if shape == 'staggered' and row % 2 else 0
+        for col in columns:
+            aliens.append(Aliens(int(100 + col * x_step + offset), int(100 + row * y_step), rng))
+    return WavePlan(wave, seed, shape, aliens)
+
+
+class WavePreparer:
+    """
+    Builds the next wave on a background thread
+
+    ``prepare`` returns immediately; ``take`` hands over the finished wave,
+    waiting for the worker only if it has not got to it yet, and builds the
+    wave itself if it was never requested.
+    """
+
+    def __init__(self):
+        """Initialize the preparer; the worker starts with the first request"""
+        self.prepared = 0
+        self.waited = 0
+        self.built_inline = 0
+        self._requests = queue.SimpleQueue()
+        self._done = threading.Condition()
+        self._wanted = None
+        self._plan = None
+        self._thread = None
+
+    def prepare(self, wave, seed):
+        """
+        Start building a wave in the background, replacing any earlier request
+
+        Args:
+            wave (int): Wave number
+            seed (int): Wave seed
+        """
+        with self._done:
+            if self._wanted == (wave, seed):
+                return
+            self._wanted = (wave, seed)
+            self._plan = None
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name='wave-preparer', daemon=True)
+            self._thread.start()
+        self._requests.put((wave, seed))
+
+    def take(self, wave, seed):
+        """
+        Get a wave, prepared in the background if it was requested
+
+        Args:
+            wave (int): Wave number
+            seed (int): Wave seed
+
+        Returns:
+            WavePlan: The wave
+        """
+        key = (wave, seed)
+        with self._done:
+            if self._wanted == key:
+                if self._plan is None:
+                    self.waited += 1
+                    self._done.wait_for(lambda: self._plan is not None)
+                plan = self._plan
+                self._wanted = self._plan = None
+                # The worker hands over False if building failed
+                if plan:
+                    return plan
+        self.built_inline += 1
+        return build_wave(wave, seed)
+
+    def close(self, timeout=1.0):
+        """Stop the worker"""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _worker(self):
+        """Build requested waves until close"""
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            with self._done:
+                if key != self._wanted:
+                    # Superseded by a later request
+                    continue
+            try:
+                plan = build_wave(*key)
+            except Exception:
+                plan = False
+            with self._done:
+                if key == self._wanted:
+                    self._plan = plan
+                    self.prepared += 1
+                    self._done.notify_all()
@@ -0,0 +1,278 @@
+"""
+Widgets Module
+Small retained-mode widget tree for the UI: widgets keep their rendered
+surface and panels keep the composition of their children, so nothing is
+re-rendered unless a bound value actually changes.
+"""
+
+import pygame
+
+
+class Widget:
+    """
+    Base class for retained widgets
+
+    Subclasses implement ``render`` to build ``image``; ``refresh`` calls it
+    only while the widget is dirty. ``pos`` is in the parent's coordinates
+    and is attached to the rect point named by ``anchor``.
+    """
+
+    def __init__(self, pos=(0, 0), anchor='topleft'):
+        """
+        Initialize the widget
+
+        Args:
+            pos (tuple): Position in the parent panel
+            anchor (str): Rect attribute placed at pos ('topleft', 'midtop', ...)
+        """
+        self.pos = pos
+        self.anchor = anchor
+        self.rect = pygame.Rect(pos, (0, 0))
+        self.image = None
+        self.visible = True
+        self.dirty = True
+
+    def invalidate(self):
+        """Mark the widget for re-rendering"""
+        self.dirty = True
+
+    def set_visible(self, visible):
+        """Show or hide the widget"""
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+
+    def render(self):
+        """
+        Build the widget's surface
+
+        Returns:
+            pygame.Surface: Rendered widget
+        """
+        raise NotImplementedError
+
+    def refresh(self):
+        """
+        Re-render the widget if it is dirty
+
+        Returns:
+            pygame.Rect | None: Area (old and new) that changed, or None
+        """
+        if not self.dirty:
+            return None
+        old = self.rect
+        self.image = self.render() if self.visible else None
+        if self.image is not None:
+            self.rect = self.image.get_rect(**{self.anchor: self.pos})
+        else:
+            self.rect = pygame.Rect(self.pos, (0, 0))
+        self.dirty = False
+        return old.union(self.rect) if old.size != (0, 0) else self.rect.copy()
+
+
+class Label(Widget):
+    """
+    Single line of text, optionally bound to a value through a format string
+    """
+
+    def __init__(self, font, text='', color=(255, 255, 255), pos=(0, 0), anchor='topleft', fmt=None):
+        """
+        Initialize the label
+
+        Args:
+            font (pygame.font.Font): Font to render with
+            text (str): Initial text
+            color (tuple): Text color
+            pos (tuple): Position in the parent panel
+            anchor (str): Rect attribute placed at pos
+            fmt (str): Format string applied by ``set`` (e.g. "Score: {}")
+        """
+        Widget.__init__(self, pos, anchor)
+        self.font = font
+        self.text = text
+        self.color = color
+        self.fmt = fmt
+
+    def set(self, value):
+        """
+        Update the bound value; the label is only invalidated if its text changes
+
+        Args:
+            value: New value, formatted with ``fmt`` if the label has one
+        """
+        text = self.fmt.format(value) if self.fmt else str(value)
+        if text != self.text:
+            self.text = text
+            self.dirty = True
+
+    def render(self):
+        """Render the text"""
+        return self.font.render(self.text, True, self.color)
+
+
+class TextInput(Widget):
+    """
+    Bordered input box showing its value, or a placeholder when empty
+    """
+
+    def __init__(self, font, rect, placeholder='', color=(255, 255, 255), placeholder_color=(128, 128, 128)):
+        """
+        Initialize the input box
+
+        Args:
+            font (pygame.font.Font): Font to render with
+            rect (pygame.Rect): Box position and size in the parent panel
+            placeholder (str): Text shown while the value is empty
+            color (tuple): Border and text color
+            placeholder_color (tuple): Placeholder text color
+        """
+        Widget.__init__(self, rect.topleft)
+        self.font = font
+        self.size = rect.size
+        self.placeholder = placeholder
+        self.color = color
+        self.placeholder_color = placeholder_color
+        self.value = ''
+
+    def set(self, value):
+        """Update the displayed value"""
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+
+    def render(self):
+        """Render the border and the value or placeholder"""
+        image = pygame.Surface(self.size, pygame.SRCALPHA)
+        pygame.draw.rect(image, self.color, image.get_rect(), 2)
+        if self.value:
+            text = self.font.render(self.value, True, self.color)
+        else:
+            text = self.font.render(self.placeholder, True, self.placeholder_color)
+        image.blit(text, (5, 5))
+        return image
+
+
+class ListWidget(Widget):
+    """
+    Vertical list of text lines, each centered on the widget's axis
+    """
+
+    def __init__(self, font, pos=(0, 0), line_height=24, color=(255, 255, 255), anchor='midtop'):
+        """
+        Initialize the list
+
+        Args:
+            font (pygame.font.Font): Font to render with
+            pos (tuple): Position in the parent panel
+            line_height (int): Vertical distance between lines
+            color (tuple): Text color
+            anchor (str): Rect attribute placed at pos
+        """
+        Widget.__init__(self, pos, anchor)
+        self.font = font
+        self.line_height = line_height
+        self.color = color
+        self.items = ()
+
+    def set_items(self, items):
+        """Replace the lines; the list is only invalidated if they differ"""
+        items = tuple(items)
+        if items != self.items:
+            self.items = items
+            self.dirty = True
+
+    def render(self):
+        """Render every line onto one surface"""
+        lines = [self.font.render(item, True, self.color) for item in self.items]
+        width = max((line.get_width() for line in lines), default=0)
+        height = self.line_height * (len(lines) - 1) + lines[-1].get_height() if lines else 0
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            image.blit(line, ((width - line.get_width()) // 2, i * self.line_height))
+        return image
+
+
+class Panel:
+    """
+    Container that composes its children onto one cached surface
+
+    The composition covers only the children's bounding box and is rebuilt
+    only when a child changes. ``draw`` returns the screen areas that differ
+    from the previous draw.
+    """
+
+    def __init__(self, rect, children=(), background=None):
+        """
+        Initialize the panel
+
+        Args:
+            rect (pygame.Rect): Panel area on screen
+            children (iterable): Widgets positioned in panel coordinates
+            background (tuple): RGBA fill of the whole panel behind the children
+                                (None = transparent)
+        """
+        self.rect = pygame.Rect(rect)
+        self.children = list(children)
+        self.image = None
+        self.content = pygame.Rect(0, 0, 0, 0)  # composed area, in panel coordinates
+        self.dirty = True
+        self._encoded = False
+
+        self.background = None
+        if background is not None:
+            self.background = pygame.Surface(self.rect.size)
+            self.background.fill(background[:3])
+            self.background.set_alpha(background[3] if len(background) > 3 else 255)
+
+    def refresh(self):
+        """
+        Re-render dirty children and recompose the panel if any changed
+
+        Returns:
+            list: Changed areas in screen coordinates
+        """
+        changed = [area for area in (child.refresh() for child in self.children) if area is not None]
+        if not changed and not self.dirty:
+            return []
+
+        shown = [child for child in self.children if child.image is not None]
+        content = shown[0].rect.unionall([child.rect for child in shown[1:]]) if shown else pygame.Rect(0, 0, 0, 0)
+        if self.image is None or self.image.get_size() != content.size:
+            self.image = pygame.Surface(content.size, pygame.SRCALPHA)
+        else:
+            self.image.fill((0, 0, 0, 0))
+        self.content = content
+        # Children do not overlap, so taking the maximum copies their pixels
+        # (alpha included) exactly as a blit onto the screen would show them
+        offset = (-content.x, -content.y)
+        self.image.blits([(child.image, child.rect.move(offset), None, pygame.BLEND_RGBA_MAX)
+                          for child in shown], False)
+        self._encoded = False
+
+        if self.dirty:
+            self.dirty = False
+            return [self.rect.copy()]
+        return [area.move(self.rect.topleft).clip(self.rect) for area in changed]
+
+    def draw(self, surface):
+        """
+        Blit the cached composition
+
+        Args:
+            surface (pygame.Surface): Surface to draw on
+
+        Returns:
+            list: Changed areas in screen coordinates
+        """
+        changed = self.refresh()
+        if self.background is not None:
+            surface.blit(self.background, self.rect)
+        if self.content.width and self.content.height:
+            if not self._encoded and not surface.get_flags() & pygame.SRCALPHA:
+                # Run-length encoding skips the transparent gaps between children
+                # when blitting; SDL's encoded blits make every touched pixel
+                # opaque, so transparent targets (overlays) get the plain image
+                self.image.set_alpha(255, pygame.RLEACCEL)
+                self._encoded = True
+            surface.blit(self.image, self.content.move(self.rect.topleft))
+        return changed